@@ -0,0 +1,33 @@
+"""
+Async MongoDB access (pymongo's native asyncio client) for async route handlers.
+
+Mirrors the collections in app.core.database. A DB-bound request awaits its query
+instead of pinning a threadpool thread, so one worker can keep many in flight. The
+client connects lazily on the first operation; close it on shutdown.
+"""
+
+import os
+from pymongo import AsyncMongoClient
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DB_NAME = os.getenv("MONGODB_DBNAME")
+
+async_client = AsyncMongoClient(MONGODB_URI)
+async_db = async_client[DB_NAME] if DB_NAME else async_client.get_default_database("test")
+
+# Collections (same names as app.core.database and the routers)
+async_nodes_collection = async_db["Floor1Nodes"]
+async_edges_collection = async_db["Floor1Edges"]
+async_ratings_collection = async_db["ratings"]
+async_rating_summaries_collection = async_db["rating_summaries"]
+async_rating_rollups_collection = async_db["rating_rollups"]
+async_notifications_collection = async_db["notifications"]
+async_audit_logs_collection = async_db["audit_logs"]
+async_admins_collection = async_db["admins"]
+
+
+async def close_async_client():
+    await async_client.close()
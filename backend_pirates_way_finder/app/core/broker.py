@@ -0,0 +1,93 @@
+"""
+In-process publish/subscribe for pushing events to streaming clients (SSE).
+
+Publishers may run on the event loop or in threadpool threads; each subscriber is an
+asyncio queue bound to the loop it subscribed on, and events are handed over with
+call_soon_threadsafe. Queues are bounded: a subscriber that falls BROKER_QUEUE_SIZE
+events behind loses the oldest ones rather than growing without limit.
+
+Only clients connected to this process see its events; with several API workers each
+worker fans out what its own requests publish.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Set
+
+from app.core.metrics import Counter, Gauge
+
+BROKER_QUEUE_SIZE = int(os.getenv("BROKER_QUEUE_SIZE", "100"))
+
+active_subscribers = Gauge(
+    "broker_subscribers",
+    "Streaming clients subscribed to a broker.",
+    ("broker",),
+)
+published_events = Counter(
+    "broker_published_total",
+    "Events published to a broker.",
+    ("broker",),
+)
+dropped_events = Counter(
+    "broker_dropped_total",
+    "Events dropped because a subscriber's queue was full.",
+    ("broker",),
+)
+
+
+class Subscription:
+    """One subscriber's queue; iterate with `await subscription.get()`."""
+
+    def __init__(self, broker: "EventBroker", max_queue: int):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def _deliver(self, event):
+        # Runs on the subscriber's loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            dropped_events.inc(broker=self.broker.name)
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fans out published events to every current subscriber."""
+
+    def __init__(self, name: str, max_queue: int = BROKER_QUEUE_SIZE):
+        self.name = name
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Subscribe from a coroutine; close() the subscription when done."""
+        subscription = Subscription(self, self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            active_subscribers.set(len(self._subscribers), broker=self.name)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            active_subscribers.set(len(self._subscribers), broker=self.name)
+
+    def publish(self, event):
+        """Deliver an event to every subscriber. Safe to call from any thread."""
+        published_events.inc(broker=self.name)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Subscriber's loop is closed (shutdown); forget it
+                self.unsubscribe(subscription)
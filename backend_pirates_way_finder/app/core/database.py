@@ -1,21 +1,24 @@
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from app.core.indexes import register_index
 
 load_dotenv()
 
 MONGODB_URI = os.getenv("MONGODB_URI")
 DB_NAME = os.getenv("MONGODB_DBNAME")
 
-client = MongoClient(MONGODB_URI)
-db = client[DB_NAME]
+# connect=False: nothing touches the network until the first query, so importing
+# this module (e.g. from grid-only tools via the pathfinding services) never blocks
+client = MongoClient(MONGODB_URI, connect=False)
+db = client[DB_NAME] if DB_NAME else client.get_default_database("test")
 
 # Collections
 nodes_collection = db["Floor1Nodes"]
 edges_collection = db["Floor1Edges"]
 
-# after you define nodes_collection = db["nodes"]
-nodes_collection.create_index("properties.id", unique=True)
+# Created once at startup by app.core.indexes.ensure_indexes()
+register_index(nodes_collection, "properties.id", unique=True)
 # optionally index category and tags for search
-nodes_collection.create_index("properties.category")
-nodes_collection.create_index("properties.tags")
\ No newline at end of file
+register_index(nodes_collection, "properties.category")
+register_index(nodes_collection, "properties.tags")
@@ -1,4 +1,5 @@
 import json
+import mmap
 
 class Grid:
     def __init__(self):
@@ -6,6 +7,9 @@ class Grid:
         self.cell_size = None
         self.w = None
         self.h = None
+        # Bumped on every load so derived caches know to rebuild
+        self.version = 0
+        self._mmap = None
 
     def load(self, path):
         with open(path , "r") as f:
@@ -14,5 +18,26 @@ class Grid:
             self.cell_size = data["cell_size"]
             self.w = data["width"]
             self.h = data["height"]
+        self.version += 1
 
-grid_instance = Grid()
\ No newline at end of file
+    def save_shared(self, path):
+        """Write the grid as raw bytes (one per cell, row-major) for load_shared() in other processes."""
+        with open(path, "wb") as f:
+            for row in self.grid:
+                f.write(bytes(row))
+
+    def load_shared(self, path, w, h, cell_size):
+        """
+        Map a file written by save_shared() read-only. Rows are memoryview slices of the
+        mapping, so grid[y][x] works as before while every process shares the same pages.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        self.grid = [view[y * w:(y + 1) * w] for y in range(h)]
+        self.cell_size = cell_size
+        self.w = w
+        self.h = h
+        self.version += 1
+
+grid_instance = Grid()
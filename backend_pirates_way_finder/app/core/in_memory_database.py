@@ -0,0 +1,87 @@
+"""
+In-memory MongoDB stand-in (mongomock) for the test suite and load_test.py.
+
+use_in_memory_database() swaps pymongo's sync and async clients for one shared
+mongomock store, so app.core.database and app.core.async_database see the same data.
+It must run before anything imports those modules. mongomock is a dev requirement
+(requirements-dev.txt); production code never imports this module.
+"""
+
+import os
+
+
+class _AsyncCursor:
+    """Cursor with the async pymongo surface the routers use, over a mongomock cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, *args):
+        self._cursor = self._cursor.skip(*args)
+        return self
+
+    def limit(self, *args):
+        self._cursor = self._cursor.limit(*args)
+        return self
+
+    async def to_list(self, length=None):
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+
+class _AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return _AsyncCursor(self._collection.find(*args, **kwargs))
+
+    async def aggregate(self, *args, **kwargs):
+        return _AsyncCursor(self._collection.aggregate(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+class _AsyncDatabase:
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name):
+        return _AsyncCollection(self._database[name])
+
+
+class _AsyncMongomockClient:
+    """Stands in for pymongo.AsyncMongoClient over the same in-memory store as the sync client."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getitem__(self, name):
+        return _AsyncDatabase(self._client[name])
+
+    async def close(self):
+        pass
+
+
+def use_in_memory_database(db_name: str):
+    """Back every MongoClient/AsyncMongoClient created from now on by one in-memory store."""
+    import mongomock
+    import pymongo
+
+    os.environ["MONGODB_DBNAME"] = db_name
+    # Pathfinding worker processes could not see an in-process store, so routes run
+    # in the API process
+    os.environ["PATHFINDING_WORKERS"] = "0"
+    store = mongomock.MongoClient()
+    pymongo.MongoClient = lambda *args, **kwargs: store
+    pymongo.AsyncMongoClient = lambda *args, **kwargs: _AsyncMongomockClient(store)
+    return store
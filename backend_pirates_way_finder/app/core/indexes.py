@@ -0,0 +1,71 @@
+"""
+MongoDB index management.
+
+Modules declare the indexes they rely on with `register_index()` at import time, which
+is pure bookkeeping (no network). `ensure_indexes()` creates them all once at startup,
+one create_indexes round trip per collection with the collections in parallel, and
+caches the outcome so later calls are free.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+# collection name -> (collection, [IndexModel, ...])
+_registry = {}
+_status: Optional[Dict[str, object]] = None
+_lock = threading.Lock()
+
+
+def register_index(collection, keys, **kwargs):
+    """Declare an index (same arguments as Collection.create_index) to be created by ensure_indexes()."""
+    _registry.setdefault(collection.name, (collection, []))[1].append(IndexModel(keys, **kwargs))
+
+
+def ensure_indexes() -> Dict[str, object]:
+    """
+    Create every registered index, collections in parallel.
+    Returns {collection name: [index names] or "error: ..."}. A fully successful run
+    is cached; after a failure the next call tries again.
+    """
+    global _status
+
+    with _lock:
+        if _status is not None:
+            return _status
+
+        registered = dict(_registry)
+        with ThreadPoolExecutor(max_workers=max(len(registered), 1)) as pool:
+            futures = {
+                name: pool.submit(collection.create_indexes, models)
+                for name, (collection, models) in registered.items()
+            }
+
+        status, failed = {}, False
+        for name, future in futures.items():
+            try:
+                status[name] = future.result()
+            except PyMongoError as e:
+                status[name] = f"error: {e}"
+                failed = True
+                print(f"[INDEXES] Failed to create indexes on {name}: {e}")
+
+        if not failed:
+            _status = status
+            print(f"[INDEXES] Ensured {sum(len(m) for _, m in registered.values())} index(es) on {len(registered)} collection(s)")
+        return status
+
+
+def ensure_indexes_in_background() -> threading.Thread:
+    """Run ensure_indexes() without blocking startup."""
+    thread = threading.Thread(target=ensure_indexes, name="ensure-indexes", daemon=True)
+    thread.start()
+    return thread
+
+
+def index_status() -> Optional[Dict[str, object]]:
+    """Cached result of the last successful ensure_indexes(), or None if it hasn't succeeded yet."""
+    return _status
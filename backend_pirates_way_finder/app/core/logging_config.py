@@ -0,0 +1,13 @@
+"""
+Process-wide logging setup, shared by the API process and the pathfinding workers
+(spawned workers start with an unconfigured root logger).
+"""
+
+import logging
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+def configure_logging(level=logging.INFO):
+    """Log to stderr at `level` with the app's format (no-op if already configured)."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
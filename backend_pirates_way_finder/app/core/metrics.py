@@ -0,0 +1,137 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms keep their values in plain dicts keyed by label
+values; recording is a dict update under a lock, so instrumentation is cheap enough
+to leave on in production. `render()` produces the text served at GET /metrics.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Latency buckets (seconds) shared by the request/stage histograms
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_registry: List["_Metric"] = []
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, deltas: Dict[Tuple, float]):
+        """Add counts recorded elsewhere (e.g. in a worker process), keyed as in snapshot()."""
+        with self._lock:
+            for key, amount in deltas.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+        # label key -> [per-bucket counts (last = +Inf), sum, count]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][slot] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Shared metrics ---
+
+cache_requests = Counter(
+    "cache_requests_total",
+    "Lookups of in-memory caches, by cache and hit/miss.",
+    ("cache", "result"),
+)
+
+
+def record_cache(cache: str, hit: bool):
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
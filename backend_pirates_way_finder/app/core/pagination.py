@@ -0,0 +1,64 @@
+"""
+Keyset (cursor) pagination for newest-first listings.
+
+Pages are ordered by (sort field, _id) descending, and a page's cursor encodes the last
+row it returned. The next page continues strictly after that row, so with a compound
+index on (filter fields..., sort field, _id) every page costs the same however deep the
+client scrolls (unlike skip/limit, which walks every skipped row).
+
+Cursors are opaque to clients: URL-safe base64 of the last row's sort value and _id.
+"""
+
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+
+def encode_cursor(doc: Dict, field: str) -> str:
+    payload = json.dumps({"v": doc.get(field), "id": str(doc["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[object, object]:
+    """(sort value, _id) from a cursor; raises HTTP 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, raw_id = payload["v"], payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    try:
+        return value, ObjectId(raw_id)
+    except (InvalidId, TypeError):
+        return value, raw_id
+
+
+def keyset_query(query: Dict, field: str, cursor: Optional[str]) -> Dict:
+    """Add the 'strictly after the cursor row' condition to a filter."""
+    if not cursor:
+        return query
+    value, last_id = decode_cursor(cursor)
+    after = {"$or": [
+        {field: {"$lt": value}},
+        {field: value, "_id": {"$lt": last_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+def keyset_sort(field: str) -> List[Tuple[str, int]]:
+    return [(field, -1), ("_id", -1)]
+
+
+def split_page(docs: List[Dict], limit: int, field: str) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Trim a result fetched with limit + 1 to the page, and build the next cursor
+    (None when this is the last page).
+    """
+    if len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    return page, encode_cursor(page[-1], field)
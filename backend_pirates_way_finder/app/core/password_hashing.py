@@ -0,0 +1,104 @@
+"""
+Dedicated, bounded executor for argon2 password hashing and verification.
+
+argon2 is deliberately expensive (tens to hundreds of ms of CPU and ARGON2_MEMORY_COST
+KiB per call). Run in FastAPI's shared threadpool, a burst of logins would occupy
+every thread and stall unrelated endpoints. Instead:
+
+  - hashing runs on its own PASSWORD_HASH_WORKERS threads. argon2 releases the GIL and
+    each call runs ARGON2_PARALLELISM lanes in parallel, so hashing can occupy up to
+    PASSWORD_HASH_WORKERS * ARGON2_PARALLELISM cores; the default worker count keeps
+    that to about half the CPUs, leaving the rest to route searches, but is never below
+    2 so one slow login does not serialize the others (sizing: see .env.example)
+  - at most PASSWORD_HASH_MAX_PENDING calls may be queued or running; beyond that
+    callers get PasswordHashingBusy immediately (HTTP 503) instead of queueing
+  - callers stop waiting after PASSWORD_HASH_TIMEOUT_SECONDS
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.security import ARGON2_PARALLELISM, hash_password, verify_and_update_password
+
+PASSWORD_HASH_WORKERS = int(os.getenv(
+    "PASSWORD_HASH_WORKERS", str(max(2, (os.cpu_count() or 1) // (2 * max(ARGON2_PARALLELISM, 1))))
+))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 4)))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+
+pending_hashes = Gauge(
+    "password_hash_pending",
+    "Password hash/verify calls queued or running.",
+)
+rejected_hashes = Counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected, by reason (queue_full, timeout).",
+    ("reason",),
+)
+hash_seconds = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying a password (excluding queueing).",
+    ("operation",),
+)
+
+
+class PasswordHashingBusy(Exception):
+    """Too many password operations in flight; the caller should retry later."""
+
+
+_executor = ThreadPoolExecutor(max_workers=max(PASSWORD_HASH_WORKERS, 1), thread_name_prefix="password-hash")
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _release(_future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+        pending_hashes.set(_pending)
+
+
+def _timed(operation, fn, *args):
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        hash_seconds.observe(time.perf_counter() - start, operation=operation)
+
+
+async def _submit(operation, fn, *args):
+    global _pending
+
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            rejected_hashes.inc(reason="queue_full")
+            raise PasswordHashingBusy()
+        _pending += 1
+        pending_hashes.set(_pending)
+
+    future = _executor.submit(_timed, operation, fn, *args)
+    # The slot stays taken until the hash actually finishes, even if the caller gave up
+    future.add_done_callback(_release)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        rejected_hashes.inc(reason="timeout")
+        raise PasswordHashingBusy()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _submit("hash", hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(valid, upgraded hash or None), see security.verify_and_update_password."""
+    return await _submit("verify", verify_and_update_password, plain, hashed)
+
+
+def shutdown_password_executor():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,16 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Query
 from fastapi.security import OAuth2PasswordBearer
 from dotenv import load_dotenv
+from app.core.metrics import record_cache
 
 load_dotenv()
 
@@ -12,9 +18,25 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "fallbacksecret")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+# Verified tokens remembered (LRU) so parallel dashboard calls don't re-verify the same
+# token; 0 disables the cache
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "1024"))
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# argon2 cost: iterations, memory in KiB, lanes. Hashes made with other parameters still
+# verify and are upgraded to these on the next successful login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 # Password helpers
 def hash_password(password: str) -> str:
@@ -23,6 +45,10 @@ def hash_password(password: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def verify_and_update_password(plain: str, hashed: str):
+    """(valid, new hash or None); a new hash is returned when the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain, hashed)
+
 # Token helpers
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -31,16 +57,65 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str):
+def verify_token(token: str):
+    """Full JWT decode and signature/expiry check (no cache)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
+# sha256(token) -> (payload, exp as epoch seconds); entries are dropped once expired
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def decode_token(token: str):
+    """verify_token, answered from the verified-token cache while the token is unexpired."""
+    if JWT_CACHE_SIZE <= 0:
+        return verify_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                _token_cache.move_to_end(key)
+                record_cache("jwt", True)
+                return dict(entry[0])
+            del _token_cache[key]
+    record_cache("jwt", False)
+
+    payload = verify_token(token)
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > now:
+        with _token_cache_lock:
+            _token_cache[key] = (dict(payload), exp)
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > JWT_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return payload
+
+def clear_token_cache():
+    with _token_cache_lock:
+        _token_cache.clear()
+
 def get_current_admin(token: str = Depends(oauth2_scheme)):
     payload = decode_token(token)
     email = payload.get("sub")
     if not email:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    return email
\ No newline at end of file
+    return email
+
+def get_current_admin_for_stream(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = Query(None)
+):
+    """
+    get_current_admin for streaming endpoints: browsers' EventSource cannot send an
+    Authorization header, so the token may also be passed as ?access_token=.
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return get_current_admin(token)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Write-behind buffering for append-only documents (audit logs, notifications).
+
+Request handlers append documents to an in-memory buffer and return immediately; a
+background thread writes them with insert_many when WRITE_BEHIND_BATCH_SIZE documents
+are waiting or every WRITE_BEHIND_FLUSH_INTERVAL_MS, whichever comes first. Buffers are
+flushed on shutdown (and at interpreter exit, for scripts).
+
+Documents become visible to readers up to one flush interval after they are created.
+If a buffer is full (MongoDB unreachable for a long time), new documents are written
+directly instead of being dropped: synchronously from `add()` (for code already off the
+event loop) or in the threadpool from `add_async()` (for async handlers).
+"""
+
+import atexit
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import List
+
+from pymongo.errors import BulkWriteError, PyMongoError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import Counter, Gauge
+
+WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "500"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100"))
+WRITE_BEHIND_MAX_BUFFER = int(os.getenv("WRITE_BEHIND_MAX_BUFFER", "10000"))
+
+queue_depth = Gauge(
+    "write_behind_queue_depth",
+    "Documents waiting in a write-behind buffer.",
+    ("buffer",),
+)
+flushed_documents = Counter(
+    "write_behind_flushed_total",
+    "Documents written by write-behind flushes.",
+    ("buffer",),
+)
+failed_documents = Counter(
+    "write_behind_failed_total",
+    "Documents a flush failed to write (write_error) or wrote synchronously because the buffer was full (overflow).",
+    ("buffer", "reason"),
+)
+
+_writers: List["BufferedWriter"] = []
+
+
+class BufferedWriter:
+    """Batches insert_one calls on a collection into background insert_many calls."""
+
+    def __init__(self, collection, name: str,
+                 flush_interval_ms: int = WRITE_BEHIND_FLUSH_INTERVAL_MS,
+                 batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 max_buffer: int = WRITE_BEHIND_MAX_BUFFER):
+        self.collection = collection
+        self.name = name
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        _writers.append(self)
+
+    def _buffer_document(self, document: dict) -> bool:
+        """Queue a document; False when it must be written directly instead."""
+        with self._cond:
+            # After shutdown started nothing would flush the buffer again, so write directly
+            direct = self._stopping
+            overflow = not direct and len(self._buffer) >= self.max_buffer
+            if not (direct or overflow):
+                self._buffer.append(document)
+                queue_depth.set(len(self._buffer), buffer=self.name)
+                if len(self._buffer) >= self.batch_size:
+                    self._cond.notify()
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+                    self._thread.start()
+                return True
+
+        if overflow:
+            failed_documents.inc(buffer=self.name, reason="overflow")
+        return False
+
+    def add(self, document: dict):
+        """Queue a document for insertion (blocks on insert_one if it can't be queued)."""
+        if not self._buffer_document(document):
+            self.collection.insert_one(document)
+
+    async def add_async(self, document: dict):
+        """Queue a document for insertion; a direct write runs in the threadpool, off the event loop."""
+        if not self._buffer_document(document):
+            await run_in_threadpool(self.collection.insert_one, document)
+
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    @contextmanager
+    def flushes_paused(self):
+        """
+        Hold off flushes (waiting for one in progress to finish). Inside the block no
+        document moves from the buffer to the collection, so counting the collection
+        and adding depth() counts every document exactly once.
+        """
+        with self._flush_lock:
+            yield
+
+    def _run(self):
+        while not self._stopping:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._buffer) >= self.batch_size or self._stopping,
+                                    timeout=self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write everything currently buffered (in batches). Safe to call from any thread."""
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    break
+
+                try:
+                    self.collection.insert_many(batch, ordered=False)
+                    flushed_documents.inc(len(batch), buffer=self.name)
+                except BulkWriteError as e:
+                    # Unordered: everything but the reported documents was written
+                    errors = len(e.details.get("writeErrors", []))
+                    flushed_documents.inc(len(batch) - errors, buffer=self.name)
+                    failed_documents.inc(errors, buffer=self.name, reason="write_error")
+                    print(f"[WRITE-BEHIND] {errors} {self.name} document(s) rejected: {e}")
+                except PyMongoError as e:
+                    # Database unavailable: put the batch back and retry on the next flush
+                    with self._cond:
+                        self._buffer.extendleft(reversed(batch))
+                    print(f"[WRITE-BEHIND] Flush of {len(batch)} {self.name} document(s) failed, will retry: {e}")
+                    break
+                finally:
+                    queue_depth.set(len(self._buffer), buffer=self.name)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread after a final flush."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+def flush_all():
+    for writer in _writers:
+        writer.flush()
+
+
+def stop_all():
+    """Flush and stop every buffer (called on application shutdown)."""
+    for writer in _writers:
+        writer.stop()
+
+
+atexit.register(stop_all)
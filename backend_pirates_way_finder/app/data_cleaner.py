@@ -1,14 +1,11 @@
-from app.core.database import nodes_collection
+from app.services.geojson_io import split_stored_feature_collections
 
-# Find the FeatureCollection document
-feature_collection = nodes_collection.find_one({ "type": "FeatureCollection" })
+# Split FeatureCollection documents stored in the nodes/edges collections into
+# individual, validated feature documents (bulk upserts; same as
+# `python geojson_tool.py split-stored`)
+reports = split_stored_feature_collections()
+kept = [name for name, report in reports.items() if report["kept"]]
 
-# Insert each feature as a separate document
-if feature_collection and "features" in feature_collection:
-    for feature in feature_collection["features"]:
-        nodes_collection.insert_one(feature)
-
-# Optionally delete the original FeatureCollection
-nodes_collection.delete_one({ "_id": feature_collection["_id"] })
-
-print("✅ Split FeatureCollection into individual node documents.")
+print(f"✅ Split {len(reports) - len(kept)} FeatureCollection document(s) into individual node/edge documents.")
+if kept:
+    print(f"⚠️  Kept {len(kept)} with invalid features (listed above): {', '.join(kept)}")
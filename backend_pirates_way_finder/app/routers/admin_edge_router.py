@@ -4,6 +4,7 @@ from app.services.pathway_service import add_pathway, get_all_pathways, update_p
 # 🎯 Import edge-specific services needed for the moved routes
 from app.core.security import get_current_admin
 from typing import Optional
+from app.services.projections import View
 
 router = APIRouter(tags=["Admin Pathway Management"])  # Prefix is applied in main.py
 
@@ -21,9 +22,12 @@ def create_pathway(pathway: EdgeFeature, current_admin: str = Depends(get_curren
 
 # --- 3.0 GET ALL PATHWAYS (READ) ---
 @router.get("/all", summary="Retrieve all Edges/Pathways")
-def fetch_pathways(current_admin: str = Depends(get_current_admin)):
+def fetch_pathways(
+    view: View = Query("admin", description="Fields to return: marker, detail or admin"),
+    current_admin: str = Depends(get_current_admin)
+):
     """Retrieve all Edges. Note: The /all endpoint from the old accessibility router is redundant and removed."""
-    edges = get_all_pathways()
+    edges = get_all_pathways(view)
     return edges
 
 # --- 3.0 UPDATE PATHWAY (General Patch) ---
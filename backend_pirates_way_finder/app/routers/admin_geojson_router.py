@@ -0,0 +1,73 @@
+import codecs
+import json
+import queue
+import threading
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
+
+from app.core.security import get_current_admin
+from app.routers.audit_log_router import create_audit_log
+from app.services.geojson_io import GeoJSONFormatError, export_feature_collection, import_features, iter_features
+
+router = APIRouter(tags=["Admin GeoJSON Import/Export"])  # Prefix is applied in main.py
+
+
+@router.post("/import", summary="Bulk import nodes and edges from a GeoJSON FeatureCollection")
+def import_geojson(
+    file: UploadFile = File(..., description="FeatureCollection or newline-delimited GeoJSON features"),
+    current_admin: str = Depends(get_current_admin)
+):
+    """
+    Validate and upsert every feature (Points -> nodes, LineStrings -> edges, matched on
+    properties.id). The response is newline-delimited JSON: one progress line per written
+    chunk, then the final report ("done": true).
+    """
+    events = queue.Queue()
+
+    def run():
+        try:
+            stream = codecs.getreader("utf-8")(file.file)
+            report = import_features(
+                iter_features(stream),
+                imported_by=current_admin,
+                progress=lambda r: events.put({"done": False, **r, "errors": len(r["errors"])}),
+            )
+            create_audit_log(
+                admin_email=current_admin,
+                action_type="GEOJSON_IMPORTED",
+                description=f"Imported GeoJSON: {file.filename}",
+                entity_type="GEOJSON",
+                metadata={key: report[key] for key in ("processed", "invalid", "nodes", "edges", "aborted")}
+            )
+            events.put({"done": True, **report})
+        except GeoJSONFormatError as e:
+            events.put({"done": True, "error": str(e)})
+        except Exception as e:
+            events.put({"done": True, "error": f"Import failed: {e}"})
+
+    threading.Thread(target=run, name="geojson-import", daemon=True).start()
+
+    def lines():
+        while True:
+            event = events.get()
+            yield json.dumps(event) + "\n"
+            if event["done"]:
+                return
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/export", summary="Stream all nodes or edges as a GeoJSON FeatureCollection")
+def export_geojson(
+    kind: Literal["nodes", "edges"] = Query(..., description="Which collection to export"),
+    include_archived: bool = Query(False),
+    current_admin: str = Depends(get_current_admin)
+):
+    """Features are written as they are read from MongoDB (detail view: no _id/_meta)."""
+    return StreamingResponse(
+        export_feature_collection(kind, include_archived),
+        media_type="application/geo+json",
+        headers={"Content-Disposition": f'attachment; filename="{kind}.geojson"'}
+    )
@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.models.node_model import NodeFeature  # 🎯 Renamed from POICreate
-from app.services.node_service import add_poi, update_poi, get_all_pois, delete_poi, update_node_accessibility
+from app.services.node_service import add_poi, update_poi, get_all_pois, delete_poi, update_node_accessibility, archive_pois
 # 🎯 Import the node accessibility service needed for the moved route
 from app.core.security import get_current_admin
 from app.routers.audit_log_router import create_audit_log
 from app.routers.notification_router import create_notification
+from pydantic import BaseModel
 from pymongo.errors import DuplicateKeyError
 from typing import Optional, List, Dict
+from app.services.projections import View
 
 
 router = APIRouter(tags=["Admin POI Management"])  # Prefix is applied in main.py
 
+class BulkArchiveRequest(BaseModel):
+    ids: Optional[List[str]] = None  # properties.id values
+    building_id: Optional[str] = None
+    category: Optional[str] = None
+
 # --- 2.1 ADD LOCATION (POI) ---
 @router.post("/", status_code=201, summary="Add a new Point of Interest (Node)")
 def create_poi(poi: NodeFeature, current_admin: str = Depends(get_current_admin)): # Use NodeFeature
@@ -118,15 +125,11 @@ def patch_node_accessibility(
 def delete_poi_node(node_id: str, current_admin: str = Depends(get_current_admin)):
     """Archive (Soft-Delete) a POI by its properties.id (admin only)."""
     try:
-        # Get POI name before deletion for audit log
-        from app.core.database import nodes_collection
-        existing = nodes_collection.find_one({"properties.id": node_id})
-        poi_name = existing.get("properties", {}).get("name", node_id) if existing else node_id
-        
-        was_archived = delete_poi(node_id, archived_by=current_admin)
-        if not was_archived:
+        archived = delete_poi(node_id, archived_by=current_admin)
+        if not archived:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, 
                                 detail=f"POI with ID '{node_id}' not found or already archived.")
+        poi_name = archived.get("name", node_id)
         
         # Create audit log
         create_audit_log(
@@ -153,13 +156,64 @@ def delete_poi_node(node_id: str, current_admin: str = Depends(get_current_admin
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
                             detail="Internal server error during archival.")
 
+# --- 2.4 BULK REMOVE LOCATIONS (POIs) ---
+@router.post("/bulk/archive", summary="Archive (Soft-Delete) many Nodes/POIs at once")
+def bulk_archive_pois(request: BulkArchiveRequest, current_admin: str = Depends(get_current_admin)):
+    """
+    Archive every active POI matching the given ids and/or building/category filters
+    (admin only) in one update, with one audit entry and one notification.
+    """
+    if request.ids is None and not request.building_id and not request.category:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter (building_id, category).")
+
+    try:
+        archived = archive_pois(current_admin, request.ids, request.building_id, request.category)
+        archived_ids = [poi["id"] for poi in archived]
+
+        if archived:
+            create_audit_log(
+                admin_email=current_admin,
+                action_type="POIS_ARCHIVED",
+                description=f"Deleted {len(archived)} POIs",
+                entity_type="POI",
+                metadata={
+                    "poi_ids": archived_ids,
+                    "poi_names": [poi["name"] for poi in archived],
+                    "filters": request.model_dump(exclude={"ids"}, exclude_none=True)
+                }
+            )
+            create_notification(
+                notification_type="POI_DELETED",
+                title="POIs Deleted",
+                message=f"{len(archived)} POIs have been deleted",
+                metadata={"poi_ids": archived_ids}
+            )
+
+        not_archived = []
+        if request.ids is not None:
+            archived_set = set(archived_ids)
+            not_archived = [poi_id for poi_id in request.ids if poi_id.strip().lower() not in archived_set]
+
+        return {
+            "success": True,
+            "archived_count": len(archived),
+            "archived_ids": archived_ids,
+            "not_found": not_archived
+        }
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail="Internal server error during archival.")
+
 # --- 2.X GET ALL LOCATIONS (READ) ---
 @router.get("/all", response_model=List[Dict], summary="Retrieve all POI nodes, optionally filtered by building")
-def get_all_nodes(building_id: Optional[str] = Query(None, description="Optional filter by building ID")):
+def get_all_nodes(
+    building_id: Optional[str] = Query(None, description="Optional filter by building ID"),
+    view: View = Query("admin", description="Fields to return: marker, detail or admin")
+):
     """Retrieve all Point of Interest (POI) nodes."""
     # (Existing logic...)
     try:
-        pois = get_all_pois(building_id=building_id)
+        pois = get_all_pois(building_id=building_id, view=view)
         if not pois and building_id:
             raise HTTPException(status_code=404, detail=f"No POIs found for building ID: {building_id}")
         return pois
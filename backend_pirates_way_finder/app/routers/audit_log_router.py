@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional
 from datetime import datetime
 from app.core.database import db
+from app.core.indexes import register_index
+from app.core.write_behind import BufferedWriter
+from app.core.pagination import keyset_query, keyset_sort, split_page
+from app.core.async_database import async_audit_logs_collection
 from app.core.security import get_current_admin
 
 router = APIRouter()
@@ -9,21 +13,24 @@ router = APIRouter()
 # Audit logs collection
 audit_logs_collection = db["audit_logs"]
 
-# Create indexes (only if collection is empty or index doesn't exist)
-try:
-    audit_logs_collection.create_index("timestamp", -1)
-    audit_logs_collection.create_index("admin_email")
-    audit_logs_collection.create_index("action_type")
-except:
-    pass  # Indexes may already exist
+# Indexes (created at startup)
+# (timestamp, _id) compound indexes back keyset pagination, with and without filters
+register_index(audit_logs_collection, [("timestamp", -1), ("_id", -1)])
+register_index(audit_logs_collection, [("admin_email", 1), ("timestamp", -1), ("_id", -1)])
+register_index(audit_logs_collection, [("action_type", 1), ("timestamp", -1), ("_id", -1)])
+
+# Entries are written in batches off the request path
+audit_log_writer = BufferedWriter(audit_logs_collection, "audit_logs")
 
 # Action types
 ACTION_TYPES = {
     "POI_CREATED": "Added POI",
     "POI_UPDATED": "Updated POI",
     "POI_DELETED": "Deleted POI",
+    "POIS_ARCHIVED": "Deleted POIs (bulk)",
     "ACCESSIBILITY_UPDATED": "Updated accessibility",
     "RATING_RECEIVED": "New rating received",
+    "GEOJSON_IMPORTED": "Imported GeoJSON",
 }
 
 def create_audit_log(
@@ -44,34 +51,49 @@ def create_audit_log(
         "metadata": metadata or {},
         "timestamp": datetime.utcnow().isoformat(),
     }
-    audit_logs_collection.insert_one(log_entry)
+    audit_log_writer.add(log_entry)
     return log_entry
 
 @router.get("/", response_model=List[dict])
-def get_audit_logs(
+async def get_audit_logs(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Deprecated: use cursor (cannot be combined with it)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     action_type: Optional[str] = Query(None),
     admin_email: Optional[str] = Query(None),
     current_admin: str = Depends(get_current_admin)
 ):
-    """Get audit logs (admin only)."""
+    """
+    Get audit logs (admin only), newest first.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    # A cursor already says where the page starts; skipping past it as well would drop rows
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with cursor")
+
+    query = {}
+
+    if action_type:
+        query["action_type"] = action_type
+
+    if admin_email:
+        query["admin_email"] = admin_email
+
+    query = keyset_query(query, "timestamp", cursor)
+
     try:
-        query = {}
-        
-        if action_type:
-            query["action_type"] = action_type
-        
-        if admin_email:
-            query["admin_email"] = admin_email
-        
-        logs = list(
-            audit_logs_collection
+        logs = await (
+            async_audit_logs_collection
             .find(query)
-            .sort("timestamp", -1)
+            .sort(keyset_sort("timestamp"))
             .skip(skip)
-            .limit(limit)
+            .limit(limit + 1)
+            .to_list()
         )
+        logs, next_cursor = split_page(logs, limit, "timestamp")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         # Convert ObjectId to string
         for log in logs:
@@ -83,17 +105,17 @@ def get_audit_logs(
         raise HTTPException(status_code=500, detail=f"Failed to fetch audit logs: {str(e)}")
 
 @router.get("/stats")
-def get_audit_stats(current_admin: str = Depends(get_current_admin)):
+async def get_audit_stats(current_admin: str = Depends(get_current_admin)):
     """Get audit log statistics."""
     try:
-        total_logs = audit_logs_collection.count_documents({})
+        total_logs = await async_audit_logs_collection.count_documents({})
         
         # Count by action type
         pipeline = [
             {"$group": {"_id": "$action_type", "count": {"$sum": 1}}},
             {"$sort": {"count": -1}}
         ]
-        action_counts = list(audit_logs_collection.aggregate(pipeline))
+        action_counts = await (await async_audit_logs_collection.aggregate(pipeline)).to_list()
         
         return {
             "total_logs": total_logs,
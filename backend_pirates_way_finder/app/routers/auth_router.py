@@ -1,31 +1,46 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.models.admin_model import AdminCreate, AdminLogin
-from app.core.security import hash_password, verify_password, create_access_token, oauth2_scheme, decode_token
+from app.core.security import create_access_token, oauth2_scheme, decode_token
+from app.core.password_hashing import PasswordHashingBusy, hash_password_async, verify_password_async
 from app.core.database import db
+from app.core.async_database import async_admins_collection
+from app.core.indexes import register_index
 from datetime import timedelta
 from app.core.security import get_current_admin
 from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter(tags=["Authentication"])
 admins_collection = db["admins"]
+# Login looks admins up by email
+register_index(admins_collection, "email")
+
+def _hashing_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
 
 @router.post("/register")
-def register_admin(admin: AdminCreate):
+async def register_admin(admin: AdminCreate):
     """
     One-time use route — manually create an admin.
     Disable or secure after first admin creation.
     """
-    existing = admins_collection.find_one({"email": admin.email})
+    existing = await async_admins_collection.find_one({"email": admin.email})
     if existing:
         raise HTTPException(status_code=400, detail="Admin already exists")
 
-    hashed_pw = hash_password(admin.password)
+    try:
+        hashed_pw = await hash_password_async(admin.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
     admin_doc = {
         "email": admin.email,
         "password": hashed_pw,
         "full_name": admin.full_name or "",
     }
-    admins_collection.insert_one(admin_doc)
+    await async_admins_collection.insert_one(admin_doc)
     return {"message": "Admin registered successfully"}
 
 @router.get("/me")
@@ -41,10 +56,21 @@ def get_current_admin_info(current_admin: str = Depends(get_current_admin)):
     }
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    db_admin = admins_collection.find_one({"email": form_data.username})
-    if not db_admin or not verify_password(form_data.password, db_admin["password"]):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    db_admin = await async_admins_collection.find_one({"email": form_data.username})
+    if not db_admin:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    # argon2 runs on the bounded password executor, not the request threadpool
+    try:
+        valid, new_hash = await verify_password_async(form_data.password, db_admin["password"])
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash used older argon2 parameters
+        await async_admins_collection.update_one({"_id": db_admin["_id"]}, {"$set": {"password": new_hash}})
 
     token = create_access_token({"sub": form_data.username}, expires_delta=timedelta(minutes=60))
     return {"access_token": token, "token_type": "bearer"}
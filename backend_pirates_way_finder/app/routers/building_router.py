@@ -1,14 +1,18 @@
-from fastapi import APIRouter
-from app.services.building_service import get_all_locations_in_building
-from app.services.node_service import get_locations_by_category # 🎯 New import for the moved function
+from fastapi import APIRouter, Query
+from app.services.building_service import get_all_locations_in_building_async
+from app.services.node_service import get_locations_by_category_async # 🎯 New import for the moved function
+from app.services.projections import PublicView
 
 router = APIRouter(prefix="/buildings", tags=["Building Data"]) # 🎯 Added prefix for cleaner URLs
 
 # 1. Fetch all locations in a building (Original route)
 @router.get("/{building_id}/locations", summary="Get all locations within a specific building")
-def fetch_all_building_locations(building_id: str):
+async def fetch_all_building_locations(
+    building_id: str,
+    view: PublicView = Query("detail", description="Fields to return: marker or detail")
+):
     """Retrieves a list of all locations (Nodes/POIs) associated with the given building ID."""
-    locations = get_all_locations_in_building(building_id)
+    locations = await get_all_locations_in_building_async(building_id, view)
     return {
         "building": building_id,
         "count": len(locations),
@@ -17,9 +21,13 @@ def fetch_all_building_locations(building_id: str):
 
 # 2. Fetch locations filtered by category (Moved from location_router.py)
 @router.get("/{building_id}/categories/{category_id}/locations", summary="Get locations in a building filtered by category")
-def fetch_locations_by_category(building_id: str, category_id: str):
+async def fetch_locations_by_category(
+    building_id: str,
+    category_id: str,
+    view: PublicView = Query("detail", description="Fields to return: marker or detail")
+):
     """Retrieves locations within a building that match the specified category."""
-    locations = get_locations_by_category(building_id, category_id)
+    locations = await get_locations_by_category_async(building_id, category_id, view)
     return {
         "building": building_id,
         "category": category_id,
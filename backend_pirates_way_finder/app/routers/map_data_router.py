@@ -1,18 +1,23 @@
-from fastapi import APIRouter
-from app.services.node_service import get_all_pois
-from app.services.pathway_service import get_all_pathways
+from fastapi import APIRouter, Query
+from app.services.node_service import get_all_pois_async
+from app.services.pathway_service import get_all_pathways_async
+from app.services.projections import PublicView
 from typing import Dict, List
 
 router = APIRouter(tags=["Public Map Data"])  # Prefix is set in main.py
 
 @router.get("/nodes", summary="Get all Point features (Nodes/POIs) in GeoJSON format")
-def fetch_all_nodes() -> List[Dict]:
+async def fetch_all_nodes(
+    view: PublicView = Query("detail", description="marker: only what map markers need; detail: all GeoJSON fields")
+) -> List[Dict]:
     """Retrieves all public map nodes (Points) for rendering or analysis."""
     # Assuming get_all_nodes returns a list of Node objects (dict/GeoJSON features)
-    return get_all_pois()
+    return await get_all_pois_async(view=view)
 
 @router.get("/edges", summary="Get all LineString features (Edges/Pathways) in GeoJSON format")
-def fetch_all_edges() -> List[Dict]:
+async def fetch_all_edges(
+    view: PublicView = Query("detail", description="marker: only what map lines need; detail: all GeoJSON fields")
+) -> List[Dict]:
     """Retrieves all public map edges (LineStrings) for rendering or analysis."""
     # Assuming get_all_edges returns a list of Edge objects (dict/GeoJSON features)
-    return get_all_pathways()
+    return await get_all_pathways_async(view=view)
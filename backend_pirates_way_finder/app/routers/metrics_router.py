@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import render
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus text exposition of in-process metrics: per-stage pathfinding latency,
+    expanded nodes, request counts by mode and cache hit/miss counters.
+    """
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
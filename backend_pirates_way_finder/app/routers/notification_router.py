@@ -1,29 +1,104 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 from typing import List
 from datetime import datetime, timedelta
+import asyncio
+import json
+import os
+import threading
+from bson import ObjectId
+from app.core.broker import EventBroker
 from app.core.database import db
-from app.core.security import get_current_admin
+from app.core.metrics import Gauge
+from app.core.indexes import register_index
+from app.core.write_behind import BufferedWriter
+from app.core.pagination import keyset_query, keyset_sort, split_page
+from app.core.async_database import async_notifications_collection
+from app.core.security import get_current_admin, get_current_admin_for_stream
 
 router = APIRouter()
 
 # Notifications collection
 notifications_collection = db["notifications"]
 
-# Create indexes (only if collection is empty or index doesn't exist)
-try:
-    notifications_collection.create_index("timestamp", -1)
-    notifications_collection.create_index("read", 1)
-except:
-    pass  # Indexes may already exist
+# Indexes (created at startup)
+# (timestamp, _id) compound indexes back keyset pagination of all / unread notifications
+register_index(notifications_collection, [("timestamp", -1), ("_id", -1)])
+register_index(notifications_collection, [("read", 1), ("timestamp", -1), ("_id", -1)])
 
-def create_notification(
-    notification_type: str,
-    title: str,
-    message: str,
-    metadata: dict = None
-):
-    """Create a notification."""
-    notification = {
+# Notifications are written in batches off the request path
+notification_writer = BufferedWriter(notifications_collection, "notifications")
+
+# New notifications are pushed to connected admin dashboards (GET /stream)
+notification_broker = EventBroker("notifications")
+
+# Comment line sent when idle, so proxies don't close the stream
+NOTIFICATION_STREAM_KEEPALIVE_SECONDS = float(os.getenv("NOTIFICATION_STREAM_KEEPALIVE_SECONDS", "15"))
+# Streams are closed after this long and the browser reconnects; keeps shutdown from
+# waiting on streams forever
+NOTIFICATION_STREAM_MAX_SECONDS = float(os.getenv("NOTIFICATION_STREAM_MAX_SECONDS", "300"))
+
+# Unread count served from memory: create_notification increments it, mark_as_read
+# decrements it, and it is reset from MongoDB every NOTIFICATION_COUNT_RECONCILE_SECONDS
+# (which also corrects changes made by other API processes or directly in the database).
+NOTIFICATION_COUNT_RECONCILE_SECONDS = float(os.getenv("NOTIFICATION_COUNT_RECONCILE_SECONDS", "60"))
+
+unread_gauge = Gauge("notifications_unread", "Cached count of unread notifications.")
+
+_unread_count: Optional[int] = None  # None until the first reconciliation
+_unread_lock = threading.Lock()
+
+def _adjust_unread(delta: int):
+    global _unread_count
+    with _unread_lock:
+        if _unread_count is not None:
+            _unread_count = max(_unread_count + delta, 0)
+            unread_gauge.set(_unread_count)
+
+def _count_unread() -> int:
+    # Buffered notifications are all unread; with flushes paused none of them can be
+    # stored between the count and depth(), which would count it twice
+    with notification_writer.flushes_paused():
+        return notifications_collection.count_documents({"read": False}) + notification_writer.depth()
+
+async def reconcile_unread_count() -> int:
+    """Recount unread notifications in MongoDB (plus those still buffered) and reset the cache."""
+    global _unread_count
+    count = await run_in_threadpool(_count_unread)
+    with _unread_lock:
+        _unread_count = count
+        unread_gauge.set(count)
+    return count
+
+async def run_unread_reconciler():
+    """Background task: reconcile the unread count periodically (started at startup)."""
+    while True:
+        try:
+            await reconcile_unread_count()
+        except Exception as e:
+            print(f"[NOTIFICATIONS] Unread count reconciliation failed: {e}")
+        await asyncio.sleep(NOTIFICATION_COUNT_RECONCILE_SECONDS)
+
+class BulkReadRequest(BaseModel):
+    ids: Optional[List[str]] = None
+    type: Optional[str] = None
+    before: Optional[str] = None  # ISO timestamp: notifications created before it
+    all: bool = False  # every unread notification
+
+def _object_id(notification_id: str):
+    try:
+        return ObjectId(notification_id)
+    except Exception:
+        return notification_id
+
+def _build_notification(notification_type: str, title: str, message: str, metadata: dict = None) -> dict:
+    return {
+        # Assigned here (not by the buffered insert) so the streamed event carries the
+        # id the stored document will have
+        "_id": ObjectId(),
         "type": notification_type,
         "title": title,
         "message": message,
@@ -31,27 +106,65 @@ def create_notification(
         "read": False,
         "timestamp": datetime.utcnow().isoformat(),
     }
-    notifications_collection.insert_one(notification)
+
+def _announce(notification: dict) -> dict:
+    """Once a notification is queued: count it as unread and push it to stream subscribers."""
+    _adjust_unread(1)
+    notification_id = str(notification["_id"])
+    data = json.dumps({**notification, "_id": notification_id, "id": notification_id}, default=str)
+    notification_broker.publish(f"id: {notification_id}\nevent: notification\ndata: {data}\n\n")
     return notification
 
+def create_notification(
+    notification_type: str,
+    title: str,
+    message: str,
+    metadata: dict = None
+):
+    """Create a notification."""
+    notification = _build_notification(notification_type, title, message, metadata)
+    notification_writer.add(notification)
+    return _announce(notification)
+
+async def create_notification_async(
+    notification_type: str,
+    title: str,
+    message: str,
+    metadata: dict = None
+):
+    """Create a notification (for async handlers); never blocks the event loop on MongoDB."""
+    notification = _build_notification(notification_type, title, message, metadata)
+    await notification_writer.add_async(notification)
+    return _announce(notification)
+
 @router.get("/", response_model=List[dict])
-def get_notifications(
+async def get_notifications(
+    response: Response,
     unread_only: bool = False,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_admin: str = Depends(get_current_admin)
 ):
-    """Get notifications (admin only)."""
+    """
+    Get notifications (admin only), newest first.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    query = {}
+    if unread_only:
+        query["read"] = False
+    query = keyset_query(query, "timestamp", cursor)
+
     try:
-        query = {}
-        if unread_only:
-            query["read"] = False
-        
-        notifications = list(
-            notifications_collection
+        notifications = await (
+            async_notifications_collection
             .find(query)
-            .sort("timestamp", -1)
-            .limit(limit)
+            .sort(keyset_sort("timestamp"))
+            .limit(limit + 1)
+            .to_list()
         )
+        notifications, next_cursor = split_page(notifications, limit, "timestamp")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         # Convert ObjectId to string
         for notif in notifications:
@@ -62,33 +175,98 @@ def get_notifications(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch notifications: {str(e)}")
 
+@router.get("/stream")
+async def stream_notifications(request: Request, current_admin: str = Depends(get_current_admin_for_stream)):
+    """
+    Server-sent events: one `notification` event per new notification, as it is created.
+    EventSource clients pass the token as ?access_token= and reconnect automatically.
+    """
+    async def events():
+        subscription = notification_broker.subscribe()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + NOTIFICATION_STREAM_MAX_SECONDS
+        try:
+            yield "retry: 3000\n\n"
+            while loop.time() < deadline:
+                try:
+                    yield await asyncio.wait_for(subscription.get(), NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/bulk/read")
+async def bulk_mark_as_read(request: BulkReadRequest, current_admin: str = Depends(get_current_admin)):
+    """Mark many notifications as read (by ids and/or type/before filters) in one update."""
+    if request.ids is None and not request.type and not request.before and not request.all:
+        raise HTTPException(status_code=400, detail="Provide ids, a filter (type, before) or all=true.")
+
+    query = {"read": False}
+    if request.ids is not None:
+        query["_id"] = {"$in": [_object_id(notification_id) for notification_id in request.ids]}
+    if request.type:
+        query["type"] = request.type
+    if request.before:
+        query["timestamp"] = {"$lt": request.before}
+
+    try:
+        # Notifications still in the write-behind buffer must be stored to be updated.
+        # This writes every buffered notification (audit entries are not affected) in
+        # the threadpool before the update: a bulk read is rare, and without it
+        # "mark all as read" would leave the last flush interval's notifications unread
+        await run_in_threadpool(notification_writer.flush)
+        result = await async_notifications_collection.update_many(
+            query,
+            {"$set": {"read": True, "read_at": datetime.utcnow().isoformat()}}
+        )
+        _adjust_unread(-result.modified_count)
+        return {"success": True, "marked_count": result.modified_count}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to mark notifications as read: {str(e)}")
+
 @router.post("/{notification_id}/read")
-def mark_as_read(notification_id: str, current_admin: str = Depends(get_current_admin)):
+async def mark_as_read(notification_id: str, current_admin: str = Depends(get_current_admin)):
     """Mark a notification as read."""
     try:
-        from bson import ObjectId
-        try:
-            obj_id = ObjectId(notification_id)
-        except:
-            obj_id = notification_id
+        obj_id = _object_id(notification_id)
         
-        result = notifications_collection.update_one(
-            {"_id": obj_id},
-            {"$set": {"read": True, "read_at": datetime.utcnow().isoformat()}}
-        )
+        # Only an unread -> read transition changes the unread count
+        update = ({"_id": obj_id, "read": False}, {"$set": {"read": True, "read_at": datetime.utcnow().isoformat()}})
+        result = await async_notifications_collection.update_one(*update)
+        if not result.modified_count:
+            # The SSE stream sends notifications before the write-behind buffer stores
+            # them; store whatever is buffered (or being flushed) and try once more.
+            # Only this miss path pays for a flush, and only for notifications read
+            # within one flush interval of being created
+            await run_in_threadpool(notification_writer.flush)
+            result = await async_notifications_collection.update_one(*update)
         
-        if result.matched_count == 0:
+        if result.modified_count:
+            _adjust_unread(-1)
+        elif not await async_notifications_collection.count_documents({"_id": obj_id}, limit=1):
             raise HTTPException(status_code=404, detail="Notification not found")
         
         return {"success": True, "message": "Notification marked as read"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to mark notification as read: {str(e)}")
 
 @router.get("/unread/count")
-def get_unread_count(current_admin: str = Depends(get_current_admin)):
-    """Get count of unread notifications."""
+async def get_unread_count(current_admin: str = Depends(get_current_admin)):
+    """Get count of unread notifications (cached; reconciled with MongoDB periodically)."""
     try:
-        count = notifications_collection.count_documents({"read": False})
+        count = _unread_count
+        if count is None:
+            count = await reconcile_unread_count()
         return {"unread_count": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get unread count: {str(e)}")
@@ -1,61 +1,52 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from app.services.pathfinding_astar import astar, simplify_path, smooth_path, generate_instructions_from_grid_path
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from app.services.route_service import PathRequest
+from app.services.path_executor import dispatch_route, PathfindingBusy, PathfindingTimeout
+from app.services.spatial_index import snap_to_walkable, cell_to_pixel, nearest_node
+from app.services.pathfinding_stats import log_search, record_route
 from app.core.grid_loader import grid_instance
-import math
+import time
 
 router = APIRouter(prefix="/path", tags=["Pathfinding"])
 
-class PathRequest(BaseModel):
-    start_x: int
-    start_y: int
-    end_x: int
-    end_y: int
-    accessibility_mode: bool = False
-
 @router.post("/shortest")
-def shortest_path(req: PathRequest):
-    # Using A* algorithm (2-4x faster than Dijkstra, same shortest path!)
-    path = astar(req.start_x, req.start_y, req.end_x, req.end_y, req.accessibility_mode)
-    
-    if not path or len(path) == 0:
-        return {
-            "path": [],
-            "instructions": [],
-            "distance_meters": 0,
-            "estimated_time_minutes": 0
-        }
-    
-    # Apply path smoothing for visual appeal (Catmull-Rom spline)
-    smoothed_path = smooth_path(path, smoothing_factor=0.3) if path and len(path) > 2 else path
-    
-    # Calculate total distance using original path (not smoothed) for accuracy
-    total_distance = 0
-    if len(path) > 1:
-        for i in range(len(path) - 1):
-            dx = path[i + 1]['x'] - path[i]['x']
-            dy = path[i + 1]['y'] - path[i]['y']
-            segment_distance = (dx ** 2 + dy ** 2) ** 0.5
-            total_distance += segment_distance
-    
-    PIXEL_TO_METER = 0.02
-    distance_meters = total_distance * PIXEL_TO_METER
-    AVERAGE_WALK_SPEED = 1.4  # m/s
-    estimated_time_seconds = distance_meters / AVERAGE_WALK_SPEED
-    
-    # Generate instructions using simplified path (not smoothed, for accuracy)
-    instructions = []
-    if path and len(path) > 0:
-        simplified_path = simplify_path(path, tolerance=20)
-        print(f"[INSTRUCTIONS] Simplified path from {len(path)} to {len(simplified_path)} points")
-        instructions = generate_instructions_from_grid_path(simplified_path, PIXEL_TO_METER, angle_threshold=2)
-        print(f"[INSTRUCTIONS] ✅ Generated {len(instructions)} instructions")
-    
+async def shortest_path(req: PathRequest):
+    """
+    Shortest walkable route between two map positions. The search runs in the
+    pathfinding worker pool so long routes don't block other requests.
+    """
+    started = time.perf_counter()
+    try:
+        content, stats = await dispatch_route(req)
+    except PathfindingBusy:
+        raise HTTPException(status_code=503, detail="Pathfinding is busy, please retry shortly",
+                            headers={"Retry-After": "1"})
+    except PathfindingTimeout:
+        raise HTTPException(status_code=504, detail="Route computation timed out")
+    stats["total_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    log_search(stats)
+    record_route(stats)
+    return Response(content, media_type="application/json")
+
+@router.get("/snap")
+def snap_point(
+    x: float = Query(..., description="Pixel x coordinate on the map"),
+    y: float = Query(..., description="Pixel y coordinate on the map"),
+    accessibility_mode: bool = Query(False, description="Also treat stair areas as non-walkable")
+):
+    """
+    Snaps a map position to the nearest walkable grid cell and the nearest node.
+    """
+    cell = snap_to_walkable(x, y, accessibility_mode)
+    walkable = cell_to_pixel(*cell) if cell else None
+
     return {
-        "path": smoothed_path,  # Return smoothed path for rendering
-        "instructions": instructions,
-        "distance_meters": round(distance_meters, 2),
-        "estimated_time_minutes": round(estimated_time_seconds / 60, 2)
+        "x": x,
+        "y": y,
+        "walkable_cell": walkable,
+        "snapped": bool(walkable) and (int(x // grid_instance.cell_size), int(y // grid_instance.cell_size)) != cell,
+        "nearest_node": nearest_node(x, y)
     }
 
 @router.get("/walkable-grid")
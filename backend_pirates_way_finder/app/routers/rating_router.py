@@ -1,18 +1,30 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Response
+import asyncio
+from typing import List, Literal, Optional
+from datetime import datetime, timezone
 from pydantic import BaseModel
 from app.core.database import db
-from app.routers.notification_router import create_notification
+from app.core.indexes import register_index
+from app.core.pagination import keyset_query, keyset_sort, split_page
+from app.core.async_database import async_ratings_collection
+from app.routers.notification_router import create_notification_async
+from app.services.rating_summary_service import get_rating_summaries_async, record_rating_async
+from app.services.rating_rollup_service import get_rating_series_async, record_rating_rollups_async
 
 router = APIRouter()
 
 # Ratings collection
 ratings_collection = db["ratings"]
 
-# Create index for faster queries
-ratings_collection.create_index("location_id")
-ratings_collection.create_index("created_at")
+# Indexes for faster queries (created at startup); (created_at, _id) compounds back
+# keyset pagination of all ratings and of ratings per location / building
+register_index(ratings_collection, [("created_at", -1), ("_id", -1)])
+register_index(ratings_collection, [("location_id", 1), ("created_at", -1), ("_id", -1)])
+register_index(ratings_collection, [("building_name", 1), ("created_at", -1), ("_id", -1)])
+
+# Page size limits for rating listings
+RATINGS_DEFAULT_LIMIT = 100
+RATINGS_MAX_LIMIT = 1000
 
 # Rating model
 class RatingCreate(BaseModel):
@@ -34,7 +46,7 @@ class RatingResponse(BaseModel):
     created_at: str
 
 @router.post("/", status_code=201)
-def create_rating(rating: RatingCreate):
+async def create_rating(rating: RatingCreate):
     """Create a new rating for a location."""
     try:
         rating_doc = {
@@ -47,12 +59,19 @@ def create_rating(rating: RatingCreate):
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = ratings_collection.insert_one(rating_doc)
+        result = await async_ratings_collection.insert_one(rating_doc)
         rating_doc["id"] = str(result.inserted_id)
         rating_doc["_id"] = str(result.inserted_id)
+
+        # Keep the per-location summary and trend rollups current; a failure here must
+        # not fail the already-stored rating (the rebuild scripts repair them)
+        try:
+            await asyncio.gather(record_rating_async(rating_doc), record_rating_rollups_async(rating_doc))
+        except Exception as e:
+            print(f"[RATINGS] Failed to update summary/rollups for {rating.location_id}: {e}")
         
         # Create notification for new rating
-        create_notification(
+        await create_notification_async(
             notification_type="RATING_RECEIVED",
             title="New Rating Received",
             message=f"New {rating.rating} rating for {rating.location_name}",
@@ -72,21 +91,32 @@ def create_rating(rating: RatingCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create rating: {str(e)}")
 
 @router.get("/", response_model=List[dict])
-def get_all_ratings(
+async def get_all_ratings(
+    response: Response,
     location_id: Optional[str] = Query(None, description="Filter by location ID"),
-    building_name: Optional[str] = Query(None, description="Filter by building name")
+    building_name: Optional[str] = Query(None, description="Filter by building name"),
+    limit: int = Query(RATINGS_DEFAULT_LIMIT, ge=1, le=RATINGS_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
-    """Get all ratings, optionally filtered by location_id or building_name."""
+    """
+    Get ratings newest first, optionally filtered by location_id or building_name.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    query = {}
+
+    if location_id:
+        query["location_id"] = location_id
+
+    if building_name:
+        query["building_name"] = building_name
+
+    query = keyset_query(query, "created_at", cursor)
+
     try:
-        query = {}
-        
-        if location_id:
-            query["location_id"] = location_id
-        
-        if building_name:
-            query["building_name"] = building_name
-        
-        ratings = list(ratings_collection.find(query).sort("created_at", -1))
+        ratings = await async_ratings_collection.find(query).sort(keyset_sort("created_at")).limit(limit + 1).to_list()
+        ratings, next_cursor = split_page(ratings, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         # Convert ObjectId to string
         for rating in ratings:
@@ -98,10 +128,22 @@ def get_all_ratings(
         raise HTTPException(status_code=500, detail=f"Failed to fetch ratings: {str(e)}")
 
 @router.get("/by-location/{location_id}")
-def get_ratings_by_location(location_id: str):
-    """Get all ratings for a specific location."""
+async def get_ratings_by_location(
+    location_id: str,
+    response: Response,
+    limit: int = Query(RATINGS_DEFAULT_LIMIT, ge=1, le=RATINGS_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
+):
+    """
+    Get ratings for a specific location, newest first.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    query = keyset_query({"location_id": location_id}, "created_at", cursor)
     try:
-        ratings = list(ratings_collection.find({"location_id": location_id}).sort("created_at", -1))
+        ratings = await async_ratings_collection.find(query).sort(keyset_sort("created_at")).limit(limit + 1).to_list()
+        ratings, next_cursor = split_page(ratings, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         for rating in ratings:
             rating["id"] = str(rating["_id"])
@@ -115,27 +157,77 @@ def get_ratings_by_location(location_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch ratings: {str(e)}")
 
+@router.get("/summary")
+async def get_rating_summaries(
+    building_name: Optional[str] = Query(None, description="Filter by building name")
+):
+    """
+    Per-location rating summaries (counts per rating, latest rating, average and
+    rolling score), most recently rated first. Read from the materialized summaries.
+    """
+    try:
+        summaries = await get_rating_summaries_async(building_name)
+        return {
+            "count": len(summaries),
+            "locations": summaries
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch rating summaries: {str(e)}")
+
+def _parse_bound(name: str, value: Optional[str]) -> Optional[datetime]:
+    """An ISO date/timestamp query parameter as a naive UTC datetime (422 naming the parameter if invalid)."""
+    if value is None:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name} must be an ISO date or timestamp")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+@router.get("/trends")
+async def get_rating_trends(
+    scope: Literal["location", "building"] = Query(..., description="Series per location or per building"),
+    key: str = Query(..., description="location_id (scope=location) or building_name (scope=building)"),
+    granularity: Literal["hour", "day", "week"] = Query("day"),
+    start: Optional[str] = Query(None, description="ISO date/timestamp, inclusive"),
+    end: Optional[str] = Query(None, description="ISO date/timestamp, exclusive")
+):
+    """
+    Rating counts, GOOD share and average score per time bucket, oldest first.
+    Read from the hourly/daily rollups (weeks are summed from days).
+    """
+    start_at, end_at = _parse_bound("start", start), _parse_bound("end", end)
+    try:
+        series = await get_rating_series_async(scope, key, granularity, start_at, end_at)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch rating trends: {str(e)}")
+
+    return {
+        "scope": scope,
+        "key": key,
+        "granularity": granularity,
+        "count": len(series),
+        "series": series
+    }
+
 @router.get("/locations")
-def get_locations_with_ratings():
-    """Get all unique locations that have ratings, grouped by location."""
+async def get_locations_with_ratings():
+    """Get all unique locations that have ratings (from the materialized summaries)."""
     try:
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$location_id",
-                    "location_name": {"$first": "$location_name"},
-                    "building_name": {"$first": "$building_name"},
-                    "rating_count": {"$sum": 1},
-                    "latest_rating": {"$max": "$created_at"}
-                }
-            },
+        summaries = await get_rating_summaries_async()
+        locations = [
             {
-                "$sort": {"latest_rating": -1}
+                "_id": summary["location_id"],
+                "location_name": summary["location_name"],
+                "building_name": summary["building_name"],
+                "rating_count": summary["rating_count"],
+                "latest_rating": summary["latest_rating"]
             }
+            for summary in summaries
         ]
         
-        locations = list(ratings_collection.aggregate(pipeline))
-        
         return {
             "count": len(locations),
             "locations": locations
@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 # 🎯 Import the existing service function
-from app.services.search_service import search_locations
+from app.services.search_service import search_locations_async
+from app.services.projections import PublicView
+from app.services.search_index import suggest, SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, SUGGEST_MAX_QUERY_LENGTH
 from typing import Optional, List, Dict
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 @router.get("/", summary="Search locations by query and optional filters")
-def search_locations_route(
+async def search_locations_route(
     query: str = Query(..., description="The main search keyword (required)"), # Changed to required string
     category: Optional[str] = Query(None, description="Filter results by category (e.g., office, amenity)"),
-    building_id: Optional[str] = Query(None, description="Filter results by building ID")
+    building_id: Optional[str] = Query(None, description="Filter results by building ID"),
+    fuzzy: bool = Query(False, description="Typo-tolerant ranked matching instead of plain substring search"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Maximum number of results (fuzzy search only)"),
+    view: PublicView = Query("detail", description="Fields to return per result: marker or detail")
 ):
     """
     Retrieves locations matching the provided query, potentially filtered by category and building.
     """
     # 🎯 Delegate logic. The service should handle the filtering if possible.
-    results_data = search_locations(
+    results_data = await search_locations_async(
         query=query, 
         category=category, 
-        building_id=building_id
+        building_id=building_id,
+        fuzzy=fuzzy,
+        limit=limit,
+        view=view
     )
 
     return {
@@ -27,4 +35,27 @@ def search_locations_route(
         "building_id": building_id,
         "count": results_data.get("count", 0),
         "results": results_data.get("results", [])
-    }
\ No newline at end of file
+    }
+
+@router.get("/suggest", summary="Typeahead suggestions for a partially typed query")
+def suggest_locations_route(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=SUGGEST_MAX_QUERY_LENGTH, description="What the user has typed so far"),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT, description="Maximum number of suggestions"),
+    category: Optional[str] = Query(None, description="Filter suggestions by category"),
+    building_id: Optional[str] = Query(None, description="Filter suggestions by building ID")
+):
+    """
+    Returns the top suggestions as small {id, name, building, category, coordinates} rows,
+    served from the in-memory prefix index (no database round trip).
+    """
+    suggestions = suggest(q, limit=limit, category=category, building_id=building_id)
+
+    # Identical keystrokes from the same client can be answered from its cache
+    response.headers["Cache-Control"] = "public, max-age=60"
+
+    return {
+        "query": q,
+        "count": len(suggestions),
+        "suggestions": suggestions
+    }
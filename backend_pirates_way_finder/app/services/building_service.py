@@ -1,11 +1,12 @@
 from typing import List, Dict
+from app.services.projections import View
 from app.core.database import nodes_collection # 🎯 Use MongoDB for efficient querying
 from fastapi import HTTPException # For potential error handling
 
 # 🎯 NOTE: We import the correct service function to avoid duplicating query logic
-from .node_service import get_all_pois 
+from .node_service import get_all_pois, get_all_pois_async
 
-def get_all_locations_in_building(building_id: str) -> List[Dict]:
+def get_all_locations_in_building(building_id: str, view: View = "admin") -> List[Dict]:
     """
     Fetch all active Node/POI locations inside a specific building by querying MongoDB.
     
@@ -15,9 +16,21 @@ def get_all_locations_in_building(building_id: str) -> List[Dict]:
         raise HTTPException(status_code=400, detail="Building ID is required.")
         
     # 🎯 Delegate the work to the primary Node/POI retrieval function for consistency
-    locations = get_all_pois(building_id=building_id)
+    locations = get_all_pois(building_id=building_id, view=view)
     
     if not locations:
         raise HTTPException(status_code=404, detail=f"No locations found for building ID: {building_id}")
 
-    return locations
\ No newline at end of file
+    return locations
+
+async def get_all_locations_in_building_async(building_id: str, view: View = "admin") -> List[Dict]:
+    """Async variant of get_all_locations_in_building."""
+    if not building_id:
+        raise HTTPException(status_code=400, detail="Building ID is required.")
+
+    locations = await get_all_pois_async(building_id=building_id, view=view)
+
+    if not locations:
+        raise HTTPException(status_code=404, detail=f"No locations found for building ID: {building_id}")
+
+    return locations
@@ -0,0 +1,295 @@
+"""
+Bulk GeoJSON import/export for nodes and edges.
+
+Import reads a FeatureCollection (or newline-delimited features) incrementally, so a
+large file is never held in memory as a whole. It validates every feature against
+NodeFeature (Point) or EdgeFeature (LineString) and upserts by properties.id in ordered
+bulk_write chunks of GEOJSON_IMPORT_CHUNK_SIZE. Invalid features are skipped and
+reported. A progress callback gets the running report after every chunk.
+
+Properties are merged, not replaced: each property given in the file is set on its own,
+properties the models don't declare (description, image, ...) are kept as-is, and model
+defaults only fill in properties of newly inserted features. Exporting and importing
+again therefore loses nothing.
+
+Export streams the active nodes or edges as a FeatureCollection, one feature at a time.
+
+Used by the admin endpoints in admin_geojson_router and by `python geojson_tool.py`.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.database import edges_collection, nodes_collection
+from app.models.edge_model import EdgeFeature
+from app.models.node_model import NodeFeature
+from app.services.node_service import invalidate_node_caches, sanitize_id
+from app.services.projections import EDGE_VIEWS, NODE_VIEWS
+
+GEOJSON_IMPORT_CHUNK_SIZE = int(os.getenv("GEOJSON_IMPORT_CHUNK_SIZE", "500"))
+# Invalid features listed individually in the report (the count is always complete)
+MAX_REPORTED_ERRORS = 100
+
+_READ_SIZE = 64 * 1024
+
+
+class GeoJSONFormatError(ValueError):
+    """The input is not a FeatureCollection or newline-delimited features."""
+
+
+def iter_features(stream: TextIO) -> Iterator[Dict]:
+    """
+    Yield the features of a FeatureCollection (or of newline-delimited GeoJSON
+    features) read incrementally from a text stream.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buffer += chunk
+        return True
+
+    # Find the start of the document
+    while not buffer.lstrip() and fill():
+        pass
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+
+    if buffer.startswith("{"):
+        # Either a FeatureCollection or the first of several newline-delimited features:
+        # look for the "features" array before the first feature would have ended
+        while '"features"' not in buffer and '"geometry"' not in buffer and fill():
+            pass
+        key = buffer.find('"features"')
+        if key == -1 or (buffer.find('"geometry"') != -1 and buffer.find('"geometry"') < key):
+            yield from _iter_delimited(stream, decoder, buffer)
+            return
+        start = key + len('"features"')
+        while "[" not in buffer[start:] and fill():
+            pass
+        bracket = buffer.find("[", start)
+        if bracket == -1:
+            raise GeoJSONFormatError("FeatureCollection has no features array")
+        buffer = buffer[bracket + 1:]
+    else:
+        raise GeoJSONFormatError("Expected a GeoJSON FeatureCollection")
+
+    # Decode one feature at a time from the array
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,")
+        if buffer.startswith("]"):
+            return
+        try:
+            feature, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise GeoJSONFormatError("Truncated or malformed features array")
+            fill()
+            continue
+        yield feature
+        buffer = buffer[end:]
+        if not buffer and not fill():
+            raise GeoJSONFormatError("Truncated features array")
+
+
+def _iter_delimited(stream: TextIO, decoder: json.JSONDecoder, buffer: str) -> Iterator[Dict]:
+    """Features separated by whitespace/newlines (newline-delimited GeoJSON)."""
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            if eof:
+                return
+            chunk = stream.read(_READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        try:
+            feature, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = "" if eof else stream.read(_READ_SIZE)
+            if not chunk:
+                raise GeoJSONFormatError("Malformed newline-delimited GeoJSON")
+            buffer += chunk
+            continue
+        yield feature
+        buffer = buffer[end:]
+
+
+def validate_feature(feature) -> tuple:
+    """
+    (kind, document, defaults) for a valid feature; raises ValueError otherwise.
+
+    document["properties"] holds the validated properties the feature gives plus the
+    ones the model doesn't declare; defaults holds model defaults for the rest.
+    """
+    geometry_type = (feature.get("geometry") or {}).get("type") if isinstance(feature, dict) else None
+    if geometry_type == "Point":
+        kind, model = "nodes", NodeFeature
+    elif geometry_type == "LineString":
+        kind, model = "edges", EdgeFeature
+    else:
+        raise ValueError(f"Unsupported geometry type: {geometry_type!r}")
+
+    validated = model.model_validate(feature)
+    declared = {field.alias or name for name, field in type(validated.properties).model_fields.items()}
+    properties = {key: value for key, value in feature["properties"].items() if key not in declared}
+    bad_keys = [key for key in properties if "." in key or key.startswith("$")]
+    if bad_keys:
+        raise ValueError(f"Invalid property name(s): {', '.join(bad_keys)}")
+    properties.update(validated.properties.model_dump(by_alias=True, exclude_none=True, exclude_unset=True))
+    if kind == "nodes":
+        properties["id"] = sanitize_id(properties["id"])
+    defaults = {
+        key: value
+        for key, value in validated.properties.model_dump(by_alias=True, exclude_none=True).items()
+        if key not in properties
+    }
+    doc = {"type": validated.type, "geometry": validated.geometry.model_dump(exclude_none=True), "properties": properties}
+    return kind, doc, defaults
+
+
+def describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+
+def import_features(
+    features: Iterable[Dict],
+    imported_by: Optional[str] = None,
+    chunk_size: int = GEOJSON_IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Validate and upsert features (nodes and edges by properties.id). Returns a report:
+    processed, invalid, per-collection inserted/updated counts, errors, and `aborted`
+    when a bulk write failed (ordered: everything before the failing feature is applied).
+    """
+    collections = {"nodes": nodes_collection, "edges": edges_collection}
+    pending = {"nodes": [], "edges": []}
+    report = {
+        "processed": 0,
+        "invalid": 0,
+        "nodes": {"inserted": 0, "updated": 0},
+        "edges": {"inserted": 0, "updated": 0},
+        "errors": [],
+        "aborted": False,
+    }
+    now = datetime.utcnow().isoformat()
+
+    def flush(kind) -> bool:
+        ops = pending[kind]
+        if not ops:
+            return True
+        pending[kind] = []
+        try:
+            result = collections[kind].bulk_write(ops, ordered=True)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            first = e.details["writeErrors"][0]
+            report["errors"].append({"collection": kind, "error": first.get("errmsg")})
+            report["aborted"] = True
+        report[kind]["inserted"] += details.get("nUpserted", 0)
+        report[kind]["updated"] += details.get("nMatched", 0)
+        if kind == "nodes":
+            invalidate_node_caches()
+        if progress:
+            progress(report)
+        return not report["aborted"]
+
+    for index, feature in enumerate(features):
+        report["processed"] += 1
+        try:
+            kind, doc, defaults = validate_feature(feature)
+        except (ValidationError, ValueError) as e:
+            report["invalid"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                feature_id = ((feature.get("properties") or {}).get("id") if isinstance(feature, dict) else None)
+                report["errors"].append({"index": index, "id": feature_id, "error": describe_error(e)})
+            continue
+
+        # Per-property $set so stored properties missing from the file survive
+        pending[kind].append(UpdateOne(
+            {"properties.id": doc["properties"]["id"]},
+            {
+                "$set": {
+                    "type": doc["type"],
+                    "geometry": doc["geometry"],
+                    **{f"properties.{key}": value for key, value in doc["properties"].items()},
+                    "_meta.imported_by": imported_by,
+                    "_meta.imported_at": now,
+                },
+                "$setOnInsert": {
+                    **{f"properties.{key}": value for key, value in defaults.items()},
+                    "_meta.created_by": imported_by,
+                    "_meta.created_at": now,
+                },
+            },
+            upsert=True,
+        ))
+        if len(pending[kind]) >= chunk_size and not flush(kind):
+            return report
+
+    # Nodes before edges, so a run's edges never point at nodes it has not written yet
+    for kind in ("nodes", "edges"):
+        if not flush(kind):
+            break
+    return report
+
+
+def export_feature_collection(kind: str, include_archived: bool = False) -> Iterator[str]:
+    """Stream the nodes or edges collection as FeatureCollection JSON text."""
+    collection, projection = {
+        "nodes": (nodes_collection, NODE_VIEWS["detail"]),
+        "edges": (edges_collection, EDGE_VIEWS["detail"]),
+    }[kind]
+    query = {"type": "Feature"}
+    if not include_archived:
+        query["_meta.is_archived"] = {"$ne": True}
+
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = "\n"
+    for doc in collection.find(query, projection).sort("properties.id", 1):
+        yield separator + json.dumps(doc, default=str)
+        separator = ",\n"
+    yield "\n]}\n"
+
+
+def split_stored_feature_collections() -> Dict:
+    """
+    One-off migration: import FeatureCollection documents that were stored whole in
+    the nodes/edges collections, then remove them.
+
+    A FeatureCollection is only removed when every feature was imported. Otherwise it
+    is kept (report["kept"]) and the failing features are listed, so they can be fixed
+    and the migration run again (imports are upserts, so re-running is safe).
+    """
+    reports = {}
+    for kind, collection in (("nodes", nodes_collection), ("edges", edges_collection)):
+        for fc in collection.find({"type": "FeatureCollection"}):
+            report = import_features(fc.get("features", []), imported_by="migration")
+            report["kept"] = bool(report["aborted"] or report["invalid"])
+            if report["kept"]:
+                print(f"[GEOJSON] Keeping stored {kind} FeatureCollection {fc['_id']}: "
+                      f"{report['invalid']} invalid feature(s), aborted={report['aborted']}")
+                for error in report["errors"]:
+                    print(f"[GEOJSON]   feature {error.get('index')} ({error.get('id')}): {error['error']}")
+            else:
+                collection.delete_one({"_id": fc["_id"]})
+            reports[f"{kind}:{fc['_id']}"] = report
+    return reports
@@ -0,0 +1,147 @@
+"""
+Connected-component labels for the walkable grid.
+
+Every walkable cell gets the label of the 4-connected region it belongs to (the same
+moves A* can make), separately for normal and accessibility mode. Two cells are
+mutually reachable exactly when their labels match, so unreachable route requests can
+be rejected without running a search.
+"""
+
+import threading
+from array import array
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from app.core.grid_loader import grid_instance
+from app.core.metrics import record_cache
+from app.services.pathfinding_stats import logger
+from app.services.pathfinding_astar import get_stair_blocked_cells, cache_version
+
+# Components up to this many cells are scanned directly when looking for the
+# cell closest to a point; larger ones are searched outward from the point
+SMALL_COMPONENT_SCAN_LIMIT = 4096
+
+# Cache for component labels: accessibility mode -> (cache_version, labels), one lock per mode
+_components = {}
+_components_locks = {False: threading.Lock(), True: threading.Lock()}
+
+
+def label_components(blocked_cells=None) -> Dict:
+    """
+    Label 4-connected walkable regions.
+
+    Returns {"labels": array of label per flat cell index (-1 = not walkable),
+             "sizes": list of cell counts per label,
+             "members"/"offsets": flat cell indices grouped by label}.
+    """
+    w, h, g = grid_instance.w, grid_instance.h, grid_instance.grid
+    blocked_cells = blocked_cells or set()
+
+    labels = array("i", [-1]) * (w * h)
+    walkable = bytearray(w * h)
+    for y in range(h):
+        row = g[y]
+        for x in range(w):
+            if row[x] == 0 and (x, y) not in blocked_cells:
+                walkable[y * w + x] = 1
+
+    sizes = []
+    for seed in range(w * h):
+        if not walkable[seed] or labels[seed] != -1:
+            continue
+
+        label = len(sizes)
+        labels[seed] = label
+        size = 0
+        queue = deque([seed])
+        while queue:
+            idx = queue.popleft()
+            size += 1
+            x = idx % w
+            for n, ok in (
+                (idx - 1, x > 0),
+                (idx + 1, x < w - 1),
+                (idx - w, idx >= w),
+                (idx + w, idx < w * (h - 1)),
+            ):
+                if ok and walkable[n] and labels[n] == -1:
+                    labels[n] = label
+                    queue.append(n)
+        sizes.append(size)
+
+    # Cells grouped by label (counting sort), so a component's cells are
+    # members[offsets[label]:offsets[label + 1]]
+    offsets = [0]
+    for size in sizes:
+        offsets.append(offsets[-1] + size)
+    fill = offsets[:-1]
+    members = array("i", [0]) * offsets[-1]
+    for idx, label in enumerate(labels):
+        if label != -1:
+            members[fill[label]] = idx
+            fill[label] += 1
+
+    return {"labels": labels, "sizes": sizes, "members": members, "offsets": offsets}
+
+
+def get_components(accessibility_mode=False) -> Dict:
+    """Get component labels for a mode, relabeling after a grid reload or overlay change (cached)."""
+    accessibility_mode = bool(accessibility_mode)
+    with _components_locks[accessibility_mode]:
+        version = cache_version(accessibility_mode)
+        entry = _components.get(accessibility_mode)
+        hit = entry is not None and entry[0] == version
+        record_cache("components", hit)
+        if not hit:
+            blocked = get_stair_blocked_cells() if accessibility_mode else None
+            entry = _components[accessibility_mode] = (version, label_components(blocked))
+            sizes = entry[1]["sizes"]
+            logger.info("[COMPONENTS] Labeled %s walkable region(s) (accessibility_mode=%s, largest: %s cells)",
+                        len(sizes), accessibility_mode, max(sizes, default=0))
+
+        return entry[1]
+
+
+def component_of(gx, gy, accessibility_mode=False) -> int:
+    """Component label of a grid cell, or -1 if it is outside the grid or not walkable."""
+    if not (0 <= gx < grid_instance.w and 0 <= gy < grid_instance.h):
+        return -1
+    return get_components(accessibility_mode)["labels"][gy * grid_instance.w + gx]
+
+
+def are_connected(start, end, accessibility_mode=False) -> Optional[bool]:
+    """
+    Whether two grid cells are in the same walkable region, in O(1).
+    Returns None when either cell is not walkable itself (the answer then depends on
+    which neighbour the search starts from).
+    """
+    start_label = component_of(*start, accessibility_mode)
+    end_label = component_of(*end, accessibility_mode)
+    if start_label == -1 or end_label == -1:
+        return None
+    return start_label == end_label
+
+
+def nearest_cell_in_component(gx, gy, label, accessibility_mode=False) -> Optional[Tuple[int, int]]:
+    """
+    Closest cell (Manhattan distance) to (gx, gy) that belongs to component `label`.
+    Small components are scanned directly; large ones are found by searching outward
+    from (gx, gy) in diamonds. Returns None if the component is empty.
+    """
+    w, h = grid_instance.w, grid_instance.h
+    components = get_components(accessibility_mode)
+    labels = components["labels"]
+
+    if components["sizes"][label] <= SMALL_COMPONENT_SCAN_LIMIT:
+        members = components["members"][components["offsets"][label]:components["offsets"][label + 1]]
+        best = min(members, key=lambda idx: abs(idx % w - gx) + abs(idx // w - gy), default=None)
+        return None if best is None else (best % w, best // w)
+
+    for radius in range(w + h):
+        for dx in range(-radius, radius + 1):
+            rest = radius - abs(dx)
+            for dy in {-rest, rest}:
+                x, y = gx + dx, gy + dy
+                if 0 <= x < w and 0 <= y < h and labels[y * w + x] == label:
+                    return x, y
+    return None
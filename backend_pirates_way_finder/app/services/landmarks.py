@@ -0,0 +1,231 @@
+"""
+ALT heuristic (A*, Landmarks, Triangle inequality) for grid routing.
+
+A handful of landmark cells is picked per mode by farthest-point selection, and the
+exact cost from each landmark to every cell is stored as a compact float32 array.
+For a goal t, any landmark L gives two lower bounds on the remaining cost d(v, t):
+
+    d(L, t) - d(L, v)          (from d(L, t) <= d(L, v) + d(v, t))
+    d(v, L) - d(t, L)          (from d(v, L) <= d(v, t) + d(t, L))
+
+Moving into a cell costs that cell's cost, so reversing a path only swaps which end
+cell is paid for: d(v, L) = d(L, v) + c(L) - c(v). One field per landmark therefore
+gives both bounds. The max over landmarks is admissible and consistent, and on a
+campus where buildings force detours it is far tighter than Manhattan distance.
+
+Fields are rebuilt after a grid reload; accessibility-mode fields also after a
+stair/ramp overlay change.
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from typing import Callable, Dict, Optional
+
+from app.core.grid_loader import grid_instance
+from app.core.metrics import record_cache
+from app.services.pathfinding_stats import logger
+from app.services.grid_components import get_components
+from app.services.pathfinding_astar import (
+    count_adjacent_walls,
+    get_ramp_cells,
+    get_stair_blocked_cells,
+    cache_version,
+)
+
+# Number of landmarks per mode (each costs one 4-byte float per grid cell)
+ALT_LANDMARK_COUNT = 8
+
+# Slack subtracted from every bound so float32 rounding can never make it overestimate
+ALT_EPSILON = 0.01
+
+INF = math.inf
+
+# Cache for landmark data: accessibility mode -> (cache_version, data). One lock per
+# mode, so an accessibility rebuild never blocks normal-mode routes
+_landmarks = {}
+_landmarks_locks = {False: threading.Lock(), True: threading.Lock()}
+
+
+def build_cell_costs(accessibility_mode=False) -> array:
+    """
+    Cost of stepping INTO each cell (flat index), matching astar():
+    1 + 0.3 per adjacent wall, 0.6 on ramp cells in accessibility mode,
+    infinity for walls and (in accessibility mode) stair areas.
+    """
+    w, h, g = grid_instance.w, grid_instance.h, grid_instance.grid
+    ramp_cells = get_ramp_cells() if accessibility_mode else set()
+    stair_blocked_cells = get_stair_blocked_cells() if accessibility_mode else set()
+
+    costs = array("d", [INF]) * (w * h)
+    for y in range(h):
+        for x in range(w):
+            if g[y][x] != 0 or (x, y) in stair_blocked_cells:
+                continue
+            if (x, y) in ramp_cells:
+                costs[y * w + x] = 0.6
+            else:
+                costs[y * w + x] = 1 + count_adjacent_walls(x, y) * 0.3
+    return costs
+
+
+def distance_field(source: int, costs: array) -> array:
+    """Dijkstra from one cell to every cell over the cell-cost grid (inf where unreachable)."""
+    w, n = grid_instance.w, len(costs)
+    dist = array("d", [INF]) * n
+    dist[source] = 0.0
+    pq = [(0.0, source)]
+
+    while pq:
+        d, idx = heapq.heappop(pq)
+        if d > dist[idx]:
+            continue
+        x = idx % w
+        for nb, ok in (
+            (idx - 1, x > 0),
+            (idx + 1, x < w - 1),
+            (idx - w, idx >= w),
+            (idx + w, idx + w < n),
+        ):
+            if not ok:
+                continue
+            nd = d + costs[nb]
+            if nd < dist[nb]:
+                dist[nb] = nd
+                heapq.heappush(pq, (nd, nb))
+
+    return dist
+
+
+def select_landmarks(costs: array, count: int, accessibility_mode=False) -> Dict:
+    """
+    Farthest-point landmark selection inside the largest walkable component.
+    Returns {"landmarks": [flat index, ...], "fields": [float32 array, ...]}.
+    """
+    components = get_components(accessibility_mode)
+    if not components["sizes"]:
+        return {"landmarks": [], "fields": []}
+
+    largest = max(range(len(components["sizes"])), key=components["sizes"].__getitem__)
+    labels = components["labels"]
+    seed = next(i for i, label in enumerate(labels) if label == largest and costs[i] != INF)
+
+    # Distance from the nearest chosen landmark (or the seed, before the first pick)
+    min_dist = distance_field(seed, costs)
+    landmarks, fields = [], []
+    for _ in range(count):
+        candidate, best = None, -1.0
+        for i, d in enumerate(min_dist):
+            if d != INF and d > best:
+                candidate, best = i, d
+        if candidate is None or best == 0.0:
+            break
+
+        field = distance_field(candidate, costs)
+        # The seed only serves to find the first landmark, so start over from it
+        min_dist = field if not landmarks else array("d", map(min, min_dist, field))
+        landmarks.append(candidate)
+        fields.append(array("f", field))
+
+    return {"landmarks": landmarks, "fields": fields}
+
+
+def get_landmarks(accessibility_mode=False) -> Dict:
+    """Get landmark data for a mode, rebuilding after a grid or overlay change (cached)."""
+    accessibility_mode = bool(accessibility_mode)
+    with _landmarks_locks[accessibility_mode]:
+        version = cache_version(accessibility_mode)
+        entry = _landmarks.get(accessibility_mode)
+        hit = entry is not None and entry[0] == version
+        record_cache("landmarks", hit)
+        if not hit:
+            costs = build_cell_costs(accessibility_mode)
+            data = select_landmarks(costs, ALT_LANDMARK_COUNT, accessibility_mode)
+            data["costs"] = costs
+            entry = _landmarks[accessibility_mode] = (version, data)
+            w = grid_instance.w
+            logger.info("[ALT] Built %s landmark(s) (accessibility_mode=%s): %s",
+                        len(data["landmarks"]), accessibility_mode, [(i % w, i // w) for i in data["landmarks"]])
+
+        return entry[1]
+
+
+def landmark_heuristic(goal_x, goal_y, accessibility_mode=False) -> Optional[Callable[[int, int], float]]:
+    """
+    Build h(x, y), a lower bound on the cost from (x, y) to the goal cell.
+    Returns None when no landmark can bound distances to this goal (e.g. the goal is
+    outside the landmarks' component), in which case callers fall back to Manhattan.
+    """
+    if not (0 <= goal_x < grid_instance.w and 0 <= goal_y < grid_instance.h):
+        return None
+
+    data = get_landmarks(accessibility_mode)
+    costs = data["costs"]
+    w = grid_instance.w
+    goal = goal_y * w + goal_x
+
+    usable = [(field, field[goal]) for field in data["fields"] if field[goal] != INF]
+    if not usable:
+        return None
+
+    # c(t) is the same for every landmark, fold it into the reverse bound once
+    goal_cost = costs[goal] if costs[goal] != INF else 0.0
+
+    def heuristic(x, y):
+        v = y * w + x
+        cost_v = costs[v] if costs[v] != INF else 0.0
+        best = 0.0
+        for field, to_goal in usable:
+            to_v = field[v]
+            if to_v == INF:
+                continue
+            forward = to_goal - to_v
+            reverse = to_v - cost_v - to_goal + goal_cost
+            if forward > best:
+                best = forward
+            if reverse > best:
+                best = reverse
+        return max(best - ALT_EPSILON, 0.0)
+
+    return heuristic
+
+
+def landmark_source_heuristic(source_x, source_y, accessibility_mode=False) -> Optional[Callable[[int, int], float]]:
+    """
+    Build h(x, y), a lower bound on the cost from the source cell to (x, y); the
+    mirror image of landmark_heuristic for searches that run backward from the goal.
+    Returns None when no landmark can bound distances from this source.
+    """
+    if not (0 <= source_x < grid_instance.w and 0 <= source_y < grid_instance.h):
+        return None
+
+    data = get_landmarks(accessibility_mode)
+    costs = data["costs"]
+    w = grid_instance.w
+    source = source_y * w + source_x
+
+    usable = [(field, field[source]) for field in data["fields"] if field[source] != INF]
+    if not usable:
+        return None
+
+    source_cost = costs[source] if costs[source] != INF else 0.0
+
+    def heuristic(x, y):
+        v = y * w + x
+        cost_v = costs[v] if costs[v] != INF else 0.0
+        best = 0.0
+        for field, to_source in usable:
+            to_v = field[v]
+            if to_v == INF:
+                continue
+            # d(L, v) <= d(L, s) + d(s, v)  and  d(s, L) <= d(s, v) + d(v, L)
+            forward = to_v - to_source
+            reverse = to_source - source_cost - to_v + cost_v
+            if forward > best:
+                best = forward
+            if reverse > best:
+                best = reverse
+        return max(best - ALT_EPSILON, 0.0)
+
+    return heuristic
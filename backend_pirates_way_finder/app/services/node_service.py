@@ -2,6 +2,12 @@ from typing import Dict, List, Optional
 # 🎯 NOTE: You'll still need to import NodeFeature/NodeDB in any service using them for type hints!
 # from app.models.node_model import NodeFeature 
 from app.core.database import nodes_collection
+from app.core.async_database import async_nodes_collection
+from app.services.search_index import invalidate_search_index
+from app.services.spatial_index import invalidate_node_buckets
+from app.services.path_executor import invalidate_accessibility_caches
+from app.services.projections import NODE_VIEWS, View, finish
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 import re
 from datetime import datetime
@@ -11,41 +17,70 @@ from fastapi import HTTPException
 def sanitize_id(raw_id: str) -> str:
     return re.sub(r"\s+", "_", raw_id.strip().lower())
 
-# --- Retrieval Functions ---
-# 🎯 Updated return type hint from List[Location] to List[Dict]
-def get_locations_by_category(building_id: str, category_id: str) -> List[Dict]:
+# What the ramp/stair overlay queries in pathfinding_astar look at: the name/id/type
+# patterns and any explicit accessible flag
+_ACCESSIBILITY_PATTERN = re.compile(r"ramp|stair|step|elevator", re.IGNORECASE)
+ACCESSIBILITY_FIELDS = ("properties.id", "properties.name", "properties.type", "properties.accessible")
+
+def affects_accessibility(props: Dict) -> bool:
+    """Whether a node with these properties is (or could be) part of the ramp/stair overlay."""
+    if props.get("accessible") is not None:
+        return True
+    return any(_ACCESSIBILITY_PATTERN.search(str(props.get(field) or "")) for field in ("id", "name", "type"))
+
+def invalidate_node_caches(accessibility: bool = True):
     """
-    Fetch all ACTIVE POIs under a specific category in a specific building.
+    Drop every in-memory structure derived from the nodes collection after a write.
+    Pass accessibility=False when the write cannot have changed any ramp/stair node, so
+    the accessibility-mode route caches survive it.
     """
-    query = {
+    invalidate_search_index()
+    invalidate_node_buckets()
+    if accessibility:
+        invalidate_accessibility_caches()
+
+# --- Retrieval Functions ---
+def _category_query(building_id: str, category_id: str) -> Dict:
+    return {
         "properties.building": building_id,
         "properties.category": category_id,
         "_meta.is_archived": {"$ne": True} 
     }
-    cursor = nodes_collection.find(query)
-    locations = []
-    for doc in cursor:
-        doc["_id"] = str(doc.get("_id"))  # Convert ObjectId to string
-        locations.append(doc)
-    return locations
-
-def get_all_pois(building_id: Optional[str] = None) -> List[Dict]:
-    """
-    Fetch all ACTIVE POIs, optionally filtered by a specific building ID.
-    """
+
+def _pois_query(building_id: Optional[str] = None) -> Dict:
     query = {"_meta.is_archived": {"$ne": True}}
-    
     if building_id:
-        sanitized_id = building_id.strip().lower()
         # Ensure you use 'properties.building_id' if that's the field in your schema
-        query["properties.building_id"] = sanitized_id
+        query["properties.building_id"] = building_id.strip().lower()
+    return query
+
+# 🎯 Updated return type hint from List[Location] to List[Dict]
+# view: "marker" | "detail" | "admin" (see app.services.projections); "admin" returns
+# whole documents, as before
+def get_locations_by_category(building_id: str, category_id: str, view: View = "admin") -> List[Dict]:
+    """
+    Fetch all ACTIVE POIs under a specific category in a specific building.
+    """
+    locations = list(nodes_collection.find(_category_query(building_id, category_id), NODE_VIEWS[view]))
+    return finish(locations, view)
+
+def get_all_pois(building_id: Optional[str] = None, view: View = "admin") -> List[Dict]:
+    """
+    Fetch all ACTIVE POIs, optionally filtered by a specific building ID.
+    """
+    pois = list(nodes_collection.find(_pois_query(building_id), NODE_VIEWS[view]))
+    return finish(pois, view)
+
+# --- Async Retrieval (for async route handlers) ---
+async def get_locations_by_category_async(building_id: str, category_id: str, view: View = "admin") -> List[Dict]:
+    """Async variant of get_locations_by_category."""
+    locations = await async_nodes_collection.find(_category_query(building_id, category_id), NODE_VIEWS[view]).to_list()
+    return finish(locations, view)
 
-    cursor = nodes_collection.find(query)
-    pois = []
-    for doc in cursor:
-        doc["_id"] = str(doc["_id"])
-        pois.append(doc)
-    return pois
+async def get_all_pois_async(building_id: Optional[str] = None, view: View = "admin") -> List[Dict]:
+    """Async variant of get_all_pois."""
+    pois = await async_nodes_collection.find(_pois_query(building_id), NODE_VIEWS[view]).to_list()
+    return finish(pois, view)
 
 # --- CRUD Functions ---
 def add_poi(poi: Dict, created_by: str = None):
@@ -64,9 +99,9 @@ def add_poi(poi: Dict, created_by: str = None):
 
     try:
         result = nodes_collection.insert_one(poi)
-        inserted = nodes_collection.find_one({"_id": result.inserted_id})
-        inserted["_id"] = str(inserted["_id"]) # Ensure _id is a string on return
-        return inserted
+        invalidate_node_caches(affects_accessibility(props))
+        # The stored document is exactly what was inserted; no need to read it back
+        return {**poi, "_id": str(result.inserted_id)} # Ensure _id is a string on return
     except DuplicateKeyError:
         raise
     
@@ -76,10 +111,6 @@ def update_poi(poi_id: str, update_data: Dict, updated_by: str):
     # ... (all existing logic for preparing update_set_operation, audit, and executing update)
     poi_id = poi_id.strip().lower()
 
-    existing = nodes_collection.find_one({"properties.id": poi_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="POI not found")
-
     update_set_operation = {}
     for key, value in update_data.items():
         if isinstance(value, dict):
@@ -93,15 +124,21 @@ def update_poi(poi_id: str, update_data: Dict, updated_by: str):
     update_set_operation["_meta.updated_by"] = updated_by
     update_set_operation["_meta.updated_at"] = datetime.utcnow().isoformat()
 
-    result = nodes_collection.update_one(
+    # One round trip: update and get the updated document back
+    updated = nodes_collection.find_one_and_update(
         {"properties.id": poi_id},
-        {"$set": update_set_operation}
+        {"$set": update_set_operation},
+        return_document=ReturnDocument.AFTER
     )
 
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="POI not found after initial check")
+    if updated is None:
+        raise HTTPException(status_code=404, detail="POI not found")
+    # A ramp/stair may have moved, or a node may have become/stopped being one
+    invalidate_node_caches(
+        affects_accessibility(updated.get("properties", {}))
+        or any(key in ACCESSIBILITY_FIELDS for key in update_set_operation)
+    )
 
-    updated = nodes_collection.find_one({"properties.id": poi_id}) 
     updated["_id"] = str(updated["_id"])
     return updated
 
@@ -109,7 +146,7 @@ def update_poi(poi_id: str, update_data: Dict, updated_by: str):
 def update_node_accessibility(node_id: str, updates: dict, updated_by: str):
     """Updates specific accessibility fields on a Node (POI)."""
     # [Logic for update_node_accessibility remains here]
-    result = nodes_collection.update_one(
+    updated_node = nodes_collection.find_one_and_update(
         {"properties.id": node_id},
         {
             "$set": {
@@ -117,34 +154,73 @@ def update_node_accessibility(node_id: str, updates: dict, updated_by: str):
                 "_meta.updated_by": updated_by,
                 "_meta.updated_at": datetime.utcnow().isoformat(),
             }
-        }
+        },
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if updated_node is None:
         raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found.")
+    invalidate_node_caches(
+        affects_accessibility(updated_node.get("properties", {}))
+        or any(f"properties.{key}" in ACCESSIBILITY_FIELDS for key in updates)
+    )
 
-    updated_node = nodes_collection.find_one({"properties.id": node_id})
     updated_node["_id"] = str(updated_node["_id"])
     return updated_node
 
-def delete_poi(poi_id: str, archived_by: str) -> bool:
-    """Archives (soft-deletes) a POI by its properties.id."""
-    # [Logic for delete_poi remains here]
+def delete_poi(poi_id: str, archived_by: str) -> Optional[Dict]:
+    """
+    Archives (soft-deletes) a POI by its properties.id.
+    Returns the POI's properties as they were (for audit entries), or None if there was
+    no active POI with that id.
+    """
     poi_id = poi_id.strip().lower()
-    
-    existing = nodes_collection.find_one({
-        "properties.id": poi_id,
-        "_meta.is_archived": {"$ne": True}
-    })
-    
-    if not existing:
-        return False
 
-    result = nodes_collection.update_one(
-        {"properties.id": poi_id},
+    # Matches only an active POI, so "not found" and "already archived" cost no extra read
+    archived = nodes_collection.find_one_and_update(
+        {"properties.id": poi_id, "_meta.is_archived": {"$ne": True}},
+        {"$set": {
+            "_meta.is_archived": True,
+            "_meta.archived_at": datetime.utcnow().isoformat(),
+            "_meta.archived_by": archived_by
+        }},
+        projection={"_id": 0, "properties": 1}
+    )
+    if archived is None:
+        return None
+    invalidate_node_caches(affects_accessibility(archived["properties"]))
+    return archived["properties"]
+
+def archive_pois(archived_by: str, poi_ids: Optional[List[str]] = None,
+                 building_id: Optional[str] = None, category: Optional[str] = None) -> List[Dict]:
+    """
+    Archives (soft-deletes) every active POI matching the given ids and/or filters with a
+    single update_many. Returns the archived POIs' {"id", "name"}.
+    """
+    query = _pois_query(building_id)
+    if poi_ids is not None:
+        query["properties.id"] = {"$in": [poi_id.strip().lower() for poi_id in poi_ids]}
+    if category:
+        query["properties.category"] = category
+
+    # Names are needed for the audit entry; the update is restricted to exactly these ids
+    # so the entry matches what was archived
+    docs = list(nodes_collection.find(
+        query, {"properties.id": 1, "properties.name": 1, "properties.type": 1, "properties.accessible": 1, "_id": 0}
+    ))
+    matched = [
+        {"id": doc["properties"]["id"], "name": doc["properties"].get("name", doc["properties"]["id"])}
+        for doc in docs
+    ]
+    if not matched:
+        return []
+
+    nodes_collection.update_many(
+        {"properties.id": {"$in": [poi["id"] for poi in matched]}, "_meta.is_archived": {"$ne": True}},
         {"$set": {
             "_meta.is_archived": True,
             "_meta.archived_at": datetime.utcnow().isoformat(),
             "_meta.archived_by": archived_by
         }}
     )
-    return result.modified_count == 1
\ No newline at end of file
+    invalidate_node_caches(any(affects_accessibility(doc["properties"]) for doc in docs))
+    return matched
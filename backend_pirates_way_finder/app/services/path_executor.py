@@ -0,0 +1,227 @@
+"""
+Process pool for CPU-bound route searches.
+
+A* holds the GIL for its whole run, so searches executed in FastAPI's threadpool
+serialize and starve every other endpoint. Route requests are instead dispatched to a
+pool of worker processes:
+
+  - the grid is written once to a raw byte file and memory-mapped read-only by every
+    worker, so all processes share the same pages
+  - each worker builds its own derived caches (components, snapping map, landmarks)
+    in its initializer and keeps them for its lifetime; it also configures logging
+    with the API process's level and pathfinding debug flag, since spawned processes
+    start unconfigured
+  - cache hits/misses counted in a worker travel back with its result and are added
+    to the API process's metrics (stage timings already do, inside the stats dict)
+  - at most PATHFINDING_MAX_PENDING requests may be queued or running; beyond that
+    requests are rejected immediately (backpressure) instead of piling up
+  - callers stop waiting after PATHFINDING_TIMEOUT_SECONDS
+
+With PATHFINDING_WORKERS=0 (or before the pool is started) routes run in the
+threadpool as before.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.grid_loader import grid_instance
+from app.core.logging_config import configure_logging
+from app.core.metrics import Counter, Gauge, cache_requests
+from app.services.pathfinding_astar import get_overlay_version, invalidate_accessibility_overlay
+from app.services.pathfinding_stats import debug_enabled, logger, set_debug
+from app.services.route_service import PathRequest, run_route, rebuild_accessibility_caches_in_background, warm_route_caches
+
+PATHFINDING_WORKERS = int(os.getenv("PATHFINDING_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Requests allowed to be queued or running in the pool at once
+PATHFINDING_MAX_PENDING = int(os.getenv("PATHFINDING_MAX_PENDING", str(max(PATHFINDING_WORKERS, 1) * 8)))
+PATHFINDING_TIMEOUT_SECONDS = float(os.getenv("PATHFINDING_TIMEOUT_SECONDS", "10"))
+
+pending_requests = Gauge(
+    "pathfinding_executor_pending",
+    "Route requests queued or running in the pathfinding worker pool.",
+)
+rejected_requests = Counter(
+    "pathfinding_executor_rejected_total",
+    "Route requests rejected by the worker pool, by reason (queue_full, timeout, broken_pool).",
+    ("reason",),
+)
+
+
+class PathfindingBusy(Exception):
+    """The worker pool queue is full; the caller should retry later."""
+
+
+class PathfindingTimeout(Exception):
+    """A route took longer than PATHFINDING_TIMEOUT_SECONDS."""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_shared_grid_path: Optional[str] = None
+_pending = 0
+_pending_lock = threading.Lock()
+_restart_lock = threading.Lock()
+
+# Worker side: the API process's overlay version this worker's caches were built for
+_worker_overlay_version = None
+
+
+def _init_worker(grid_path, w, h, cell_size, overlay_version, log_level, pathfinding_debug):
+    """Worker initializer: set up logging, map the shared grid and build normal-mode caches up front."""
+    global _worker_overlay_version
+    configure_logging(log_level)
+    set_debug(pathfinding_debug)
+    grid_instance.load_shared(grid_path, w, h, cell_size)
+    _worker_overlay_version = overlay_version
+    warm_route_caches()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _route_in_worker(req: PathRequest, overlay_version) -> Tuple[str, dict]:
+    global _worker_overlay_version
+    # Stairs/ramps changed in the API process since this worker last looked: drop the
+    # overlay and rebuild accessibility caches from MongoDB off the request path
+    # (normal-mode caches don't depend on the overlay)
+    if overlay_version != _worker_overlay_version:
+        invalidate_accessibility_overlay()
+        _worker_overlay_version = overlay_version
+        rebuild_accessibility_caches_in_background()
+    before = cache_requests.snapshot()
+    content, stats = run_route(req)
+    stats["worker_pid"] = os.getpid()
+    # Counters recorded here live in this process's registry, not the API's /metrics
+    stats["cache_requests"] = {
+        key: count - before.get(key, 0)
+        for key, count in cache_requests.snapshot().items()
+        if count != before.get(key, 0)
+    }
+    return content, stats
+
+
+def invalidate_accessibility_caches():
+    """
+    Stairs/ramps may have changed in MongoDB: drop the overlay. When routes run in this
+    process, accessibility-mode caches are rebuilt in the background; workers see the
+    new overlay version with their next route and rebuild on their own.
+    """
+    invalidate_accessibility_overlay()
+    if _executor is None and grid_instance.grid is not None:
+        rebuild_accessibility_caches_in_background()
+
+
+def start_executor() -> bool:
+    """
+    Share the loaded grid and start the worker pool. Returns False (and does nothing)
+    when PATHFINDING_WORKERS is 0 or no grid is loaded.
+    """
+    global _executor, _shared_grid_path
+
+    if PATHFINDING_WORKERS <= 0 or grid_instance.grid is None:
+        return False
+    shutdown_executor()
+
+    fd, _shared_grid_path = tempfile.mkstemp(prefix="pathfinding_grid_", suffix=".bin")
+    os.close(fd)
+    grid_instance.save_shared(_shared_grid_path)
+
+    # spawn: workers must not inherit the API process's threads or MongoDB sockets
+    _executor = ProcessPoolExecutor(
+        max_workers=PATHFINDING_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(_shared_grid_path, grid_instance.w, grid_instance.h, grid_instance.cell_size,
+                  get_overlay_version(), logging.getLogger().getEffectiveLevel(), debug_enabled()),
+    )
+    # Workers are spawned on demand; queue one no-op per worker so they all start (and
+    # build their caches) now rather than on the first route requests
+    for _ in range(PATHFINDING_WORKERS):
+        _executor.submit(_ping)
+    logger.info("[EXECUTOR] Started %s pathfinding worker(s), max %s pending, timeout %ss",
+                PATHFINDING_WORKERS, PATHFINDING_MAX_PENDING, PATHFINDING_TIMEOUT_SECONDS)
+    return True
+
+
+def shutdown_executor():
+    """Stop the worker pool and remove the shared grid file."""
+    global _executor, _shared_grid_path
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _shared_grid_path is not None:
+        try:
+            os.remove(_shared_grid_path)
+        except OSError:
+            pass
+        _shared_grid_path = None
+
+
+def _restart_broken(executor: ProcessPoolExecutor, message: str):
+    """Restart the pool once, however many concurrent requests saw this instance break."""
+    with _restart_lock:
+        if _executor is executor:
+            logger.error(message)
+            start_executor()
+
+
+def _release(_future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+        pending_requests.set(_pending)
+
+
+async def dispatch_route(req: PathRequest) -> Tuple[str, dict]:
+    """
+    Compute a route off the event loop; returns (JSON body, stats).
+    Raises PathfindingBusy when the pool is saturated and PathfindingTimeout when the
+    route does not finish in time.
+    """
+    global _pending
+
+    executor = _executor
+    if executor is None:
+        return await run_in_threadpool(run_route, req)
+
+    with _pending_lock:
+        if _pending >= PATHFINDING_MAX_PENDING:
+            rejected_requests.inc(reason="queue_full")
+            raise PathfindingBusy()
+        _pending += 1
+        pending_requests.set(_pending)
+
+    try:
+        future = executor.submit(_route_in_worker, req, get_overlay_version())
+    except (BrokenProcessPool, RuntimeError):
+        _release(None)
+        rejected_requests.inc(reason="broken_pool")
+        _restart_broken(executor, "[EXECUTOR] Worker pool unavailable, restarting it")
+        raise PathfindingBusy()
+
+    # The slot is held until the worker is actually done, even if the caller gave up,
+    # so the pending limit reflects real pool load
+    future.add_done_callback(_release)
+
+    try:
+        content, stats = await asyncio.wait_for(asyncio.wrap_future(future), PATHFINDING_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        rejected_requests.inc(reason="timeout")
+        raise PathfindingTimeout()
+    except BrokenProcessPool:
+        rejected_requests.inc(reason="broken_pool")
+        _restart_broken(executor, "[EXECUTOR] A pathfinding worker died, restarting the pool")
+        raise PathfindingBusy()
+
+    cache_requests.merge(stats.pop("cache_requests", {}))
+    return content, stats
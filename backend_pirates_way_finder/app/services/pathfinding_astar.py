@@ -4,9 +4,13 @@ GUARANTEES shortest path (just like Dijkstra, but faster!)
 """
 
 import heapq
+import logging
 import math
+import time
 from app.core.grid_loader import grid_instance
 from app.core.database import nodes_collection
+from app.core.metrics import record_cache
+from app.services.pathfinding_stats import logger
 
 # Configuration: Buffer size around stair/ramp nodes (in grid cells)
 # Adjust this to make the blocked/preferred areas larger or smaller
@@ -19,6 +23,27 @@ _ramp_locations = None
 _ramp_cells = None
 # Cache for stair blocked cells (loaded once)
 _stair_blocked_cells = None
+# Bumped whenever the caches above are dropped, so accessibility-mode caches derived
+# from them (component labels, snap maps, landmarks) know to rebuild
+_overlay_version = 0
+
+def invalidate_accessibility_overlay():
+    """Drop the cached ramp/stair data so it is reloaded from MongoDB on next use"""
+    global _ramp_locations, _ramp_cells, _stair_blocked_cells, _overlay_version
+    _ramp_locations = None
+    _ramp_cells = None
+    _stair_blocked_cells = None
+    _overlay_version += 1
+
+def get_overlay_version():
+    return _overlay_version
+
+def cache_version(accessibility_mode=False):
+    """
+    Version key for caches derived from the grid. Normal mode ignores stairs and ramps,
+    so only accessibility-mode entries are invalidated by overlay changes.
+    """
+    return (grid_instance.version, _overlay_version if accessibility_mode else None)
 
 def get_ramp_locations():
     """Get all ramp node locations from MongoDB (cached)"""
@@ -44,12 +69,12 @@ def get_ramp_locations():
             coords = node.get("geometry", {}).get("coordinates", [])
             if coords:
                 px, py = coords[0], coords[1]
-                gx, gy = px // cell_size, py // cell_size
+                gx, gy = int(px // cell_size), int(py // cell_size)
                 _ramp_locations.append((gx, gy))
-                print(f"[RAMP] Detected at grid [{gx}, {gy}]")
+                logger.debug("[RAMP] Detected at grid [%s, %s]", gx, gy)
         
         if not _ramp_locations:
-            print("[WARN] No ramps found in database")
+            logger.warning("[WARN] No ramps found in database")
     
     return _ramp_locations
 
@@ -61,6 +86,7 @@ def get_ramp_cells():
     """
     global _ramp_cells
     
+    record_cache("ramp_cells", _ramp_cells is not None)
     if _ramp_cells is None:
         _ramp_cells = set()
         
@@ -85,7 +111,7 @@ def get_ramp_cells():
             coords = node.get("geometry", {}).get("coordinates", [])
             if coords:
                 px, py = coords[0], coords[1]
-                gx, gy = px // cell_size, py // cell_size
+                gx, gy = int(px // cell_size), int(py // cell_size)
                 
                 # Add buffer around ramp node (±buffer_size cells)
                 for dx in range(-buffer_size, buffer_size + 1):
@@ -99,12 +125,12 @@ def get_ramp_cells():
                                 _ramp_cells.add((nx, ny))
                 
                 ramp_count += 1
-                print(f"[RAMP] Marked area around grid [{gx}, {gy}] as ramp (buffer: ±{buffer_size} cells)")
+                logger.debug("[RAMP] Marked area around grid [%s, %s] as ramp (buffer: ±%s cells)", gx, gy, buffer_size)
         
         if ramp_count == 0:
-            print("[WARN] No ramp cells marked")
+            logger.warning("[WARN] No ramp cells marked")
         else:
-            print(f"[ACCESSIBILITY] Marked {len(_ramp_cells)} cells as ramp areas around {ramp_count} ramp location(s)")
+            logger.info("[ACCESSIBILITY] Marked %s cells as ramp areas around %s ramp location(s)", len(_ramp_cells), ramp_count)
     
     return _ramp_cells
 
@@ -116,6 +142,7 @@ def get_stair_blocked_cells():
     """
     global _stair_blocked_cells
     
+    record_cache("stair_blocked_cells", _stair_blocked_cells is not None)
     if _stair_blocked_cells is None:
         _stair_blocked_cells = set()
         
@@ -144,7 +171,7 @@ def get_stair_blocked_cells():
             coords = node.get("geometry", {}).get("coordinates", [])
             if coords:
                 px, py = coords[0], coords[1]
-                gx, gy = px // cell_size, py // cell_size
+                gx, gy = int(px // cell_size), int(py // cell_size)
                 
                 # Skip if it's actually a ramp (double-check by name, id, type, and accessible)
                 props = node.get("properties", {})
@@ -155,11 +182,11 @@ def get_stair_blocked_cells():
                 
                 # If it's marked as accessible=True, it's probably a ramp, not stairs
                 if is_accessible is True:
-                    print(f"[STAIRS] Skipping {node_name or node_id} - marked as accessible=True (likely a ramp)")
+                    logger.debug("[STAIRS] Skipping %s - marked as accessible=True (likely a ramp)", node_name or node_id)
                     continue
                 # If name/id/type contains "ramp", skip it
                 if "ramp" in node_name or "ramp" in node_id or "ramp" in node_type:
-                    print(f"[STAIRS] Skipping {node_name or node_id} - contains 'ramp' in name/id/type")
+                    logger.debug("[STAIRS] Skipping %s - contains 'ramp' in name/id/type", node_name or node_id)
                     continue
                 
                 # Add buffer around stair node (±buffer_size cells)
@@ -176,14 +203,14 @@ def get_stair_blocked_cells():
                                 cells_blocked += 1
                 
                 stair_count += 1
-                print(f"[STAIRS] ✅ Blocked {cells_blocked} cells around '{node_name or node_id}' at grid [{gx}, {gy}] (buffer: ±{buffer_size} cells)")
+                logger.debug("[STAIRS] Blocked %s cells around '%s' at grid [%s, %s] (buffer: ±%s cells)",
+                             cells_blocked, node_name or node_id, gx, gy, buffer_size)
         
         if stair_count == 0:
-            print("[WARN] ⚠️ No stair nodes found in database")
-            print("[WARN]    Check that your nodes have:")
-            print("[WARN]    - type: 'stairs' OR name/id contains 'stair' OR accessible: false")
+            logger.warning("[WARN] No stair nodes found in database. Check that your nodes have "
+                           "type: 'stairs' OR name/id contains 'stair' OR accessible: false")
         else:
-            print(f"[ACCESSIBILITY] ✅ Blocked {len(_stair_blocked_cells)} cells around {stair_count} stair location(s)")
+            logger.info("[ACCESSIBILITY] Blocked %s cells around %s stair location(s)", len(_stair_blocked_cells), stair_count)
     
     return _stair_blocked_cells
 
@@ -252,7 +279,67 @@ def manhattan_heuristic(x, y, goal_x, goal_y):
     """
     return abs(x - goal_x) + abs(y - goal_y)
 
-def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
+def step_cost(nx, ny, accessibility_mode=False, ramp_cells=None):
+    """Cost of moving INTO cell (nx, ny) from any neighbor"""
+    # Base cost is 1 for moving to a neighbor
+    base_cost = 1
+    
+    # AESTHETIC: Add penalty for cells near walls (keeps path centered in corridors)
+    adjacent_walls = count_adjacent_walls(nx, ny)
+    if adjacent_walls > 0:
+        # Penalty for being near walls (0.3 per adjacent wall)
+        # Higher penalty = more spacing from walls
+        wall_penalty = adjacent_walls * 0.3
+        base_cost += wall_penalty
+    
+    # In accessibility mode, make ramps cheaper (so paths prefer going through them)
+    if accessibility_mode and ramp_cells:
+        if (nx, ny) in ramp_cells:
+            # This cell IS a ramp - make it cheaper (0.6 cost instead of 1)
+            # This encourages paths to use ramps without forcing them
+            base_cost = 0.6  # Cheaper than regular cells, but not too cheap
+    
+    return base_cost
+
+def build_heuristic(tx, ty, accessibility_mode=False, ramp_cells=None, use_landmarks=True, towards=True):
+    """
+    Lower bound on the remaining cost, as h(x, y).
+    towards=True bounds the cost from (x, y) to (tx, ty); towards=False bounds the
+    cost from (tx, ty) to (x, y) (used by the backward half of bidirectional A*).
+    """
+    # Manhattan distance only bounds the cost when every step costs at least 1;
+    # ramp cells cost 0.6 in accessibility mode, so scale it down there
+    min_step_cost = 0.6 if accessibility_mode and ramp_cells else 1
+    landmark_bound = None
+    if use_landmarks:
+        from app.services.landmarks import landmark_heuristic, landmark_source_heuristic
+        if towards:
+            landmark_bound = landmark_heuristic(tx, ty, accessibility_mode)
+        else:
+            landmark_bound = landmark_source_heuristic(tx, ty, accessibility_mode)
+
+    def heuristic(x, y):
+        h = manhattan_heuristic(x, y, tx, ty) * min_step_cost
+        if landmark_bound:
+            h = max(h, landmark_bound(x, y))
+        return h
+
+    return heuristic
+
+def _fill_stats(stats, algorithm, started, expanded, pushes, pixel_path):
+    """Record search counters into the caller's stats dict (no-op when stats is None)"""
+    if stats is None:
+        return
+    stats.update({
+        "algorithm": algorithm,
+        "expanded_nodes": expanded,
+        "heap_pushes": pushes,
+        "path_length": len(pixel_path),
+        "found": bool(pixel_path),
+        "search_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
+
+def astar(start_px, start_py, end_px, end_py, accessibility_mode=False, use_landmarks=True, stats=None):
     """
     A* pathfinding with Manhattan heuristic
     
@@ -264,7 +351,13 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
       g(n) = actual cost from start to n
       h(n) = estimated cost from n to goal (Manhattan distance)
       f(n) = total estimated cost through n
+
+    With use_landmarks=True, h(n) is the larger of the Manhattan distance and the
+    ALT landmark bound (see landmarks.py), which is much tighter around buildings.
+
+    If a stats dict is passed, it is filled with search counters (see _fill_stats).
     """
+    started = time.perf_counter()
     cell = grid_instance.cell_size
     
     # Convert pixel → grid coords
@@ -282,31 +375,29 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
     if accessibility_mode:
         ramp_cells = get_ramp_cells()
         stair_blocked_cells = get_stair_blocked_cells()
-        if ramp_cells:
-            print(f"[ACCESSIBILITY] Marked {len(ramp_cells)} cells as ramps - paths will PREFER them")
-        else:
-            print("[ACCESSIBILITY] No ramps found")
-        if stair_blocked_cells:
-            print(f"[ACCESSIBILITY] Blocking {len(stair_blocked_cells)} stair cells - paths will AVOID them")
-        else:
-            print("[ACCESSIBILITY] No stairs found to block")
+        logger.debug("[ACCESSIBILITY] %s ramp cells preferred, %s stair cells blocked",
+                     len(ramp_cells or ()), len(stair_blocked_cells or ()))
         
         # Warn if start or end is in a blocked stair area
         if stair_blocked_cells:
             if start in stair_blocked_cells:
-                print(f"[WARN] Start point {start} is in a stair area - pathfinding may be limited")
+                logger.debug("[WARN] Start point %s is in a stair area - pathfinding may be limited", start)
             if end in stair_blocked_cells:
-                print(f"[WARN] End point {end} is in a stair area - pathfinding may be limited")
+                logger.debug("[WARN] End point %s is in a stair area - pathfinding may be limited", end)
     
+    heuristic = build_heuristic(ex, ey, accessibility_mode, ramp_cells, use_landmarks)
+
     # Priority queue: (f_cost, g_cost, node)
     # f = g + h (total estimated cost)
     # g = actual cost from start
-    h_start = manhattan_heuristic(sx, sy, ex, ey)
+    h_start = heuristic(sx, sy)
     pq = [(h_start, 0, start)]
     
     dist = {start: 0}  # g-costs
     prev = {}
     visited = set()
+    expanded = 0
+    pushes = 1
     
     while pq:
         f_cost, g_cost, (x, y) = heapq.heappop(pq)
@@ -314,28 +405,13 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
         if (x, y) in visited:
             continue
         visited.add((x, y))
+        expanded += 1
         
         if (x, y) == end:
             break
         
         for nx, ny in get_neighbors(x, y, accessibility_mode, stair_blocked_cells):
-            # Base cost is 1 for moving to a neighbor
-            base_cost = 1
-            
-            # AESTHETIC: Add penalty for cells near walls (keeps path centered in corridors)
-            adjacent_walls = count_adjacent_walls(nx, ny)
-            if adjacent_walls > 0:
-                # Penalty for being near walls (0.3 per adjacent wall)
-                # Higher penalty = more spacing from walls
-                wall_penalty = adjacent_walls * 0.3
-                base_cost += wall_penalty
-            
-            # In accessibility mode, make ramps cheaper (so paths prefer going through them)
-            if accessibility_mode and ramp_cells:
-                if (nx, ny) in ramp_cells:
-                    # This cell IS a ramp - make it cheaper (0.6 cost instead of 1)
-                    # This encourages paths to use ramps without forcing them
-                    base_cost = 0.6  # Cheaper than regular cells, but not too cheap
+            base_cost = step_cost(nx, ny, accessibility_mode, ramp_cells)
             
             new_g = g_cost + base_cost
             
@@ -344,10 +420,11 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
                 prev[(nx, ny)] = (x, y)
                 
                 # Calculate f = g + h
-                h = manhattan_heuristic(nx, ny, ex, ey)
+                h = heuristic(nx, ny)
                 f = new_g + h
                 
                 heapq.heappush(pq, (f, new_g, (nx, ny)))
+                pushes += 1
     
     # Reconstruct path
     path = []
@@ -361,9 +438,8 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
     # Check if path was found
     if len(path) == 1 and path[0] == start:
         # No path found - end is unreachable
-        print(f"[WARN] No path found from {start} to {end}")
-        if accessibility_mode:
-            print("[WARN] This might be because stairs are blocking all routes, or no accessible path exists")
+        logger.debug("[WARN] No path found from %s to %s (accessibility_mode=%s)", start, end, accessibility_mode)
+        _fill_stats(stats, "astar", started, expanded, pushes, [])
         return []
     
     # Convert back to pixel coordinates
@@ -375,13 +451,152 @@ def astar(start_px, start_py, end_px, end_py, accessibility_mode=False):
         for x, y in path
     ]
     
-    print(f"[PATHFINDING] Found path with {len(pixel_path)} waypoints")
-    if accessibility_mode:
+    if accessibility_mode and ramp_cells and logger.isEnabledFor(logging.DEBUG):
         # Count how many ramp cells are in the path
-        if ramp_cells:
-            ramp_cells_in_path = sum(1 for x, y in path if (x, y) in ramp_cells)
-            print(f"[ACCESSIBILITY] Path uses {ramp_cells_in_path} ramp cells")
+        ramp_cells_in_path = sum(1 for x, y in path if (x, y) in ramp_cells)
+        logger.debug("[ACCESSIBILITY] Path uses %s ramp cells", ramp_cells_in_path)
+    
+    _fill_stats(stats, "astar", started, expanded, pushes, pixel_path)
+    return pixel_path
+
+
+def bidirectional_astar(start_px, start_py, end_px, end_py, accessibility_mode=False, use_landmarks=True, stats=None):
+    """
+    Bidirectional A*: one search grows from the start, another backward from the end.
+
+    Both use the same "average" potential
+        p(n) = (h_end(n) - h_start(n)) / 2
+    (the forward search adds it to its keys, the backward search subtracts it), which
+    keeps both sides consistent and makes the stopping rule exact: stop once
+        smallest forward key + smallest backward key >= best meeting cost.
+
+    Returns a path with the same cost as astar() (ties may pick a different route).
+    """
+    started = time.perf_counter()
+    cell = grid_instance.cell_size
+    
+    # Convert pixel → grid coords
+    sx = start_px // cell
+    sy = start_py // cell
+    ex = end_px // cell
+    ey = end_py // cell
+    
+    start = (sx, sy)
+    end = (ex, ey)
+    
+    ramp_cells = None
+    stair_blocked_cells = None
+    if accessibility_mode:
+        ramp_cells = get_ramp_cells()
+        stair_blocked_cells = get_stair_blocked_cells()
+    
+    # astar() reports start == end as "no path", and can only finish on a cell it may step into
+    if (
+        start == end
+        or not (0 <= ex < grid_instance.w and 0 <= ey < grid_instance.h)
+        or grid_instance.grid[ey][ex] != 0
+        or (accessibility_mode and stair_blocked_cells and end in stair_blocked_cells)
+    ):
+        _fill_stats(stats, "bidirectional", started, 0, 0, [])
+        return []
+    
+    h_end = build_heuristic(ex, ey, accessibility_mode, ramp_cells, use_landmarks)
+    h_start = build_heuristic(sx, sy, accessibility_mode, ramp_cells, use_landmarks, towards=False)
+    
+    def potential(x, y):
+        return (h_end(x, y) - h_start(x, y)) / 2
+    
+    # Forward: cost from start; backward: cost to end
+    dist_f = {start: 0}
+    dist_b = {end: 0}
+    prev = {}
+    next_cell = {}
+    visited_f = set()
+    visited_b = set()
+    pq_f = [(potential(sx, sy), start)]
+    pq_b = [(-potential(ex, ey), end)]
+    
+    best_cost = math.inf
+    meeting = None
+    expanded = 0
+    pushes = 2
+    
+    while pq_f and pq_b:
+        if pq_f[0][0] + pq_b[0][0] >= best_cost:
+            break
+        
+        # Expand whichever side has the smaller frontier
+        if len(pq_f) <= len(pq_b):
+            _, (x, y) = heapq.heappop(pq_f)
+            if (x, y) in visited_f:
+                continue
+            visited_f.add((x, y))
+            expanded += 1
+            g_cost = dist_f[(x, y)]
+            
+            for nx, ny in get_neighbors(x, y, accessibility_mode, stair_blocked_cells):
+                new_g = g_cost + step_cost(nx, ny, accessibility_mode, ramp_cells)
+                if new_g < dist_f.get((nx, ny), math.inf):
+                    dist_f[(nx, ny)] = new_g
+                    prev[(nx, ny)] = (x, y)
+                    heapq.heappush(pq_f, (new_g + potential(nx, ny), (nx, ny)))
+                    pushes += 1
+                if (nx, ny) in dist_b and dist_f[(nx, ny)] + dist_b[(nx, ny)] < best_cost:
+                    best_cost = dist_f[(nx, ny)] + dist_b[(nx, ny)]
+                    meeting = (nx, ny)
+        else:
+            _, (x, y) = heapq.heappop(pq_b)
+            if (x, y) in visited_b:
+                continue
+            visited_b.add((x, y))
+            expanded += 1
+            if (x, y) == start:
+                continue  # Nothing needs to be reached through the start
+            
+            # Stepping INTO (x, y) costs the same from every neighbor
+            new_g = dist_b[(x, y)] + step_cost(x, y, accessibility_mode, ramp_cells)
+            predecessors = list(get_neighbors(x, y, accessibility_mode, stair_blocked_cells))
+            # The start may be a wall/stair cell, which get_neighbors() never yields
+            if abs(x - sx) + abs(y - sy) == 1 and start not in predecessors:
+                predecessors.append(start)
+            
+            for px, py in predecessors:
+                if new_g < dist_b.get((px, py), math.inf):
+                    dist_b[(px, py)] = new_g
+                    next_cell[(px, py)] = (x, y)
+                    heapq.heappush(pq_b, (new_g - potential(px, py), (px, py)))
+                    pushes += 1
+                if (px, py) in dist_f and dist_f[(px, py)] + dist_b[(px, py)] < best_cost:
+                    best_cost = dist_f[(px, py)] + dist_b[(px, py)]
+                    meeting = (px, py)
+    
+    if meeting is None:
+        logger.debug("[WARN] No path found from %s to %s (accessibility_mode=%s)", start, end, accessibility_mode)
+        _fill_stats(stats, "bidirectional", started, expanded, pushes, [])
+        return []
+    
+    # Stitch start → meeting (forward tree) and meeting → end (backward tree)
+    path = []
+    cur = meeting
+    while cur in prev:
+        path.append(cur)
+        cur = prev[cur]
+    path.append(start)
+    path.reverse()
+    cur = meeting
+    while cur in next_cell:
+        cur = next_cell[cur]
+        path.append(cur)
+    
+    pixel_path = [
+        {
+            "x": x * cell + cell/2,
+            "y": y * cell + cell/2
+        }
+        for x, y in path
+    ]
     
+    _fill_stats(stats, "bidirectional", started, expanded, pushes, pixel_path)
     return pixel_path
 
 
@@ -4,37 +4,31 @@ import math
 import logging
 logger = logging.getLogger(__name__)
 
-def ensure_nodes_are_split():
-    """Splits FeatureCollection into individual node documents if needed."""
-    fc = nodes_collection.find_one({ "type": "FeatureCollection" })
-    if fc and "features" in fc:
-        for feature in fc["features"]:
-            nodes_collection.insert_one(feature)
-        nodes_collection.delete_one({ "_id": fc["_id"] })
-        print("✅ Split FeatureCollection into individual node documents.")
-
-def ensure_edges_are_split():
-    fc = edges_collection.find_one({ "type": "FeatureCollection" })
-    if fc and "features" in fc:
-        for feature in fc["features"]:
-            edges_collection.insert_one(feature)
-        edges_collection.delete_one({ "_id": fc["_id"] })
-        print("✅ Split FeatureCollection into individual edge documents.")
+def _features(docs, kind):
+    """
+    Yield the stored features, unpacking any FeatureCollection document in place.
+    split-stored (geojson_tool.py) keeps a FeatureCollection whose features did not all
+    import, so one may still be in the collection; warn so it gets migrated.
+    """
+    for doc in docs:
+        if doc.get("type") == "FeatureCollection":
+            features = doc.get("features") or []
+            logger.warning("Stored %s FeatureCollection %s (%d features) has not been split; "
+                           "run python geojson_tool.py split-stored", kind, doc.get("_id"), len(features))
+            yield from (f for f in features if isinstance(f, dict))
+        else:
+            yield doc
 
-def build_graph(accessible_only: bool = False):
-    ensure_nodes_are_split()
-    ensure_edges_are_split()
 
+def build_graph(accessible_only: bool = False):
     G = nx.Graph()
-    nodes = list(nodes_collection.find())
     node_coords = {
         n["properties"]["id"]: n["geometry"]["coordinates"]
-        for n in nodes
-        if "properties" in n and "geometry" in n and "coordinates" in n["geometry"]
+        for n in _features(nodes_collection.find(), "nodes")
+        if "id" in n.get("properties", {}) and "coordinates" in (n.get("geometry") or {})
     }
 
-    raw_edges = list(edges_collection.find({}))
-    edges = [e for e in raw_edges if "properties" in e and "geometry" in e]
+    edges = [e for e in _features(edges_collection.find({}), "edges") if "properties" in e and "geometry" in e]
 
     for edge in edges:
         props = edge["properties"]
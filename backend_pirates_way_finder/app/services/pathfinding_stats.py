@@ -0,0 +1,99 @@
+"""
+Per-request pathfinding counters and sampled, structured logging.
+
+Searches fill a plain stats dict (expanded nodes, heap pushes, path length, elapsed
+time). The router hands it to `log_search()`, which logs one JSON line for a sampled
+fraction of requests, so logging cost stays flat under load.
+
+Detailed diagnostics (every ramp/stair found, start/end warnings) go to DEBUG and are
+off unless PATHFINDING_DEBUG is set or `set_debug(True)` is called.
+
+`record_route()` feeds the same stats into the always-on Prometheus metrics.
+"""
+
+import json
+import logging
+import os
+import random
+
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger("app.pathfinding")
+
+# Log every request's summary plus the detailed per-node diagnostics
+PATHFINDING_DEBUG = os.getenv("PATHFINDING_DEBUG", "false").lower() in ("1", "true", "yes")
+# Fraction of requests whose summary line is logged (1.0 = all, 0 = none)
+PATHFINDING_LOG_SAMPLE_RATE = float(os.getenv("PATHFINDING_LOG_SAMPLE_RATE", "0.01"))
+
+logger.setLevel(logging.DEBUG if PATHFINDING_DEBUG else logging.INFO)
+
+
+def set_debug(enabled: bool):
+    """Turn detailed pathfinding diagnostics on or off at runtime."""
+    global PATHFINDING_DEBUG
+    PATHFINDING_DEBUG = enabled
+    logger.setLevel(logging.DEBUG if enabled else logging.INFO)
+
+
+def debug_enabled() -> bool:
+    return PATHFINDING_DEBUG
+
+
+def should_sample() -> bool:
+    return PATHFINDING_DEBUG or random.random() < PATHFINDING_LOG_SAMPLE_RATE
+
+
+def log_search(stats: dict):
+    """Log one structured summary line for a (sampled) pathfinding request."""
+    if should_sample():
+        logger.info("path_search %s", json.dumps(stats, sort_keys=True, default=str))
+
+
+# --- Metrics (served at GET /metrics) ---
+
+route_requests = Counter(
+    "pathfinding_requests_total",
+    "Route requests by mode, algorithm and whether a path was found.",
+    ("mode", "algorithm", "found"),
+)
+request_seconds = Histogram(
+    "pathfinding_request_seconds",
+    "End-to-end /path/shortest handling time, including JSON encoding.",
+    ("mode",),
+)
+stage_seconds = Histogram(
+    "pathfinding_stage_seconds",
+    "Time spent per route stage (astar, bidirectional, smooth_path, simplify_path, "
+    "generate_instructions, json_encode).",
+    ("stage",),
+)
+expanded_nodes = Histogram(
+    "pathfinding_expanded_nodes",
+    "Grid cells expanded per search.",
+    ("algorithm",),
+    buckets=(100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000),
+)
+
+# stats key -> stage label (the search stage is labeled with the algorithm used)
+_STAGE_KEYS = {
+    "smooth_ms": "smooth_path",
+    "simplify_ms": "simplify_path",
+    "instructions_ms": "generate_instructions",
+    "encode_ms": "json_encode",
+}
+
+
+def record_route(stats: dict):
+    """Feed one request's stats dict into the pathfinding metrics."""
+    mode = "accessibility" if stats.get("accessibility_mode") else "normal"
+    algorithm = stats.get("algorithm", "none")
+    route_requests.inc(mode=mode, algorithm=algorithm, found="true" if stats.get("found") else "false")
+
+    if "total_ms" in stats:
+        request_seconds.observe(stats["total_ms"] / 1000, mode=mode)
+    if "search_ms" in stats:
+        stage_seconds.observe(stats["search_ms"] / 1000, stage=algorithm)
+        expanded_nodes.observe(stats.get("expanded_nodes", 0), algorithm=algorithm)
+    for key, stage in _STAGE_KEYS.items():
+        if key in stats:
+            stage_seconds.observe(stats[key] / 1000, stage=stage)
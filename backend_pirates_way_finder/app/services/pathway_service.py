@@ -1,8 +1,11 @@
 from app.core.database import edges_collection, nodes_collection
+from app.core.async_database import async_edges_collection
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 from datetime import datetime
 from typing import Dict, List
 import math
+from app.services.projections import EDGE_VIEWS, View, finish
 
 # --- 🎯 UTILITY FUNCTIONS (KEEP) ---
 
@@ -18,9 +21,26 @@ def validate_node_exists(node_id: str):
     if not exists:
         raise HTTPException(status_code=400, detail=f"Node '{node_id}' not found in nodes_collection")
 
+def get_node_coordinates(node_ids: List[str]) -> Dict[str, list]:
+    """
+    Coordinates of several nodes in one query ({node id: [x, y]}).
+    Raises 400 for the first id that does not exist.
+    """
+    found = {
+        doc["properties"]["id"]: doc["geometry"]["coordinates"]
+        for doc in nodes_collection.find(
+            {"properties.id": {"$in": list(set(node_ids))}},
+            {"_id": 0, "properties.id": 1, "geometry.coordinates": 1}
+        )
+    }
+    for node_id in node_ids:
+        if node_id not in found:
+            raise HTTPException(status_code=400, detail=f"Node '{node_id}' not found in nodes_collection")
+    return found
+
 # --- 🎯 EDGE RETRIEVAL (MOVED FROM accessibility_service.py) ---
 
-def get_all_edges(accessible: bool = None) -> List[Dict]:
+def get_all_edges(accessible: bool = None, view: View = "admin") -> List[Dict]:
     """
     Retrieves all edges, optionally filtered by accessibility status.
     This function handles the public GET request and the admin retrieval.
@@ -30,10 +50,8 @@ def get_all_edges(accessible: bool = None) -> List[Dict]:
     if accessible is not None:
         query["properties.accessible"] = accessible
 
-    edges = list(edges_collection.find(query))
-    for edge in edges:
-        edge["_id"] = str(edge["_id"])
-    return edges
+    edges = list(edges_collection.find(query, EDGE_VIEWS[view]))
+    return finish(edges, view)
 
 
 # --- EDGE CRUD FUNCTIONS (YOUR EXISTING LOGIC) ---
@@ -47,14 +65,9 @@ def add_pathway(edge: Dict, created_by: str):
     if not from_id or not to_id:
         raise HTTPException(status_code=400, detail="'from' and 'to' fields are required")
 
-    # Validate nodes exist using the local utility function
-    validate_node_exists(from_id)
-    validate_node_exists(to_id)
-
-    # Get coordinates and compute distance
-    coord1 = nodes_collection.find_one({"properties.id": from_id})["geometry"]["coordinates"]
-    coord2 = nodes_collection.find_one({"properties.id": to_id})["geometry"]["coordinates"]
-    props["distance"] = props.get("distance") or compute_distance(coord1, coord2)
+    # Validate both nodes exist and get their coordinates in one query, then compute distance
+    coords = get_node_coordinates([from_id, to_id])
+    props["distance"] = props.get("distance") or compute_distance(coords[from_id], coords[to_id])
 
     # Add metadata
     edge["_meta"] = {
@@ -63,23 +76,21 @@ def add_pathway(edge: Dict, created_by: str):
     }
 
     result = edges_collection.insert_one(edge)
-    inserted = edges_collection.find_one({"_id": result.inserted_id})
-    inserted["_id"] = str(inserted["_id"])
-    return inserted
+    # The stored document is exactly what was inserted; no need to read it back
+    return {**edge, "_id": str(result.inserted_id)}
+
+def get_all_pathways(view: View = "admin") -> List[Dict]:
+    """Retrieve all active pathways (view: see app.services.projections)."""
+    edges = list(edges_collection.find({"_meta.is_archived": {"$ne": True}}, EDGE_VIEWS[view]))
+    return finish(edges, view)
 
-def get_all_pathways() -> List[Dict]:
-    """Retrieve all active pathways."""
-    edges = list(edges_collection.find({"_meta.is_archived": {"$ne": True}}))
-    for e in edges:
-        e["_id"] = str(e["_id"])
-    return edges
+async def get_all_pathways_async(view: View = "admin") -> List[Dict]:
+    """Async variant of get_all_pathways."""
+    edges = await async_edges_collection.find({"_meta.is_archived": {"$ne": True}}, EDGE_VIEWS[view]).to_list()
+    return finish(edges, view)
 
 def update_pathway(edge_id: str, update_data: Dict, updated_by: str):
     """Update an existing pathway by its properties.id."""
-    existing = edges_collection.find_one({"properties.id": edge_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Edge not found")
-
     update_fields = {}
     for key, value in update_data.items():
         if isinstance(value, dict):
@@ -94,22 +105,22 @@ def update_pathway(edge_id: str, update_data: Dict, updated_by: str):
     update_fields["_meta.updated_by"] = updated_by
     update_fields["_meta.updated_at"] = datetime.utcnow().isoformat()
 
-    edges_collection.update_one({"properties.id": edge_id}, {"$set": update_fields})
-    updated = edges_collection.find_one({"properties.id": edge_id})
+    # One round trip: update and get the updated document back
+    updated = edges_collection.find_one_and_update(
+        {"properties.id": edge_id},
+        {"$set": update_fields},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Edge not found")
     updated["_id"] = str(updated["_id"])
     return updated
 
 def delete_pathway(edge_id: str, archived_by: str) -> bool:
     """Soft delete (archive) a pathway."""
-    existing = edges_collection.find_one({
-        "properties.id": edge_id,
-        "_meta.is_archived": {"$ne": True}
-    })
-    if not existing:
-        return False
-
+    # Matches only an active edge, so no separate existence check is needed
     result = edges_collection.update_one(
-        {"properties.id": edge_id},
+        {"properties.id": edge_id, "_meta.is_archived": {"$ne": True}},
         {"$set": {
             "_meta.is_archived": True,
             "_meta.archived_at": datetime.utcnow().isoformat(),
@@ -123,7 +134,7 @@ def delete_pathway(edge_id: str, archived_by: str) -> bool:
 
 def update_edge_accessibility(edge_id: str, accessible: bool, updated_by: str):
     """Toggles the accessibility status of an edge."""
-    result = edges_collection.update_one(
+    updated_edge = edges_collection.find_one_and_update(
         {"properties.id": edge_id},
         {
             "$set": {
@@ -131,19 +142,19 @@ def update_edge_accessibility(edge_id: str, accessible: bool, updated_by: str):
                 "_meta.updated_by": updated_by,
                 "_meta.updated_at": datetime.utcnow().isoformat(),
             }
-        }
+        },
+        return_document=ReturnDocument.AFTER
     )
 
-    if result.matched_count == 0:
+    if updated_edge is None:
         raise HTTPException(status_code=404, detail=f"Edge '{edge_id}' not found.")
 
-    updated_edge = edges_collection.find_one({"properties.id": edge_id})
     updated_edge["_id"] = str(updated_edge["_id"])
     return updated_edge
 
 def update_edge_notes(edge_id: str, notes: str, updated_by: str):
     """Adds or updates accessibility notes for an edge."""
-    result = edges_collection.update_one(
+    updated_edge = edges_collection.find_one_and_update(
         {"properties.id": edge_id},
         {
             "$set": {
@@ -151,12 +162,12 @@ def update_edge_notes(edge_id: str, notes: str, updated_by: str):
                 "_meta.updated_by": updated_by,
                 "_meta.updated_at": datetime.utcnow().isoformat(),
             }
-        }
+        },
+        return_document=ReturnDocument.AFTER
     )
 
-    if result.matched_count == 0:
+    if updated_edge is None:
         raise HTTPException(status_code=404, detail=f"Edge '{edge_id}' not found.")
 
-    updated_edge = edges_collection.find_one({"properties.id": edge_id})
     updated_edge["_id"] = str(updated_edge["_id"])
     return updated_edge
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Named views of node and edge documents, mapped to MongoDB projections.
+
+  - marker: what a map marker / line needs (geometry, id, name, type, category,
+            building, floor, accessibility); a fraction of the full document
+  - detail: every GeoJSON field, without the MongoDB _id and the _meta audit fields
+  - admin:  the whole stored document, _id as a string (admin-authenticated routes
+            only; public routes accept PublicView)
+
+Projections are applied by MongoDB, so unneeded fields are neither transferred nor
+decoded. project_document applies the same view to documents already in memory
+(e.g. fuzzy search results).
+"""
+
+from typing import Dict, List, Literal, Optional
+
+View = Literal["marker", "detail", "admin"]
+# Views that public (unauthenticated) routes may serve: no _meta audit fields
+PublicView = Literal["marker", "detail"]
+
+NODE_VIEWS: Dict[str, Optional[Dict]] = {
+    "marker": {
+        "_id": 0, "type": 1, "geometry": 1,
+        "properties.id": 1, "properties.name": 1, "properties.type": 1, "properties.category": 1,
+        "properties.building_id": 1, "properties.building_name": 1, "properties.floor": 1,
+        "properties.accessible": 1,
+    },
+    "detail": {"_id": 0, "_meta": 0},
+    "admin": None,
+}
+
+EDGE_VIEWS: Dict[str, Optional[Dict]] = {
+    "marker": {
+        "_id": 0, "type": 1, "geometry": 1,
+        "properties.id": 1, "properties.from": 1, "properties.to": 1, "properties.type": 1,
+        "properties.accessible": 1,
+    },
+    "detail": {"_id": 0, "_meta": 0},
+    "admin": None,
+}
+
+
+def finish(docs: List[Dict], view: str) -> List[Dict]:
+    """Post-process query results: only the admin view carries an _id to stringify."""
+    if view == "admin":
+        for doc in docs:
+            if "_id" in doc:
+                doc["_id"] = str(doc["_id"])
+    return docs
+
+
+def project_document(doc: Dict, projection: Optional[Dict]) -> Dict:
+    """Apply a projection from the tables above to an in-memory document."""
+    if projection is None:
+        return doc
+    excluded = {field for field, flag in projection.items() if not flag}
+    included = [field for field, flag in projection.items() if flag]
+    if not included:
+        return {key: value for key, value in doc.items() if key not in excluded}
+
+    result = {}
+    for path in included:
+        source, target = doc, result
+        *parents, leaf = path.split(".")
+        for part in parents:
+            source = source.get(part) if isinstance(source, dict) else None
+            if source is None:
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and leaf in source:
+                target[leaf] = source[leaf]
+    return result
@@ -0,0 +1,205 @@
+"""
+Pre-aggregated rating rollups for trend queries.
+
+Every rating is counted into four buckets of `rating_rollups`: hourly and daily, per
+location and per building. A bucket holds the count of each rating value, the total and
+the score sum (scores as in rating_summary_service). create_rating maintains them with
+upserts; rebuild_rating_rollups() (`python backfill_rating_rollups.py`) back-fills them
+from the raw ratings. Like the summary rebuild it is an offline job, never run by the
+API: stop rating submissions first, or ratings submitted meanwhile are lost from the
+rollups.
+
+A range query reads one document per bucket in the range, so its cost depends on the
+range and granularity, not on how many ratings were submitted. Weekly series are summed
+from the daily buckets.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.core.async_database import async_rating_rollups_collection
+from app.core.database import db
+from app.core.indexes import register_index
+from app.services.rating_summary_service import RATING_SCORES, score_expression
+
+ROLLUP_GRANULARITIES = ("hour", "day")
+ROLLUP_SCOPES = ("location", "building")
+
+rating_rollups_collection = db["rating_rollups"]
+
+# Range scans: one series = (granularity, scope, key), ordered by bucket
+ROLLUP_SERIES_INDEX = [("granularity", 1), ("scope", 1), ("key", 1), ("bucket", 1)]
+register_index(rating_rollups_collection, ROLLUP_SERIES_INDEX)
+
+# Aggregation expressions matching _bucket() and the scope keys of _rollup_targets()
+_BUCKET_EXPRESSIONS = {
+    "hour": {"$concat": [{"$substr": ["$created_at", 0, 13]}, ":00:00"]},
+    "day": {"$substr": ["$created_at", 0, 10]},
+}
+_SCOPE_FIELDS = {"location": "location_id", "building": "building_name"}
+
+
+def _bucket(created_at: str, granularity: str) -> str:
+    """Bucket start for an ISO timestamp: 'YYYY-MM-DDTHH:00:00' (hour) or 'YYYY-MM-DD' (day)."""
+    if granularity == "hour":
+        return created_at[:13] + ":00:00"
+    return created_at[:10]
+
+
+def _rollup_targets(rating_doc: Dict):
+    """(granularity, scope, key, bucket) of every bucket a rating is counted in."""
+    keys = {"location": rating_doc.get("location_id"), "building": rating_doc.get("building_name")}
+    for granularity in ROLLUP_GRANULARITIES:
+        bucket = _bucket(rating_doc["created_at"], granularity)
+        for scope in ROLLUP_SCOPES:
+            if keys[scope]:
+                yield granularity, scope, keys[scope], bucket
+
+
+def _rollup_id(granularity: str, scope: str, key: str, bucket: str) -> str:
+    return f"{granularity}|{scope}|{key}|{bucket}"
+
+
+async def record_rating_rollups_async(rating_doc: Dict):
+    """Count a newly inserted rating into its hourly and daily buckets."""
+    score = RATING_SCORES.get(rating_doc["rating"])
+    if score is None:
+        return
+    update = {"$inc": {f"counts.{rating_doc['rating']}": 1, "total": 1, "score_sum": score}}
+    await asyncio.gather(*(
+        async_rating_rollups_collection.update_one(
+            {"_id": _rollup_id(granularity, scope, key, bucket)},
+            {**update, "$setOnInsert": {"granularity": granularity, "scope": scope, "key": key, "bucket": bucket}},
+            upsert=True,
+        )
+        for granularity, scope, key, bucket in _rollup_targets(rating_doc)
+    ))
+
+
+def _week_start(day: str) -> str:
+    d = date.fromisoformat(day)
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+def _format_point(bucket: str, counts: Dict, total: int, score_sum: float) -> Dict:
+    return {
+        "bucket": bucket,
+        "counts": {rating: counts.get(rating, 0) for rating in RATING_SCORES},
+        "total": total,
+        "good_share": round(counts.get("GOOD", 0) / total, 3) if total else None,
+        "average_score": round(score_sum / total, 3) if total else None,
+    }
+
+
+def _bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Start of the hour, day or week containing a (naive UTC) datetime."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if granularity == "day":
+        return moment
+    return moment - timedelta(days=moment.weekday())
+
+
+def _bucket_key(moment: datetime, stored: str) -> str:
+    return _bucket(moment.isoformat(), stored)
+
+
+async def get_rating_series_async(scope: str, key: str, granularity: str,
+                                  start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+    """
+    Rating series for one location (scope="location", key=location_id) or building
+    (scope="building", key=building_name) with granularity hour, day or week, oldest
+    first. start/end are naive UTC datetimes (end exclusive); every bucket overlapping
+    [start, end) is returned, and only buckets with ratings.
+    """
+    stored = "day" if granularity == "week" else granularity
+    query = {"granularity": stored, "scope": scope, "key": key}
+    bucket_range = {}
+    if start:
+        bucket_range["$gte"] = _bucket_key(_bucket_start(start, granularity), stored)
+    if end:
+        end_bucket = _bucket_start(end, stored)
+        # end inside a bucket (e.g. a day ending at 12:00): that bucket overlaps the range
+        if end_bucket < end:
+            end_bucket += timedelta(hours=1) if stored == "hour" else timedelta(days=1)
+        bucket_range["$lt"] = _bucket_key(end_bucket, stored)
+    if bucket_range:
+        query["bucket"] = bucket_range
+
+    docs = await async_rating_rollups_collection.find(query).sort("bucket", 1).to_list()
+    if granularity != "week":
+        return [_format_point(d["bucket"], d.get("counts", {}), d.get("total", 0), d.get("score_sum", 0))
+                for d in docs]
+
+    weeks = {}
+    for d in docs:
+        week = weeks.setdefault(_week_start(d["bucket"]), {"counts": {}, "total": 0, "score_sum": 0.0})
+        for rating, count in d.get("counts", {}).items():
+            week["counts"][rating] = week["counts"].get(rating, 0) + count
+        week["total"] += d.get("total", 0)
+        week["score_sum"] += d.get("score_sum", 0)
+    return [_format_point(bucket, w["counts"], w["total"], w["score_sum"]) for bucket, w in weeks.items()]
+
+
+def _rollup_pipeline(granularity: str, scope: str) -> List[Dict]:
+    """Aggregation producing the finished rollup documents of one granularity and scope."""
+    field = _SCOPE_FIELDS[scope]
+    return [
+        {"$match": {
+            "rating": {"$in": list(RATING_SCORES)},
+            "created_at": {"$nin": [None, ""]},
+            field: {"$nin": [None, ""]},
+        }},
+        {"$group": {
+            "_id": {"key": f"${field}", "bucket": _BUCKET_EXPRESSIONS[granularity]},
+            **{f"count_{i}": {"$sum": {"$cond": [{"$eq": ["$rating", rating]}, 1, 0]}}
+               for i, rating in enumerate(RATING_SCORES)},
+            "total": {"$sum": 1},
+            "score_sum": {"$sum": score_expression()},
+        }},
+        {"$project": {
+            "_id": {"$concat": [f"{granularity}|{scope}|", "$_id.key", "|", "$_id.bucket"]},
+            "granularity": {"$literal": granularity},
+            "scope": {"$literal": scope},
+            "key": "$_id.key",
+            "bucket": "$_id.bucket",
+            "counts": {rating: f"$count_{i}" for i, rating in enumerate(RATING_SCORES)},
+            "total": 1,
+            "score_sum": 1,
+        }},
+    ]
+
+
+def rebuild_rating_rollups(batch_size: int = 1000) -> int:
+    """
+    Recompute every rollup bucket from the raw ratings (offline backfill / repair).
+
+    One $group aggregation per granularity and scope writes the buckets into a staging
+    collection, which then replaces rating_rollups in a single rename, so readers never
+    see a half-built set and buckets without ratings disappear. Returns the number of
+    buckets written.
+    """
+    staging = db[f"{rating_rollups_collection.name}_rebuild"]
+    staging.drop()
+    staging.create_index(ROLLUP_SERIES_INDEX)
+
+    count = 0
+    for granularity in ROLLUP_GRANULARITIES:
+        for scope in ROLLUP_SCOPES:
+            batch = []
+            for doc in db["ratings"].aggregate(_rollup_pipeline(granularity, scope), allowDiskUse=True):
+                batch.append(doc)
+                if len(batch) == batch_size:
+                    staging.insert_many(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                staging.insert_many(batch)
+                count += len(batch)
+
+    staging.rename(rating_rollups_collection.name, dropTarget=True)
+    print(f"[RATINGS] Rebuilt {count} rating rollup bucket(s)")
+    return count
@@ -0,0 +1,134 @@
+"""
+Materialized per-location rating summaries.
+
+One document per rated location in `rating_summaries` (_id = location_id) holding the
+count of each rating value, the latest rating timestamp, the sum of rating scores and
+the scores of the last RATING_SUMMARY_WINDOW ratings. create_rating updates it with a
+single atomic upsert, so summary reads cost O(locations) instead of aggregating every
+raw rating.
+
+Scores: BAD = 0, NOT BAD = 0.5, GOOD = 1. `average_score` is over all ratings,
+`rolling_score` over the recent window.
+
+Ratings deleted outside the API (maintenance scripts) leave summaries stale; run
+rebuild_rating_summaries() (or `python rebuild_rating_summaries.py`) afterwards, and once
+after upgrading a deployment that already has ratings. The rebuild is an offline job:
+ratings submitted while it runs are lost from the summaries, so stop the API (or rating
+submissions) first. It never runs from the API process.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from app.core.async_database import async_rating_summaries_collection
+from app.core.database import db
+from app.core.indexes import register_index
+
+RATING_SCORES = {"BAD": 0.0, "NOT BAD": 0.5, "GOOD": 1.0}
+RATING_SUMMARY_WINDOW = int(os.getenv("RATING_SUMMARY_WINDOW", "50"))
+
+rating_summaries_collection = db["rating_summaries"]
+
+# Admin listing is newest-activity first, optionally per building
+register_index(rating_summaries_collection, [("latest_rating", -1)])
+register_index(rating_summaries_collection, [("building_name", 1), ("latest_rating", -1)])
+
+
+def _summary_update(rating_doc: Dict) -> Optional[Dict]:
+    """Upsert update applying one rating to its location summary (None for unknown rating values)."""
+    score = RATING_SCORES.get(rating_doc["rating"])
+    if score is None:
+        return None
+    return {
+        "$set": {
+            "location_name": rating_doc["location_name"],
+            "building_name": rating_doc.get("building_name"),
+        },
+        "$inc": {
+            f"counts.{rating_doc['rating']}": 1,
+            "total": 1,
+            "score_sum": score,
+        },
+        "$max": {"latest_rating": rating_doc["created_at"]},
+        "$push": {"recent_scores": {"$each": [score], "$slice": -RATING_SUMMARY_WINDOW}},
+    }
+
+
+async def record_rating_async(rating_doc: Dict):
+    """Fold a newly inserted rating into its location summary."""
+    update = _summary_update(rating_doc)
+    if update is None:
+        return
+    await async_rating_summaries_collection.update_one({"_id": rating_doc["location_id"]}, update, upsert=True)
+
+
+def format_summary(doc: Dict) -> Dict:
+    """Public shape of a summary document."""
+    total = doc.get("total", 0)
+    recent = doc.get("recent_scores") or []
+    counts = doc.get("counts", {})
+    return {
+        "location_id": doc["_id"],
+        "location_name": doc.get("location_name"),
+        "building_name": doc.get("building_name"),
+        "counts": {rating: counts.get(rating, 0) for rating in RATING_SCORES},
+        "rating_count": total,
+        "latest_rating": doc.get("latest_rating"),
+        "average_score": round(doc.get("score_sum", 0) / total, 3) if total else None,
+        "rolling_score": round(sum(recent) / len(recent), 3) if recent else None,
+    }
+
+
+async def get_rating_summaries_async(building_name: Optional[str] = None) -> List[Dict]:
+    """Every location summary, most recently rated first."""
+    query = {"building_name": building_name} if building_name else {}
+    docs = await async_rating_summaries_collection.find(query).sort("latest_rating", -1).to_list()
+    return [format_summary(doc) for doc in docs]
+
+
+def score_expression() -> Dict:
+    """Aggregation expression mapping $rating to its score."""
+    return {"$switch": {"branches": [
+        {"case": {"$eq": ["$rating", rating]}, "then": score} for rating, score in RATING_SCORES.items()
+    ]}}
+
+
+def rebuild_rating_summaries() -> int:
+    """
+    Recompute every summary from the raw ratings (offline backfill / repair).
+
+    A single aggregation groups the ratings per location and $out replaces the whole
+    collection at once (keeping its indexes), so readers never see a half-built set
+    and summaries of locations without ratings disappear. Returns the number of
+    locations summarized.
+    """
+    score = score_expression()
+    db["ratings"].aggregate([
+        {"$match": {"rating": {"$in": list(RATING_SCORES)}}},
+        {"$sort": {"created_at": 1}},
+        {"$group": {
+            "_id": "$location_id",
+            "location_name": {"$last": "$location_name"},
+            "building_name": {"$last": "$building_name"},
+            **{f"count_{i}": {"$sum": {"$cond": [{"$eq": ["$rating", rating]}, 1, 0]}}
+               for i, rating in enumerate(RATING_SCORES)},
+            "total": {"$sum": 1},
+            "score_sum": {"$sum": score},
+            "latest_rating": {"$max": "$created_at"},
+            "recent_scores": {"$push": score},
+        }},
+        {"$project": {
+            "location_name": 1,
+            "building_name": 1,
+            "counts": {rating: f"$count_{i}" for i, rating in enumerate(RATING_SCORES)},
+            "total": 1,
+            "score_sum": 1,
+            "latest_rating": 1,
+            "recent_scores": {"$slice": ["$recent_scores", -RATING_SUMMARY_WINDOW]},
+        }},
+        {"$out": rating_summaries_collection.name},
+    ], allowDiskUse=True)
+
+    count = rating_summaries_collection.count_documents({})
+    print(f"[RATINGS] Rebuilt rating summaries for {count} location(s)")
+    return count
@@ -0,0 +1,174 @@
+"""
+Route computation for /path/shortest: endpoint snapping, the reachability check, the
+search itself, smoothing, simplification and turn-by-turn instructions.
+
+Kept free of FastAPI so the same code runs in the API process or in a pathfinding
+worker process (see path_executor).
+"""
+
+from pydantic import BaseModel
+from typing import Literal, Optional, Tuple
+from app.services.pathfinding_astar import astar, bidirectional_astar, simplify_path, smooth_path, generate_instructions_from_grid_path
+from app.services.spatial_index import snap_to_walkable, cell_to_pixel, get_nearest_walkable_map
+from app.services.grid_components import are_connected, component_of, nearest_cell_in_component, get_components
+from app.services.landmarks import get_landmarks
+from app.services.pathfinding_stats import logger
+from app.core.grid_loader import grid_instance
+import json
+import threading
+import time
+
+# Endpoints at least this far apart (Manhattan distance in grid cells) default to
+# bidirectional A*; closer ones are cheaper with a single search
+BIDIRECTIONAL_MIN_DISTANCE_CELLS = 200
+
+class PathRequest(BaseModel):
+    start_x: int
+    start_y: int
+    end_x: int
+    end_y: int
+    accessibility_mode: bool = False
+    snap_to_walkable: bool = True  # Move taps on walls/stairs to the nearest walkable cell
+    algorithm: Optional[Literal["astar", "bidirectional"]] = None  # None = pick by distance
+
+# Background rebuild of accessibility-mode caches after a stair/ramp change
+_rebuild_requested = False
+_rebuild_thread = None
+_rebuild_lock = threading.Lock()
+
+def warm_route_caches(accessibility_mode=False):
+    """Build the snapping map, component labels and ALT landmarks for a mode."""
+    get_nearest_walkable_map(accessibility_mode)
+    get_components(accessibility_mode)
+    get_landmarks(accessibility_mode)
+
+def rebuild_accessibility_caches_in_background():
+    """
+    Rebuild accessibility-mode caches on a background thread, so the next
+    accessibility route doesn't pay for it. Requests made while a rebuild is
+    running are coalesced into one more pass.
+    """
+    global _rebuild_requested, _rebuild_thread
+    with _rebuild_lock:
+        _rebuild_requested = True
+        if _rebuild_thread is None:
+            _rebuild_thread = threading.Thread(target=_rebuild_loop, name="accessibility-cache-rebuild", daemon=True)
+            _rebuild_thread.start()
+
+def _rebuild_loop():
+    global _rebuild_requested, _rebuild_thread
+    while True:
+        with _rebuild_lock:
+            if not _rebuild_requested:
+                _rebuild_thread = None
+                return
+            _rebuild_requested = False
+        try:
+            warm_route_caches(accessibility_mode=True)
+        except Exception as e:
+            logger.warning("[CACHE] Accessibility cache rebuild failed (will build on next use): %s", e)
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+def run_route(req: PathRequest) -> Tuple[str, dict]:
+    """Compute a route and encode it; returns (JSON body, stats)."""
+    started = time.perf_counter()
+    stats = {"accessibility_mode": req.accessibility_mode}
+    result = compute_route(req, stats)
+
+    # Encode here rather than in FastAPI so the JSON cost shows up in the stage metrics
+    encode_started = time.perf_counter()
+    content = json.dumps(result)
+    stats["encode_ms"] = _elapsed_ms(encode_started)
+    stats["compute_ms"] = _elapsed_ms(started)
+    return content, stats
+
+def compute_route(req: PathRequest, stats: dict):
+    """Route between the request's endpoints, recording search counters into stats"""
+    start_x, start_y, end_x, end_y = req.start_x, req.start_y, req.end_x, req.end_y
+
+    # Snap endpoints that landed on a wall (or a blocked stair area) onto the walkable grid
+    if req.snap_to_walkable:
+        start_cell = snap_to_walkable(start_x, start_y, req.accessibility_mode)
+        end_cell = snap_to_walkable(end_x, end_y, req.accessibility_mode)
+        if start_cell and end_cell:
+            start_px = cell_to_pixel(*start_cell)
+            end_px = cell_to_pixel(*end_cell)
+            start_x, start_y = int(start_px["x"]), int(start_px["y"])
+            end_x, end_y = int(end_px["x"]), int(end_px["y"])
+
+    # Reject routes between disconnected regions in O(1) instead of letting A*
+    # exhaust the whole start region, and suggest the closest reachable end cell
+    cell = grid_instance.cell_size
+    start_cell = (start_x // cell, start_y // cell)
+    end_cell = (end_x // cell, end_y // cell)
+    if are_connected(start_cell, end_cell, req.accessibility_mode) is False:
+        stats.update({"algorithm": "components", "found": False, "path_length": 0})
+        start_label = component_of(*start_cell, req.accessibility_mode)
+        suggestion = nearest_cell_in_component(*end_cell, start_label, req.accessibility_mode)
+        return {
+            "path": [],
+            "instructions": [],
+            "distance_meters": 0,
+            "estimated_time_minutes": 0,
+            "reachable": False,
+            "suggested_end": cell_to_pixel(*suggestion) if suggestion else None
+        }
+
+    # Using A* algorithm (2-4x faster than Dijkstra, same shortest path!)
+    algorithm = req.algorithm
+    if algorithm is None:
+        far_apart = abs(start_cell[0] - end_cell[0]) + abs(start_cell[1] - end_cell[1]) >= BIDIRECTIONAL_MIN_DISTANCE_CELLS
+        algorithm = "bidirectional" if far_apart else "astar"
+    search = bidirectional_astar if algorithm == "bidirectional" else astar
+    path = search(start_x, start_y, end_x, end_y, req.accessibility_mode, stats=stats)
+    
+    if not path or len(path) == 0:
+        return {
+            "path": [],
+            "instructions": [],
+            "distance_meters": 0,
+            "estimated_time_minutes": 0,
+            "reachable": False,
+            "suggested_end": None
+        }
+    
+    # Apply path smoothing for visual appeal (Catmull-Rom spline)
+    stage_started = time.perf_counter()
+    smoothed_path = smooth_path(path, smoothing_factor=0.3) if path and len(path) > 2 else path
+    stats["smooth_ms"] = _elapsed_ms(stage_started)
+    
+    # Calculate total distance using original path (not smoothed) for accuracy
+    total_distance = 0
+    if len(path) > 1:
+        for i in range(len(path) - 1):
+            dx = path[i + 1]['x'] - path[i]['x']
+            dy = path[i + 1]['y'] - path[i]['y']
+            segment_distance = (dx ** 2 + dy ** 2) ** 0.5
+            total_distance += segment_distance
+    
+    PIXEL_TO_METER = 0.02
+    distance_meters = total_distance * PIXEL_TO_METER
+    AVERAGE_WALK_SPEED = 1.4  # m/s
+    estimated_time_seconds = distance_meters / AVERAGE_WALK_SPEED
+    
+    # Generate instructions using simplified path (not smoothed, for accuracy)
+    instructions = []
+    if path and len(path) > 0:
+        stage_started = time.perf_counter()
+        simplified_path = simplify_path(path, tolerance=20)
+        stats["simplify_ms"] = _elapsed_ms(stage_started)
+        stage_started = time.perf_counter()
+        instructions = generate_instructions_from_grid_path(simplified_path, PIXEL_TO_METER, angle_threshold=2)
+        stats["instructions_ms"] = _elapsed_ms(stage_started)
+        logger.debug("[INSTRUCTIONS] Simplified path from %s to %s points, generated %s instructions",
+                     len(path), len(simplified_path), len(instructions))
+    
+    return {
+        "path": smoothed_path,  # Return smoothed path for rendering
+        "instructions": instructions,
+        "distance_meters": round(distance_meters, 2),
+        "estimated_time_minutes": round(estimated_time_seconds / 60, 2),
+        "reachable": True
+    }
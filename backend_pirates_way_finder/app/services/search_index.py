@@ -0,0 +1,441 @@
+"""
+In-memory fuzzy search index over POI nodes.
+
+Names, ids and tags of every active node are tokenized once and indexed by
+character trigrams. Queries are answered entirely from memory: trigrams pick
+candidate tokens, a bounded Levenshtein check confirms them, and documents are
+ranked by how many query tokens they match and how closely.
+
+The same index backs typeahead: every token prefix maps to a ranked list of
+documents, so `suggest()` is mostly a dictionary lookup.
+
+After `invalidate_search_index()` (called by the node write paths), or once the index
+is older than SEARCH_INDEX_TTL_SECONDS, it is rebuilt on a background thread while
+requests keep being answered from the previous index until the new one is swapped
+in. Each invalidation bumps a generation counter and requests another pass, so a
+build that overlapped a write is always followed by a fresh one. Only the very first
+build (no index to serve yet) happens on the request path.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from app.core.database import nodes_collection
+from app.core.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Rebuild the index at most this often even without explicit invalidation
+# (picks up edits made directly in MongoDB by maintenance scripts)
+SEARCH_INDEX_TTL_SECONDS = 300
+
+# Field weights used when ranking matches
+NAME_WEIGHT = 1.0
+TAG_WEIGHT = 0.8
+ID_WEIGHT = 0.6
+
+# Typeahead limits: suggestions per response, accepted query length, and the time
+# after which /search/suggest stops refining and returns what it already has
+SUGGEST_DEFAULT_LIMIT = 5
+SUGGEST_MAX_LIMIT = 10
+SUGGEST_MAX_QUERY_LENGTH = 64
+SUGGEST_TIME_BUDGET_MS = 15
+
+# Prefixes up to this length get a precomputed, ranked candidate list;
+# longer ones fall back to a binary search over the vocabulary
+PREFIX_INDEX_MAX_LENGTH = 12
+PREFIX_INDEX_DEPTH = 50
+
+# Cache for the built index (see build_search_index for the layout)
+_search_index = None
+_search_index_built_at = 0.0
+_search_index_lock = threading.Lock()
+# Bumped by every invalidation; _built_generation is the one the current index reflects
+_search_index_generation = 0
+_built_generation = -1
+_generation_lock = threading.Lock()
+# Background rebuilds: requests made while one runs are coalesced into one more pass
+_rebuild_requested = False
+_rebuild_thread = None
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text) -> str:
+    """Lowercase and collapse everything that is not a letter or digit into single spaces."""
+    return _NON_ALNUM.sub(" ", str(text or "").lower()).strip()
+
+
+def tokenize(text) -> List[str]:
+    return normalize_text(text).split()
+
+
+def trigrams(token: str) -> set:
+    """Character trigrams of a token, padded so short tokens still produce some."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edit_distance(token: str) -> int:
+    """Allowed typos for a query token: none for very short tokens, up to 2 for long ones."""
+    if len(token) <= 2:
+        return 0
+    if len(token) <= 5:
+        return 1
+    return 2
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance between a and b, giving up early once it exceeds max_distance.
+    Returns max_distance + 1 when the bound is exceeded.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+def build_suggestion(doc: Dict) -> Dict:
+    """Reduce a node document to the few fields a typeahead row needs."""
+    props = doc.get("properties", {})
+    return {
+        "id": props.get("id"),
+        "name": props.get("name") or props.get("id") or "",
+        "building": props.get("building_name") or props.get("building_id"),
+        "category": props.get("category"),
+        "coordinates": doc.get("geometry", {}).get("coordinates"),
+    }
+
+
+def build_search_index(docs: List[Dict]) -> Dict:
+    """
+    Build the index from node documents.
+
+    Layout:
+      docs          - the node documents (without _id), in index order
+      vocab         - sorted list of distinct tokens (used for prefix lookups)
+      token_docs    - token -> {doc index: best field weight}
+      trigram_index - trigram -> set of tokens containing it
+      suggestions   - lightweight suggestion dict per document
+      suggestion_rank - static tie-break rank per document
+      prefix_top    - token prefix -> ranked doc indices (top PREFIX_INDEX_DEPTH)
+    """
+    token_docs = defaultdict(dict)
+
+    for doc_idx, doc in enumerate(docs):
+        props = doc.get("properties", {})
+        fields = [
+            (tokenize(props.get("name")), NAME_WEIGHT),
+            ([t for tag in (props.get("tags") or []) for t in tokenize(tag)], TAG_WEIGHT),
+            (tokenize(props.get("id")), ID_WEIGHT),
+        ]
+        for tokens, weight in fields:
+            for token in tokens:
+                if token_docs[token].get(doc_idx, 0) < weight:
+                    token_docs[token][doc_idx] = weight
+
+    trigram_index = defaultdict(set)
+    for token in token_docs:
+        for tri in trigrams(token):
+            trigram_index[tri].add(token)
+
+    suggestions = [build_suggestion(doc) for doc in docs]
+
+    # Static suggestion order: shorter names first, then alphabetical
+    order = sorted(range(len(docs)), key=lambda i: (len(suggestions[i]["name"]), suggestions[i]["name"].lower()))
+    suggestion_rank = [0] * len(docs)
+    for rank, doc_idx in enumerate(order):
+        suggestion_rank[doc_idx] = rank
+
+    # prefix -> {doc index: best field weight} for every token prefix
+    prefix_weights = defaultdict(dict)
+    for token, doc_weights in token_docs.items():
+        for length in range(1, min(len(token), PREFIX_INDEX_MAX_LENGTH) + 1):
+            bucket = prefix_weights[token[:length]]
+            for doc_idx, weight in doc_weights.items():
+                if bucket.get(doc_idx, 0) < weight:
+                    bucket[doc_idx] = weight
+
+    prefix_top = {
+        prefix: sorted(bucket, key=lambda i: (-bucket[i], suggestion_rank[i]))[:PREFIX_INDEX_DEPTH]
+        for prefix, bucket in prefix_weights.items()
+    }
+
+    return {
+        "docs": docs,
+        "vocab": sorted(token_docs),
+        "token_docs": dict(token_docs),
+        "trigram_index": dict(trigram_index),
+        "suggestions": suggestions,
+        "suggestion_rank": suggestion_rank,
+        "prefix_top": prefix_top,
+    }
+
+
+def _rebuild_search_index(only_if_missing: bool = False) -> Dict:
+    """Build a new index from MongoDB and swap it in."""
+    global _search_index, _search_index_built_at, _built_generation
+    with _search_index_lock:
+        if only_if_missing and _search_index is not None:
+            return _search_index
+        generation = _search_index_generation
+        docs = list(nodes_collection.find({"_meta.is_archived": {"$ne": True}}, {"_id": 0}))
+        index = build_search_index(docs)
+        with _generation_lock:
+            _search_index = index
+            _search_index_built_at = time.monotonic()
+            _built_generation = generation
+    logger.info("[SEARCH] Indexed %s nodes (%s distinct tokens)", len(docs), len(index["vocab"]))
+    return index
+
+
+def _rebuild_loop():
+    global _rebuild_requested, _rebuild_thread
+    while True:
+        with _generation_lock:
+            if not _rebuild_requested:
+                _rebuild_thread = None
+                return
+            _rebuild_requested = False
+        try:
+            _rebuild_search_index()
+        except Exception as e:
+            logger.warning("[SEARCH] Index rebuild failed (serving the previous index): %s", e)
+
+
+def refresh_search_index_in_background():
+    """Rebuild the index on a background thread; searches keep using the current one."""
+    global _rebuild_requested, _rebuild_thread
+    with _generation_lock:
+        _rebuild_requested = True
+        if _rebuild_thread is None:
+            _rebuild_thread = threading.Thread(target=_rebuild_loop, name="search-index-rebuild", daemon=True)
+            _rebuild_thread.start()
+
+
+def get_search_index() -> Dict:
+    """
+    Get the search index (cached). A stale index is still returned while a background
+    rebuild runs; only a process that has never built one builds it here.
+    """
+    index = _search_index
+    if index is None:
+        record_cache("search_index", False)
+        return _rebuild_search_index(only_if_missing=True)
+
+    fresh = (_built_generation == _search_index_generation
+             and time.monotonic() - _search_index_built_at < SEARCH_INDEX_TTL_SECONDS)
+    record_cache("search_index", fresh)
+    if not fresh:
+        refresh_search_index_in_background()
+    return index
+
+
+def invalidate_search_index():
+    """Mark the index stale and rebuild it in the background (if this process has one)."""
+    global _search_index_generation
+    with _generation_lock:
+        _search_index_generation += 1
+        has_index = _search_index is not None
+    if has_index:
+        refresh_search_index_in_background()
+
+
+def _prefix_matches(vocab: List[str], prefix: str, limit: int = 50) -> List[str]:
+    """Vocabulary tokens starting with prefix (binary search over the sorted vocab)."""
+    matches = []
+    i = bisect_left(vocab, prefix)
+    while i < len(vocab) and vocab[i].startswith(prefix) and len(matches) < limit:
+        matches.append(vocab[i])
+        i += 1
+    return matches
+
+
+def match_token(index: Dict, query_token: str) -> Dict[str, float]:
+    """
+    Find vocabulary tokens similar to a query token.
+    Returns token -> similarity in (0, 1]: exact 1.0, prefix 0.9, typo-corrected 0.8 or less,
+    substring 0.7.
+    """
+    matches = {}
+    if query_token in index["token_docs"]:
+        matches[query_token] = 1.0
+
+    # Prefix matches let partially typed words hit ("cafet" -> "cafeteria")
+    for token in _prefix_matches(index["vocab"], query_token):
+        if token not in matches:
+            matches[token] = 0.9
+
+    max_distance = max_edit_distance(query_token)
+    if max_distance == 0:
+        return matches
+
+    # Candidate tokens must share enough trigrams to possibly be within max_distance.
+    # Each edit destroys at most 3 trigrams of the query token.
+    query_trigrams = trigrams(query_token)
+    min_shared = max(1, len(query_trigrams) - 3 * max_distance)
+    shared_counts = defaultdict(int)
+    for tri in query_trigrams:
+        for token in index["trigram_index"].get(tri, ()):
+            shared_counts[token] += 1
+
+    for token, shared in shared_counts.items():
+        if token in matches:
+            continue
+        # Substring hits keep the old regex behaviour ("cafe" -> "lecafe")
+        if len(query_token) >= 3 and query_token in token:
+            matches[token] = 0.7
+            continue
+        if shared < min_shared:
+            continue
+        distance = bounded_levenshtein(query_token, token, max_distance)
+        if distance <= max_distance:
+            matches[token] = 0.8 * (1 - distance / (len(query_token) + 1))
+
+    return matches
+
+
+def _matches_filters(doc: Dict, category: Optional[str], building_id: Optional[str]) -> bool:
+    props = doc.get("properties", {})
+    if building_id and props.get("building_id") != building_id:
+        return False
+    if category and str(props.get("category") or "").lower() != category.lower():
+        return False
+    return True
+
+
+def _rank_documents(
+    index: Dict,
+    query_tokens: List[str],
+    category: Optional[str] = None,
+    building_id: Optional[str] = None,
+) -> List[int]:
+    """
+    Rank document indices for the query tokens, best first.
+
+    Documents matching more query tokens always rank above documents matching fewer;
+    ties are broken by match quality and field weight.
+    """
+    # doc index -> [matched token count, score]
+    scores = defaultdict(lambda: [0, 0.0])
+    for query_token in query_tokens:
+        best_per_doc = {}
+        for token, similarity in match_token(index, query_token).items():
+            for doc_idx, weight in index["token_docs"][token].items():
+                score = similarity * weight
+                if score > best_per_doc.get(doc_idx, 0):
+                    best_per_doc[doc_idx] = score
+        for doc_idx, score in best_per_doc.items():
+            scores[doc_idx][0] += 1
+            scores[doc_idx][1] += score
+
+    docs = index["docs"]
+    ranked = []
+    for doc_idx, (matched, score) in scores.items():
+        if not _matches_filters(docs[doc_idx], category, building_id):
+            continue
+        ranked.append((-matched, -score, str(docs[doc_idx].get("properties", {}).get("name") or ""), doc_idx))
+
+    ranked.sort()
+    return [doc_idx for _, _, _, doc_idx in ranked]
+
+
+def fuzzy_search(
+    query: str,
+    category: Optional[str] = None,
+    building_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """Typo-tolerant search over node names, ids and tags, ranked best-first."""
+    index = get_search_index()
+    query_tokens = tokenize(query)
+    if not query_tokens:
+        return []
+
+    ranked = _rank_documents(index, query_tokens, category, building_id)
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [index["docs"][doc_idx] for doc_idx in ranked]
+
+
+def suggest(
+    query: str,
+    limit: int = SUGGEST_DEFAULT_LIMIT,
+    category: Optional[str] = None,
+    building_id: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Typeahead suggestions for a partially typed query, as lightweight dicts.
+
+    The last query token is treated as a prefix and answered from the precomputed
+    prefix table; earlier tokens must (fuzzily) match as whole words. If that gives
+    fewer than `limit` results and the time budget allows, the rest is topped up with
+    typo-tolerant matches for the whole query.
+    """
+    deadline = time.perf_counter() + SUGGEST_TIME_BUDGET_MS / 1000
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+    index = get_search_index()
+    query_tokens = tokenize(query[:SUGGEST_MAX_QUERY_LENGTH])
+    if not query_tokens:
+        return []
+
+    *leading, prefix = query_tokens
+    if len(prefix) <= PREFIX_INDEX_MAX_LENGTH:
+        candidates = index["prefix_top"].get(prefix, [])
+    else:
+        tokens = _prefix_matches(index["vocab"], prefix)
+        candidates = sorted(
+            {doc_idx for token in tokens for doc_idx in index["token_docs"][token]},
+            key=lambda doc_idx: index["suggestion_rank"][doc_idx],
+        )
+
+    required = None
+    for query_token in leading:
+        matched = {
+            doc_idx
+            for token in match_token(index, query_token)
+            for doc_idx in index["token_docs"][token]
+        }
+        required = matched if required is None else required & matched
+
+    docs = index["docs"]
+    picked = []
+    for doc_idx in candidates:
+        if required is not None and doc_idx not in required:
+            continue
+        if not _matches_filters(docs[doc_idx], category, building_id):
+            continue
+        picked.append(doc_idx)
+        if len(picked) == limit:
+            break
+
+    if len(picked) < limit and time.perf_counter() < deadline:
+        for doc_idx in _rank_documents(index, query_tokens, category, building_id):
+            if doc_idx not in picked:
+                picked.append(doc_idx)
+                if len(picked) == limit:
+                    break
+
+    return [index["suggestions"][doc_idx] for doc_idx in picked]
@@ -1,23 +1,19 @@
 from typing import Dict, List, Optional
 from app.core.database import nodes_collection
+from app.core.async_database import async_nodes_collection
 import re
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.models.node_model import NodeFeature # Import for type hinting/schema reference
+from app.services.search_index import fuzzy_search
+from app.services.projections import NODE_VIEWS, View, finish, project_document
 
-def search_locations(
-    query: Optional[str] = None, 
-    category: Optional[str] = None, 
+def build_search_filters(
+    query: Optional[str] = None,
+    category: Optional[str] = None,
     building_id: Optional[str] = None
-) -> Dict[str, List[Dict]]:
-    """
-    Performs text search on the MongoDB nodes_collection using indexes for speed.
-    
-    Filters by:
-    1. Text query (on name or tags)
-    2. Category (exact match)
-    3. Building ID (exact match)
-    """
-    
+) -> Dict:
+    """MongoDB filter for a plain (non-fuzzy) search."""
     # 1. Base Query: Exclude archived items
     filters = {"_meta.is_archived": {"$ne": True}}
 
@@ -40,12 +36,46 @@ def search_locations(
             {"properties.name": {"$regex": regex_query, "$options": "i"}},
             {"properties.tags": {"$regex": regex_query, "$options": "i"}}
         ]
+    return filters
+
+def search_locations(
+    query: Optional[str] = None, 
+    category: Optional[str] = None, 
+    building_id: Optional[str] = None,
+    fuzzy: bool = False,
+    limit: Optional[int] = None,
+    view: View = "detail"
+) -> Dict[str, List[Dict]]:
+    """
+    Performs text search on the MongoDB nodes_collection using indexes for speed.
+    
+    Filters by:
+    1. Text query (on name or tags)
+    2. Category (exact match)
+    3. Building ID (exact match)
+
+    With fuzzy=True the text query is answered from the in-memory trigram index
+    instead (typo-tolerant, ranked, no MongoDB round trip).
+
+    view selects the returned fields (see app.services.projections).
+    """
+
+    if fuzzy and query:
+        projection = NODE_VIEWS[view]
+        results = [
+            project_document(doc, projection)
+            for doc in fuzzy_search(query, category=category, building_id=building_id, limit=limit)
+        ]
+        return {
+            "count": len(results),
+            "results": results
+        }
     
+    filters = build_search_filters(query, category, building_id)
+
     # Execute query
     try:
-        # Exclude _id on retrieval for cleaner JSON output
-        results_cursor = nodes_collection.find(filters, {"_id": 0})
-        results = list(results_cursor)
+        results = finish(list(nodes_collection.find(filters, NODE_VIEWS[view])), view)
         
     except Exception as e:
         # Handle potential MongoDB errors
@@ -55,4 +85,29 @@ def search_locations(
     return {
         "count": len(results),
         "results": results
-    }
\ No newline at end of file
+    }
+
+async def search_locations_async(
+    query: Optional[str] = None,
+    category: Optional[str] = None,
+    building_id: Optional[str] = None,
+    fuzzy: bool = False,
+    limit: Optional[int] = None,
+    view: View = "detail"
+) -> Dict[str, List[Dict]]:
+    """Async variant of search_locations."""
+    if fuzzy and query:
+        # In-memory, but a stale index is rebuilt with a blocking query, so keep it off the event loop
+        return await run_in_threadpool(search_locations, query, category, building_id, True, limit, view)
+
+    try:
+        results = await async_nodes_collection.find(build_search_filters(query, category, building_id), NODE_VIEWS[view]).to_list()
+        results = finish(results, view)
+    except Exception as e:
+        print(f"MongoDB search error: {e}")
+        raise HTTPException(status_code=500, detail="Database error during search operation.")
+
+    return {
+        "count": len(results),
+        "results": results
+    }
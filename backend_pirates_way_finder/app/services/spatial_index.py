@@ -0,0 +1,204 @@
+"""
+Spatial lookups for snapping map taps (pixel coordinates) to the routing grid and to nodes.
+
+Two precomputed structures:
+  - a nearest-walkable-cell map over grid_instance (one per mode), built with a
+    multi-source BFS so every cell, wall or not, knows its closest walkable cell
+  - a uniform bucket grid over node coordinates for nearest-node queries
+"""
+
+import math
+import threading
+from array import array
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from app.core.grid_loader import grid_instance
+from app.core.metrics import record_cache
+from app.services.pathfinding_stats import logger
+from app.core.database import nodes_collection
+from app.services.pathfinding_astar import get_stair_blocked_cells, cache_version
+
+# Side length (in pixels) of a node bucket
+NODE_BUCKET_SIZE = 50
+
+# Cache for nearest-walkable maps: accessibility mode -> (cache_version, map), one lock per mode
+_nearest_walkable = {}
+_nearest_walkable_locks = {False: threading.Lock(), True: threading.Lock()}
+# Cache for the node bucket grid
+_node_buckets = None
+
+
+def build_nearest_walkable_map(blocked_cells=None) -> array:
+    """
+    For every grid cell, the flat index (y * w + x) of the nearest walkable cell
+    (Manhattan distance in cells), or -1 if the grid has no walkable cell at all.
+    Cells in blocked_cells are treated as non-walkable.
+    """
+    w, h, g = grid_instance.w, grid_instance.h, grid_instance.grid
+    blocked_cells = blocked_cells or set()
+
+    nearest = array("i", [-1]) * (w * h)
+    queue = deque()
+    for y in range(h):
+        row = g[y]
+        for x in range(w):
+            if row[x] == 0 and (x, y) not in blocked_cells:
+                idx = y * w + x
+                nearest[idx] = idx
+                queue.append(idx)
+
+    # Multi-source BFS over the whole grid (walls included) spreads each
+    # walkable cell's index outward until every cell has been claimed
+    while queue:
+        idx = queue.popleft()
+        source = nearest[idx]
+        x, y = idx % w, idx // w
+        if x > 0 and nearest[idx - 1] == -1:
+            nearest[idx - 1] = source
+            queue.append(idx - 1)
+        if x < w - 1 and nearest[idx + 1] == -1:
+            nearest[idx + 1] = source
+            queue.append(idx + 1)
+        if y > 0 and nearest[idx - w] == -1:
+            nearest[idx - w] = source
+            queue.append(idx - w)
+        if y < h - 1 and nearest[idx + w] == -1:
+            nearest[idx + w] = source
+            queue.append(idx + w)
+
+    return nearest
+
+
+def get_nearest_walkable_map(accessibility_mode=False) -> array:
+    """Get the nearest-walkable map for a mode, rebuilding after a grid reload or overlay change (cached)."""
+    accessibility_mode = bool(accessibility_mode)
+    with _nearest_walkable_locks[accessibility_mode]:
+        version = cache_version(accessibility_mode)
+        entry = _nearest_walkable.get(accessibility_mode)
+        hit = entry is not None and entry[0] == version
+        record_cache("nearest_walkable", hit)
+        if not hit:
+            blocked = get_stair_blocked_cells() if accessibility_mode else None
+            entry = _nearest_walkable[accessibility_mode] = (version, build_nearest_walkable_map(blocked))
+            logger.info("[SNAP] Built nearest-walkable map (accessibility_mode=%s)", accessibility_mode)
+
+        return entry[1]
+
+
+def pixel_to_cell(px, py) -> Tuple[int, int]:
+    """Convert pixel coordinates to a grid cell, clamped to the grid bounds."""
+    cell = grid_instance.cell_size
+    gx = min(max(int(px // cell), 0), grid_instance.w - 1)
+    gy = min(max(int(py // cell), 0), grid_instance.h - 1)
+    return gx, gy
+
+
+def cell_to_pixel(gx, gy) -> Dict[str, float]:
+    """Center of a grid cell in pixel coordinates."""
+    cell = grid_instance.cell_size
+    return {"x": gx * cell + cell / 2, "y": gy * cell + cell / 2}
+
+
+def snap_to_walkable(px, py, accessibility_mode=False) -> Optional[Tuple[int, int]]:
+    """Nearest walkable grid cell to a pixel position in O(1), or None if there is none."""
+    gx, gy = pixel_to_cell(px, py)
+    nearest = get_nearest_walkable_map(accessibility_mode)[gy * grid_instance.w + gx]
+    if nearest == -1:
+        return None
+    return nearest % grid_instance.w, nearest // grid_instance.w
+
+
+def build_node_buckets(nodes) -> Dict:
+    """
+    Group nodes into NODE_BUCKET_SIZE x NODE_BUCKET_SIZE pixel buckets.
+    Returns {"buckets": {(bx, by): [entry, ...]}, "bounds": (min_bx, min_by, max_bx, max_by)}.
+    """
+    buckets = {}
+    for node in nodes:
+        coords = node.get("geometry", {}).get("coordinates", [])
+        if len(coords) < 2:
+            continue
+        props = node.get("properties", {})
+        entry = {
+            "id": props.get("id"),
+            "name": props.get("name"),
+            "coordinates": coords[:2],
+        }
+        key = (int(coords[0] // NODE_BUCKET_SIZE), int(coords[1] // NODE_BUCKET_SIZE))
+        buckets.setdefault(key, []).append(entry)
+
+    bounds = None
+    if buckets:
+        bounds = (
+            min(kx for kx, _ in buckets), min(ky for _, ky in buckets),
+            max(kx for kx, _ in buckets), max(ky for _, ky in buckets),
+        )
+    return {"buckets": buckets, "bounds": bounds}
+
+
+def get_node_buckets() -> Dict:
+    """Get the node bucket grid, loading active nodes from MongoDB on first use (cached)."""
+    global _node_buckets
+
+    if _node_buckets is None:
+        nodes = nodes_collection.find(
+            {"_meta.is_archived": {"$ne": True}},
+            {"_id": 0, "properties.id": 1, "properties.name": 1, "geometry.coordinates": 1},
+        )
+        _node_buckets = build_node_buckets(nodes)
+        logger.info("[SNAP] Indexed nodes into %s buckets", len(_node_buckets["buckets"]))
+
+    return _node_buckets
+
+
+def invalidate_node_buckets():
+    """Drop the cached node buckets so the next lookup reloads them."""
+    global _node_buckets
+    _node_buckets = None
+
+
+def _ring_keys(bx, by, ring):
+    """Bucket keys on the square ring at Chebyshev distance `ring` around (bx, by)."""
+    if ring == 0:
+        yield bx, by
+        return
+    for kx in range(bx - ring, bx + ring + 1):
+        yield kx, by - ring
+        yield kx, by + ring
+    for ky in range(by - ring + 1, by + ring):
+        yield bx - ring, ky
+        yield bx + ring, ky
+
+
+def nearest_node(px, py, max_distance=None) -> Optional[Dict]:
+    """
+    Nearest node to a pixel position (Euclidean), searching bucket rings outward
+    from the query bucket until no closer node can exist.
+    Returns {id, name, coordinates, distance} or None.
+    """
+    index = get_node_buckets()
+    buckets = index["buckets"]
+    if not buckets:
+        return None
+
+    bx, by = int(px // NODE_BUCKET_SIZE), int(py // NODE_BUCKET_SIZE)
+    min_bx, min_by, max_bx, max_by = index["bounds"]
+    max_ring = max(abs(bx - min_bx), abs(bx - max_bx), abs(by - min_by), abs(by - max_by))
+
+    best, best_dist = None, math.inf
+    for ring in range(max_ring + 1):
+        # Any node in this ring or beyond is at least (ring - 1) buckets away
+        if (ring - 1) * NODE_BUCKET_SIZE > best_dist:
+            break
+        if max_distance is not None and (ring - 1) * NODE_BUCKET_SIZE > max_distance:
+            break
+        for key in _ring_keys(bx, by, ring):
+            for entry in buckets.get(key, ()):
+                dist = math.hypot(entry["coordinates"][0] - px, entry["coordinates"][1] - py)
+                if dist < best_dist:
+                    best, best_dist = entry, dist
+
+    if best is None or (max_distance is not None and best_dist > max_distance):
+        return None
+    return {**best, "distance": round(best_dist, 2)}
@@ -0,0 +1,64 @@
+"""
+Shared test setup. The app runs against an in-memory mongomock store (see
+app.core.in_memory_database), so the suite needs no MongoDB server.
+"""
+
+from app.core.in_memory_database import use_in_memory_database
+
+# Must run before anything imports app.core.database
+use_in_memory_database("pytest")
+
+import os
+
+import pytest
+
+from app.core.database import db
+from app.core.grid_loader import grid_instance
+from app.core.write_behind import flush_all
+from app.services.node_service import invalidate_node_caches
+
+GRID_PATH = os.path.join(os.path.dirname(__file__), "..", "static", "grid.json")
+
+
+@pytest.fixture(scope="session")
+def grid():
+    """The campus grid shipped in app/static, loaded once."""
+    grid_instance.load(GRID_PATH)
+    return grid_instance
+
+
+@pytest.fixture
+def clean_db():
+    """Empty every collection (and write-behind buffer) before and after the test."""
+    def clear():
+        flush_all()
+        for name in db.list_collection_names():
+            db[name].delete_many({})
+        invalidate_node_caches()
+
+    clear()
+    yield db
+    clear()
+
+
+@pytest.fixture
+def bulk_upserts(monkeypatch):
+    """
+    mongomock 4.3 cannot apply the UpdateOne operations of pymongo >= 4.9 in
+    bulk_write; apply them one at a time and report the counts bulk_write would.
+    """
+    from mongomock.collection import Collection
+
+    class Result:
+        def __init__(self, upserted, matched):
+            self.bulk_api_result = {"nUpserted": upserted, "nMatched": matched}
+
+    def bulk_write(self, operations, ordered=True, **kwargs):
+        upserted = matched = 0
+        for op in operations:
+            result = self.update_one(op._filter, op._doc, upsert=op._upsert)
+            upserted += result.upserted_id is not None
+            matched += result.matched_count
+        return Result(upserted, matched)
+
+    monkeypatch.setattr(Collection, "bulk_write", bulk_write)
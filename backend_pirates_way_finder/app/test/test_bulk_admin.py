@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.core.database import nodes_collection
+from app.core.security import get_current_admin
+from app.routers.audit_log_router import audit_log_writer, audit_logs_collection
+from app.routers.notification_router import create_notification, notification_writer, notifications_collection
+
+client = TestClient(main.app)
+
+
+@pytest.fixture
+def as_admin(clean_db):
+    main.app.dependency_overrides[get_current_admin] = lambda: "admin@example.com"
+    yield
+    main.app.dependency_overrides.clear()
+
+
+def poi(node_id, building_id, category):
+    return {"properties": {"id": node_id, "name": node_id.title(), "building_id": building_id, "category": category},
+            "geometry": {"type": "Point", "coordinates": [1, 1]}}
+
+
+def active_ids():
+    return sorted(doc["properties"]["id"] for doc in nodes_collection.find({"_meta.is_archived": {"$ne": True}}))
+
+
+def test_bulk_archive_by_ids_writes_one_audit_entry(as_admin):
+    nodes_collection.insert_many([poi("lab_1", "sci", "lab"), poi("lab_2", "sci", "lab"), poi("cafe", "sci", "food")])
+
+    body = client.post("/admin/nodes/bulk/archive", json={"ids": ["LAB_1", "lab_2", "ghost"]}).json()
+
+    assert body["archived_count"] == 2 and body["not_found"] == ["ghost"]
+    assert active_ids() == ["cafe"]
+    audit_log_writer.flush()
+    (entry,) = audit_logs_collection.find({"action_type": "POIS_ARCHIVED"})
+    assert sorted(entry["metadata"]["poi_ids"]) == ["lab_1", "lab_2"]
+
+
+def test_bulk_archive_by_filters_skips_archived_pois(as_admin):
+    nodes_collection.insert_many([poi("lab_1", "sci", "lab"), poi("lab_2", "arts", "lab"), poi("cafe", "sci", "food")])
+
+    assert client.post("/admin/nodes/bulk/archive", json={"building_id": "sci", "category": "lab"}).json()["archived_ids"] == ["lab_1"]
+    assert client.post("/admin/nodes/bulk/archive", json={"building_id": "sci", "category": "lab"}).json()["archived_count"] == 0
+    assert client.post("/admin/nodes/bulk/archive", json={}).status_code == 400
+    assert active_ids() == ["cafe", "lab_2"]
+
+
+def test_bulk_read_by_ids_and_type(as_admin):
+    created = [create_notification("POI_CREATED", "Created", "node"), create_notification("RATING_RECEIVED", "Rated", "node"),
+               create_notification("RATING_RECEIVED", "Rated", "node")]
+
+    by_id = client.post("/admin/notifications/bulk/read", json={"ids": [str(created[0]["_id"])]}).json()
+    by_type = client.post("/admin/notifications/bulk/read", json={"type": "RATING_RECEIVED"}).json()
+
+    assert by_id["marked_count"] == 1 and by_type["marked_count"] == 2
+    notification_writer.flush()
+    assert notifications_collection.count_documents({"read": False}) == 0
+    assert client.post("/admin/notifications/bulk/read", json={}).status_code == 400
@@ -0,0 +1,128 @@
+import io
+import json
+
+import pytest
+
+from app.core.database import edges_collection, nodes_collection
+from app.services import geojson_io
+from app.services.pathfinding_service import build_graph
+from app.services.geojson_io import (
+    GeoJSONFormatError,
+    export_feature_collection,
+    import_features,
+    iter_features,
+    split_stored_feature_collections,
+)
+
+
+def node(node_id, **properties):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [10.0, 20.0]},
+        "properties": {"id": node_id, "type": "room", **properties},
+    }
+
+
+def edge(edge_id, **properties):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "LineString", "coordinates": [[10.0, 20.0], [30.0, 40.0]]},
+        "properties": {"id": edge_id, "from": "a", "to": "b", "type": "corridor", **properties},
+    }
+
+
+def stored(collection, feature_id):
+    return collection.find_one({"properties.id": feature_id}, {"_id": 0, "_meta": 0})
+
+
+def test_iter_features_reads_a_feature_collection_across_buffer_refills(monkeypatch):
+    monkeypatch.setattr(geojson_io, "_READ_SIZE", 50)
+    features = [node(f"n{i}", name=f"Room {i}") for i in range(40)]
+    text = json.dumps({"type": "FeatureCollection", "name": "campus", "features": features}, indent=1)
+
+    assert list(iter_features(io.StringIO(text))) == features
+
+
+def test_iter_features_reads_newline_delimited_features():
+    features = [node("n1"), edge("e1")]
+    text = "\n".join(json.dumps(feature) for feature in features) + "\n"
+
+    assert list(iter_features(io.StringIO(text))) == features
+
+
+def test_iter_features_rejects_other_json():
+    with pytest.raises(GeoJSONFormatError):
+        list(iter_features(io.StringIO("[1, 2, 3]")))
+
+
+def test_export_then_import_keeps_properties_the_models_do_not_declare(clean_db, bulk_upserts):
+    import_features([
+        node("lib", name="Library", accessible=True, description="Quiet floor", image="lib.png"),
+        edge("e1", notes="Wide corridor"),
+    ])
+    before = stored(nodes_collection, "lib")
+    assert before["properties"]["description"] == "Quiet floor"
+
+    exported = "".join(export_feature_collection("nodes"))
+    nodes_collection.delete_many({})
+    report = import_features(iter_features(io.StringIO(exported)))
+
+    assert report["nodes"] == {"inserted": 1, "updated": 0}
+    assert stored(nodes_collection, "lib") == before
+    assert stored(edges_collection, "e1")["properties"]["notes"] == "Wide corridor"
+
+
+def test_reimport_keeps_stored_properties_missing_from_the_file(clean_db, bulk_upserts):
+    import_features([node("lib", name="Library", accessible=True, description="Quiet floor")])
+
+    report = import_features([node("lib", floor=2)])
+
+    properties = stored(nodes_collection, "lib")["properties"]
+    assert report["nodes"] == {"inserted": 0, "updated": 1}
+    assert properties["floor"] == 2
+    assert properties["accessible"] is True
+    assert properties["description"] == "Quiet floor"
+
+
+def test_new_features_get_model_defaults(clean_db, bulk_upserts):
+    import_features([node("Main Lobby")])
+
+    properties = stored(nodes_collection, "main_lobby")["properties"]
+    assert properties["environment"] == "indoor"
+    assert properties["accessible"] is False
+
+
+def test_invalid_features_are_skipped_and_reported(clean_db, bulk_upserts):
+    report = import_features([node("ok"), node("wc", category="restroom"), {"type": "Feature", "geometry": {"type": "Polygon"}}])
+
+    assert report["processed"] == 3
+    assert report["invalid"] == 2
+    assert [error["index"] for error in report["errors"]] == [1, 2]
+    assert nodes_collection.count_documents({}) == 1
+
+
+def test_split_stored_keeps_a_collection_with_invalid_features(clean_db, bulk_upserts):
+    nodes_collection.insert_one({"type": "FeatureCollection", "features": [node("ok"), node("wc", category="restroom")]})
+    edges_collection.insert_one({"type": "FeatureCollection", "features": [edge("e1")]})
+
+    reports = split_stored_feature_collections()
+
+    assert sorted((name.split(":")[0], report["kept"]) for name, report in reports.items()) == [
+        ("edges", False), ("nodes", True)
+    ]
+    assert nodes_collection.count_documents({"type": "FeatureCollection"}) == 1
+    assert edges_collection.count_documents({"type": "FeatureCollection"}) == 0
+    assert stored(nodes_collection, "ok") is not None
+
+
+def test_build_graph_reads_features_of_an_unsplit_collection(clean_db, caplog):
+    nodes_collection.insert_one({"type": "FeatureCollection", "features": [node("a"), node("wc", category="restroom"), "junk"]})
+    nodes_collection.insert_one({**node("b"), "geometry": {"type": "Point", "coordinates": [13.0, 24.0]}})
+    edges_collection.insert_one({"type": "FeatureCollection", "features": [edge("e1"), edge("e2", to="wc", accessible=False)]})
+
+    graph = build_graph()
+    accessible = build_graph(accessible_only=True)
+
+    assert sorted(graph.edges) == [("a", "b"), ("a", "wc")] and graph["a"]["b"]["weight"] == 5
+    assert list(accessible.edges) == [("a", "b")]
+    assert "FeatureCollection" in caplog.text and "split-stored" in caplog.text
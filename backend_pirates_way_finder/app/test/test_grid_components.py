@@ -0,0 +1,36 @@
+from app.services.grid_components import are_connected, component_of, get_components
+from app.services.pathfinding_astar import astar
+from app.services.route_service import PathRequest, compute_route
+from app.services.spatial_index import cell_to_pixel
+
+
+def cells_of(components, label, w):
+    members = components["members"][components["offsets"][label]:components["offsets"][label + 1]]
+    return [(idx % w, idx // w) for idx in members]
+
+
+def test_labels_split_the_walkable_cells_into_regions(grid):
+    components = get_components()
+
+    assert sum(components["sizes"]) == sum(row.count(0) for row in grid.grid)
+    assert all(component_of(x, y) == -1 for y in range(grid.h) for x in range(grid.w) if grid.grid[y][x] != 0)
+
+
+def test_routes_between_regions_are_rejected_with_a_reachable_suggestion(grid):
+    components = get_components()
+    assert len(components["sizes"]) > 1, "the campus grid should have more than one walkable region"
+    by_size = sorted(range(len(components["sizes"])), key=components["sizes"].__getitem__, reverse=True)
+    start = cells_of(components, by_size[0], grid.w)[0]
+    end = cells_of(components, by_size[1], grid.w)[0]
+    start_px, end_px = cell_to_pixel(*start), cell_to_pixel(*end)
+    coords = dict(start_x=int(start_px["x"]), start_y=int(start_px["y"]), end_x=int(end_px["x"]), end_y=int(end_px["y"]))
+
+    assert are_connected(start, end) is False
+    assert astar(coords["start_x"], coords["start_y"], coords["end_x"], coords["end_y"]) == []
+
+    stats = {}
+    result = compute_route(PathRequest(**coords, snap_to_walkable=False), stats)
+    suggestion = result["suggested_end"]
+    assert stats["algorithm"] == "components"
+    assert result["reachable"] is False
+    assert component_of(int(suggestion["x"] // grid.cell_size), int(suggestion["y"] // grid.cell_size)) == by_size[0]
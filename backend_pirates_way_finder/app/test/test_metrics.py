@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+import main
+from app.core.metrics import Counter, Histogram
+from app.test.test_pathfinding import reachable_pairs
+
+client = TestClient(main.app)
+
+
+def scrape():
+    """GET /metrics as {sample name with labels: value}."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_counters_and_histograms_render_cumulatively():
+    requests = Counter("test_requests_total", "Test counter.", ("mode",))
+    latency = Histogram("test_latency_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    requests.inc(mode="normal")
+    requests.inc(2, mode="normal")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    samples = scrape()
+    assert samples['test_requests_total{mode="normal"}'] == 3
+    assert samples['test_latency_seconds_bucket{le="0.1"}'] == 1
+    assert samples['test_latency_seconds_bucket{le="1.0"}'] == 2
+    assert samples['test_latency_seconds_bucket{le="+Inf"}'] == samples["test_latency_seconds_count"] == 3
+
+
+def test_routes_are_timed_per_stage(grid):
+    sx, sy, ex, ey = reachable_pairs(1, seed=33)[0]
+    before = scrape()
+
+    response = client.post("/path/shortest", json={
+        "start_x": sx, "start_y": sy, "end_x": ex, "end_y": ey, "algorithm": "astar",
+    })
+    assert response.status_code == 200 and response.json()["path"]
+
+    after = scrape()
+    for stage in ("astar", "smooth_path", "simplify_path", "generate_instructions", "json_encode"):
+        key = f'pathfinding_stage_seconds_count{{stage="{stage}"}}'
+        assert after[key] == before.get(key, 0) + 1, stage
+    key = 'pathfinding_requests_total{mode="normal",algorithm="astar",found="true"}'
+    assert after[key] == before.get(key, 0) + 1
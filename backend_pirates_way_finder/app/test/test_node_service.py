@@ -0,0 +1,81 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import nodes_collection
+from app.services import path_executor
+from app.services.node_service import add_poi, archive_pois, delete_poi, update_node_accessibility, update_poi
+from app.services.pathfinding_astar import get_overlay_version
+
+
+@pytest.fixture
+def overlay_changes(clean_db, monkeypatch):
+    """Count accessibility overlay invalidations (without warming the route caches)."""
+    monkeypatch.setattr(path_executor, "rebuild_accessibility_caches_in_background", lambda: None)
+    start = get_overlay_version()
+    return lambda: get_overlay_version() - start
+
+
+def point(node_id, name, **props):
+    return {"type": "Feature", "properties": {"id": node_id, "name": name, **props},
+            "geometry": {"type": "Point", "coordinates": [10, 10]}}
+
+
+def test_plain_node_writes_keep_the_accessibility_overlay(overlay_changes):
+    add_poi(point("cafe", "Main Cafe", category="food"))
+    update_poi("cafe", {"properties": {"category": "dining"}, "geometry": {"coordinates": [20, 20]}}, "admin")
+    delete_poi("cafe", "admin")
+
+    assert overlay_changes() == 0
+
+
+def test_ramp_and_stair_writes_drop_the_accessibility_overlay(overlay_changes):
+    add_poi(point("north_ramp", "North Ramp"))
+    assert overlay_changes() == 1
+
+    update_poi("north_ramp", {"geometry": {"coordinates": [30, 30]}}, "admin")
+    assert overlay_changes() == 2
+
+    add_poi(point("hall", "Hall"))
+    update_node_accessibility("hall", {"accessible": False}, "admin")
+    assert overlay_changes() == 3
+
+    archive_pois("admin", poi_ids=["north_ramp"])
+    assert overlay_changes() == 4
+
+
+def test_renaming_a_stair_away_still_drops_the_overlay(overlay_changes):
+    add_poi(point("b_stair", "Stairwell B"))
+    update_poi("b_stair", {"properties": {"name": "Corridor B"}}, "admin")
+
+    assert overlay_changes() == 2
+
+
+def test_updates_return_the_updated_document(overlay_changes):
+    add_poi(point("cafe", "Main Cafe", category="food"))
+
+    updated = update_poi(" CAFE ", {"properties": {"id": "renamed", "category": "dining"}}, "editor")
+    assert updated["properties"]["id"] == "cafe" and updated["properties"]["category"] == "dining"
+    assert updated["_meta"]["updated_by"] == "editor" and isinstance(updated["_id"], str)
+
+    updated = update_node_accessibility("cafe", {"accessible": False, "notes": "Step at door"}, "auditor")
+    assert updated["properties"]["accessible"] is False and updated["properties"]["category"] == "dining"
+    assert nodes_collection.find_one({"properties.id": "cafe"})["properties"]["notes"] == "Step at door"
+
+
+def test_updates_of_missing_nodes_raise_404(overlay_changes):
+    with pytest.raises(HTTPException) as missing_poi:
+        update_poi("ghost", {"properties": {"name": "Ghost"}}, "admin")
+    with pytest.raises(HTTPException) as missing_node:
+        update_node_accessibility("ghost", {"accessible": True}, "admin")
+
+    assert missing_poi.value.status_code == missing_node.value.status_code == 404
+    assert nodes_collection.count_documents({}) == 0
+
+
+def test_delete_returns_properties_once(overlay_changes):
+    add_poi(point("cafe", "Main Cafe", category="food"))
+
+    assert delete_poi("Cafe", "admin") == {"id": "cafe", "name": "Main Cafe", "category": "food"}
+    assert delete_poi("cafe", "admin") is None
+    assert delete_poi("ghost", "admin") is None
+    assert nodes_collection.find_one({"properties.id": "cafe"})["_meta"]["archived_by"] == "admin"
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+import main
+from app.core.broker import EventBroker, dropped_events
+from app.core.security import get_current_admin
+from app.routers.notification_router import (
+    create_notification, create_notification_async, notification_broker, notification_writer, notifications_collection,
+    reconcile_unread_count,
+)
+
+client = TestClient(main.app)
+
+
+def test_events_published_from_other_threads_reach_subscribers():
+    broker = EventBroker("test")
+
+    async def receive():
+        subscription = broker.subscribe()
+        try:
+            thread = threading.Thread(target=broker.publish, args=("hello",))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(subscription.get(), 5)
+        finally:
+            subscription.close()
+
+    assert asyncio.run(receive()) == "hello"
+
+
+def test_slow_subscribers_lose_the_oldest_events():
+    broker = EventBroker("test_slow", max_queue=2)
+    dropped = dropped_events.value(broker="test_slow")
+
+    async def receive():
+        subscription = broker.subscribe()
+        for event in ("a", "b", "c"):
+            broker.publish(event)
+        await asyncio.sleep(0)
+        received = [await subscription.get(), await subscription.get()]
+        subscription.close()
+        return received
+
+    assert asyncio.run(receive()) == ["b", "c"]
+    assert dropped_events.value(broker="test_slow") == dropped + 1
+
+
+def test_sync_and_async_notifications_are_stored_and_streamed_alike(clean_db):
+    async def create_both():
+        subscription = notification_broker.subscribe()
+        try:
+            created = [
+                await asyncio.to_thread(create_notification, "POI_CREATED", "Sync", "from a sync handler"),
+                await create_notification_async("RATING_RECEIVED", "Async", "from an async handler", {"rating": "GOOD"}),
+            ]
+            return created, [await asyncio.wait_for(subscription.get(), 5) for _ in created]
+        finally:
+            subscription.close()
+
+    created, events = asyncio.run(create_both())
+    notification_writer.flush()
+
+    for notification, event in zip(created, events):
+        event_id, event_type, data = event.strip().split("\n")
+        payload = json.loads(data.removeprefix("data: "))
+        assert event_id == f"id: {notification['_id']}" and event_type == "event: notification"
+        assert payload["id"] == str(notification["_id"]) and payload["title"] == notification["title"]
+        assert notifications_collection.find_one({"_id": notification["_id"], "read": False}) is not None
+
+
+class GatedCollection:
+    """Lets a test hold a flush between taking a batch off the buffer and storing it."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def insert_many(self, documents, ordered=True):
+        self.entered.set()
+        self.release.wait(5)
+        return self.collection.insert_many(documents, ordered=ordered)
+
+
+def test_reconciling_during_a_flush_counts_each_notification_once(clean_db, monkeypatch):
+    gate = GatedCollection(notifications_collection)
+    monkeypatch.setattr(notification_writer, "collection", gate)
+    for i in range(3):
+        create_notification("POI_CREATED", f"Created {i}", "buffered")
+
+    flush = threading.Thread(target=notification_writer.flush)
+    flush.start()
+    assert gate.entered.wait(5)
+    # The batch is off the buffer but not stored yet
+    assert notification_writer.depth() == 0
+
+    counted = []
+    reconcile = threading.Thread(target=lambda: counted.append(asyncio.run(reconcile_unread_count())))
+    reconcile.start()
+    reconcile.join(0.2)
+    assert reconcile.is_alive(), "reconciliation must wait for the flush in progress"
+
+    gate.release.set()
+    flush.join(5)
+    reconcile.join(5)
+    assert counted == [3]
+
+
+def test_unread_count_follows_reads(clean_db):
+    main.app.dependency_overrides[get_current_admin] = lambda: "admin@example.com"
+    try:
+        created = [create_notification("POI_CREATED", f"Created {i}", "buffered") for i in range(3)]
+        assert asyncio.run(reconcile_unread_count()) == 3
+
+        # Still buffered: reading it stores the buffer first
+        assert client.post(f"/admin/notifications/{created[0]['_id']}/read").status_code == 200
+        assert client.get("/admin/notifications/unread/count").json() == {"unread_count": 2}
+        assert client.post("/admin/notifications/bulk/read", json={"all": True}).json()["marked_count"] == 2
+        assert client.get("/admin/notifications/unread/count").json() == {"unread_count": 0}
+        assert asyncio.run(reconcile_unread_count()) == 0
+    finally:
+        main.app.dependency_overrides.clear()
@@ -0,0 +1,56 @@
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+import main
+from app.core.database import db
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_admin
+
+# No context manager: startup hooks (grid, worker pool) aren't needed here
+client = TestClient(main.app)
+
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "created_at": "2026-10-19T08:00:00"}
+
+    assert decode_cursor(encode_cursor(doc, "created_at")) == ("2026-10-19T08:00:00", doc["_id"])
+
+
+def test_cursor_keeps_non_objectid_ids():
+    assert decode_cursor(encode_cursor({"_id": "lib|day", "bucket": 3}, "bucket")) == (3, "lib|day")
+
+
+def test_malformed_cursor_is_a_400(clean_db):
+    for cursor in ("not-a-cursor", encode_cursor({"_id": "x"}, "v")[:-3], "e30"):
+        response = client.get("/ratings/by-location/lib", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+
+
+def test_pages_with_tied_timestamps_return_every_rating_once(clean_db):
+    db["ratings"].insert_many([
+        {"location_id": "lib", "rating": "GOOD", "created_at": "2026-10-19T08:00:00" if i < 7 else "2026-10-18T08:00:00"}
+        for i in range(10)
+    ])
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/ratings/by-location/lib", params=params)
+        seen.extend(rating["_id"] for rating in response.json()["ratings"])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    expected = [str(doc["_id"]) for doc in db["ratings"].find().sort([("created_at", -1), ("_id", -1)])]
+    assert seen == expected
+
+
+def test_audit_logs_reject_skip_with_a_cursor(clean_db):
+    main.app.dependency_overrides[get_current_admin] = lambda: "admin@example.com"
+    try:
+        cursor = encode_cursor({"_id": ObjectId(), "timestamp": "2026-10-19T08:00:00"}, "timestamp")
+        assert client.get("/admin/audit-logs/", params={"cursor": cursor, "skip": 5}).status_code == 400
+        assert client.get("/admin/audit-logs/", params={"cursor": cursor}).status_code == 200
+        assert client.get("/admin/audit-logs/", params={"skip": 5}).status_code == 200
+    finally:
+        main.app.dependency_overrides.clear()
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.core import password_hashing
+from app.core.async_database import async_admins_collection
+from app.core.password_hashing import PasswordHashingBusy, _submit, rejected_hashes
+from app.core.security import hash_password
+
+client = TestClient(main.app)
+
+
+def test_default_pool_runs_logins_side_by_side():
+    assert password_hashing._executor._max_workers >= 2
+
+
+def test_calls_beyond_the_queue_limit_are_rejected(monkeypatch):
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_MAX_PENDING", 1)
+    release = threading.Event()
+    rejected = rejected_hashes.value(reason="queue_full")
+
+    async def burst():
+        first = asyncio.ensure_future(_submit("verify", release.wait, 5))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                await _submit("verify", lambda: True)
+        finally:
+            release.set()
+        return await first
+
+    assert asyncio.run(burst()) is True
+    assert rejected_hashes.value(reason="queue_full") == rejected + 1
+
+
+def test_slow_calls_time_out(monkeypatch):
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_TIMEOUT_SECONDS", 0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(PasswordHashingBusy):
+            asyncio.run(_submit("verify", release.wait, 5))
+    finally:
+        release.set()
+
+
+def test_a_saturated_pool_answers_logins_with_503(clean_db, monkeypatch):
+    asyncio.run(async_admins_collection.insert_one({"email": "admin@example.com", "password": hash_password("pw")}))
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_MAX_PENDING", 0)
+
+    response = client.post("/auth/login", data={"username": "admin@example.com", "password": "pw"})
+    assert response.status_code == 503
+
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_MAX_PENDING", 4)
+    response = client.post("/auth/login", data={"username": "admin@example.com", "password": "pw"})
+    assert response.status_code == 200 and response.json()["access_token"]
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import path_executor
+from app.services.path_executor import PathfindingBusy, PathfindingTimeout, dispatch_route
+from app.services.pathfinding_stats import debug_enabled, set_debug
+from app.services.route_service import PathRequest
+from app.test.test_pathfinding import reachable_pairs
+
+
+def worker_logging():
+    """Runs inside a worker: how its logging ended up configured."""
+    root = logging.getLogger()
+    return root.level, bool(root.handlers), debug_enabled()
+
+
+@pytest.fixture
+def pool(grid, monkeypatch):
+    monkeypatch.setattr(path_executor, "PATHFINDING_WORKERS", 1)
+    assert path_executor.start_executor()
+    yield
+    path_executor.shutdown_executor()
+
+
+def route():
+    sx, sy, ex, ey = reachable_pairs(1, seed=36)[0]
+    return dispatch_route(PathRequest(start_x=sx, start_y=sy, end_x=ex, end_y=ey))
+
+
+def test_workers_log_like_the_api_process(grid, monkeypatch):
+    monkeypatch.setattr(path_executor, "PATHFINDING_WORKERS", 1)
+    root_level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.WARNING)
+    set_debug(True)
+    try:
+        assert path_executor.start_executor()
+        level, has_handler, pathfinding_debug = path_executor._executor.submit(worker_logging).result(timeout=60)
+    finally:
+        path_executor.shutdown_executor()
+        logging.getLogger().setLevel(root_level)
+        set_debug(False)
+
+    assert (level, has_handler, pathfinding_debug) == (logging.WARNING, True, True)
+
+
+def test_routes_run_in_the_worker_pool(pool):
+    content, stats = asyncio.run(route())
+
+    assert stats["found"] and stats["worker_pid"] != os.getpid()
+
+
+def test_slow_routes_time_out(pool, monkeypatch):
+    monkeypatch.setattr(path_executor, "PATHFINDING_TIMEOUT_SECONDS", 0.0001)
+
+    with pytest.raises(PathfindingTimeout):
+        asyncio.run(route())
+
+
+def test_a_dead_worker_restarts_the_pool(pool):
+    broken = path_executor._executor
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result(timeout=60)
+
+    with pytest.raises(PathfindingBusy):
+        asyncio.run(route())
+    assert path_executor._executor is not None and path_executor._executor is not broken
+
+    content, stats = asyncio.run(route())
+    assert stats["found"]
@@ -0,0 +1,85 @@
+import math
+import random
+
+import pytest
+
+from app.core.database import nodes_collection
+from app.core.grid_loader import grid_instance
+from app.services.grid_components import get_components
+from app.services.landmarks import build_cell_costs
+from app.services.pathfinding_astar import astar, bidirectional_astar, get_ramp_cells, get_stair_blocked_cells, invalidate_accessibility_overlay
+from app.services.spatial_index import cell_to_pixel
+
+def path_cost(path, costs):
+    w, cell = grid_instance.w, grid_instance.cell_size
+    return sum(costs[int(point["y"] // cell) * w + int(point["x"] // cell)] for point in path[1:])
+
+
+def reachable_pairs(count, seed, accessibility_mode=False):
+    """Pixel endpoints inside the largest walkable region, mixing near and far pairs."""
+    components = get_components(accessibility_mode)
+    largest = max(range(len(components["sizes"])), key=components["sizes"].__getitem__)
+    cells = components["members"][components["offsets"][largest]:components["offsets"][largest + 1]]
+    rng = random.Random(seed)
+    w = grid_instance.w
+    pairs = []
+    for _ in range(count):
+        a, b = rng.sample(list(cells), 2)
+        start, end = cell_to_pixel(a % w, a // w), cell_to_pixel(b % w, b // w)
+        pairs.append((int(start["x"]), int(start["y"]), int(end["x"]), int(end["y"])))
+    return pairs
+
+
+@pytest.mark.parametrize("use_landmarks", [True, False])
+def test_bidirectional_astar_finds_paths_as_cheap_as_astar(grid, use_landmarks):
+    costs = build_cell_costs()
+    for sx, sy, ex, ey in reachable_pairs(12, seed=31):
+        forward = astar(sx, sy, ex, ey, use_landmarks=use_landmarks)
+        both_ways = bidirectional_astar(sx, sy, ex, ey, use_landmarks=use_landmarks)
+
+        assert forward and both_ways
+        assert math.isclose(path_cost(both_ways, costs), path_cost(forward, costs), rel_tol=1e-9)
+
+
+
+def test_landmark_heuristic_never_changes_the_route_cost(grid):
+    costs = build_cell_costs()
+    for sx, sy, ex, ey in reachable_pairs(12, seed=30):
+        with_landmarks = astar(sx, sy, ex, ey, use_landmarks=True)
+        manhattan_only = astar(sx, sy, ex, ey, use_landmarks=False)
+
+        assert with_landmarks and manhattan_only
+        assert math.isclose(path_cost(with_landmarks, costs), path_cost(manhattan_only, costs), rel_tol=1e-9)
+
+
+@pytest.fixture
+def stairs_and_ramps(grid, clean_db):
+    """A few stair and ramp nodes scattered over the largest walkable region."""
+    cells = [pixel for sx, sy, ex, ey in reachable_pairs(6, seed=99) for pixel in ((sx, sy), (ex, ey))]
+    nodes_collection.insert_many(
+        [{"properties": {"id": f"stair_{i}", "type": "stairs"}, "geometry": {"type": "Point", "coordinates": list(c)}}
+         for i, c in enumerate(cells[:6])]
+        + [{"properties": {"id": f"ramp_{i}", "type": "ramp"}, "geometry": {"type": "Point", "coordinates": list(c)}}
+           for i, c in enumerate(cells[6:])]
+    )
+    invalidate_accessibility_overlay()
+    yield
+    invalidate_accessibility_overlay()
+
+
+@pytest.mark.parametrize("use_landmarks", [True, False])
+def test_accessibility_routes_cost_the_same_with_every_search(stairs_and_ramps, use_landmarks):
+    costs = build_cell_costs(accessibility_mode=True)
+    assert get_ramp_cells() and get_stair_blocked_cells()
+    for sx, sy, ex, ey in reachable_pairs(12, seed=131, accessibility_mode=True):
+        plain = astar(sx, sy, ex, ey, accessibility_mode=True, use_landmarks=False)
+        searched = (
+            astar(sx, sy, ex, ey, accessibility_mode=True, use_landmarks=use_landmarks),
+            bidirectional_astar(sx, sy, ex, ey, accessibility_mode=True, use_landmarks=use_landmarks),
+        )
+
+        assert plain and all(searched)
+        # Stair cells cost infinity, so a finite cost also proves they were avoided
+        assert math.isfinite(path_cost(plain, costs))
+        for path in searched:
+            assert math.isclose(path_cost(path, costs), path_cost(plain, costs), rel_tol=1e-9)
@@ -0,0 +1,39 @@
+import json
+import logging
+
+import pytest
+
+from app.services import pathfinding_stats
+from app.services.pathfinding_astar import astar
+from app.services.pathfinding_stats import log_search, set_debug
+from app.test.test_pathfinding import reachable_pairs
+
+
+@pytest.fixture
+def quiet_sampling(monkeypatch):
+    monkeypatch.setattr(pathfinding_stats, "PATHFINDING_LOG_SAMPLE_RATE", 0.0)
+    yield
+    set_debug(False)
+
+
+def test_searches_fill_the_per_request_counters(grid):
+    sx, sy, ex, ey = reachable_pairs(1, seed=32)[0]
+    stats = {}
+    path = astar(sx, sy, ex, ey, stats=stats)
+
+    assert stats["algorithm"] == "astar" and stats["found"] is True
+    assert stats["path_length"] == len(path)
+    assert stats["heap_pushes"] >= stats["expanded_nodes"] > 0
+    assert stats["search_ms"] >= 0
+
+
+def test_summaries_are_sampled_unless_debugging(quiet_sampling, caplog):
+    caplog.set_level(logging.INFO, logger="app.pathfinding")
+
+    log_search({"algorithm": "astar", "expanded_nodes": 3})
+    assert not caplog.records
+
+    set_debug(True)
+    log_search({"algorithm": "astar", "expanded_nodes": 3})
+    (record,) = caplog.records
+    assert json.loads(record.getMessage().split(" ", 1)[1]) == {"algorithm": "astar", "expanded_nodes": 3}
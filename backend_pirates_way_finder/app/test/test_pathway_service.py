@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import edges_collection, nodes_collection
+from app.services.pathway_service import (
+    add_pathway, delete_pathway, get_node_coordinates, update_edge_accessibility, update_edge_notes, update_pathway,
+)
+
+
+@pytest.fixture
+def nodes(clean_db):
+    nodes_collection.insert_many([
+        {"properties": {"id": node_id}, "geometry": {"type": "Point", "coordinates": coordinates}}
+        for node_id, coordinates in [("a", [0, 0]), ("b", [3, 4]), ("c", [6, 8])]
+    ])
+
+
+def edge(edge_id, start, end, **props):
+    return {"type": "Feature", "properties": {"id": edge_id, "from": start, "to": end, **props},
+            "geometry": {"type": "LineString", "coordinates": []}}
+
+
+def test_node_coordinates_are_read_in_one_query(nodes, monkeypatch):
+    queries = []
+    find = nodes_collection.find
+    monkeypatch.setattr(nodes_collection, "find", lambda *args, **kwargs: queries.append(args) or find(*args, **kwargs))
+
+    assert get_node_coordinates(["a", "b", "a"]) == {"a": [0, 0], "b": [3, 4]}
+    assert len(queries) == 1 and sorted(queries[0][0]["properties.id"]["$in"]) == ["a", "b"]
+
+    with pytest.raises(HTTPException) as missing:
+        get_node_coordinates(["a", "ghost"])
+    assert missing.value.status_code == 400 and "ghost" in missing.value.detail
+
+
+def test_add_pathway_computes_distance_and_validates_endpoints(nodes):
+    added = add_pathway(edge("ab", "a", "b"), "admin")
+    kept = add_pathway(edge("bc", "b", "c", distance=9), "admin")
+
+    assert added["properties"]["distance"] == 5 and kept["properties"]["distance"] == 9
+    assert isinstance(added["_id"], str) and added["_meta"]["created_by"] == "admin"
+    for bad in (edge("ax", "a", "ghost"), edge("a_", "a", None)):
+        with pytest.raises(HTTPException) as rejected:
+            add_pathway(bad, "admin")
+        assert rejected.value.status_code == 400
+    assert edges_collection.count_documents({}) == 2
+
+
+def test_edge_updates_return_the_updated_document(nodes):
+    add_pathway(edge("ab", "a", "b", type="walkway"), "admin")
+
+    updated = update_pathway("ab", {"properties": {"id": "renamed", "type": "corridor"}}, "editor")
+    assert updated["properties"]["id"] == "ab" and updated["properties"]["type"] == "corridor"
+    assert updated["_meta"]["updated_by"] == "editor" and isinstance(updated["_id"], str)
+    assert update_edge_accessibility("ab", False, "auditor")["properties"]["accessible"] is False
+    assert update_edge_notes("ab", "Narrow", "auditor")["properties"]["notes"] == "Narrow"
+
+    for update in (lambda: update_pathway("ghost", {"properties": {"type": "x"}}, "admin"),
+                   lambda: update_edge_accessibility("ghost", True, "admin"),
+                   lambda: update_edge_notes("ghost", "", "admin")):
+        with pytest.raises(HTTPException) as missing:
+            update()
+        assert missing.value.status_code == 404
+
+
+def test_delete_pathway_archives_once(nodes):
+    add_pathway(edge("ab", "a", "b"), "admin")
+
+    assert delete_pathway("ab", "admin") is True
+    assert delete_pathway("ab", "admin") is False
+    assert delete_pathway("ghost", "admin") is False
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.core.database import edges_collection, nodes_collection
+from app.core.security import get_current_admin
+from app.services.projections import NODE_VIEWS, project_document
+from app.services.search_service import search_locations
+
+client = TestClient(main.app)
+
+NODE = {
+    "type": "Feature",
+    "geometry": {"type": "Point", "coordinates": [1, 2]},
+    "properties": {"id": "lib", "name": "Library", "type": "poi", "category": "study", "building_id": "main",
+                   "floor": 1, "accessible": True, "tags": ["books"], "description": "Quiet rooms"},
+    "_meta": {"created_by": "admin@example.com"},
+}
+EDGE = {
+    "type": "Feature",
+    "geometry": {"type": "LineString", "coordinates": [[1, 2], [3, 4]]},
+    "properties": {"id": "e1", "from": "lib", "to": "cafe", "type": "walkway", "accessible": True, "distance": 12.5},
+    "_meta": {"created_by": "admin@example.com"},
+}
+
+
+@pytest.fixture
+def features(clean_db):
+    nodes_collection.insert_one(dict(NODE))
+    edges_collection.insert_one(dict(EDGE))
+
+
+@pytest.fixture
+def as_admin(features):
+    main.app.dependency_overrides[get_current_admin] = lambda: "admin@example.com"
+    yield
+    main.app.dependency_overrides.clear()
+
+
+def test_marker_view_keeps_only_map_fields(features):
+    (node,) = client.get("/map/nodes", params={"view": "marker"}).json()
+    (edge,) = client.get("/map/edges", params={"view": "marker"}).json()
+
+    assert set(node) == {"type", "geometry", "properties"}
+    assert "tags" not in node["properties"] and "description" not in node["properties"]
+    assert node["properties"]["name"] == "Library" and node["properties"]["accessible"] is True
+    assert edge["properties"] == {"id": "e1", "from": "lib", "to": "cafe", "type": "walkway", "accessible": True}
+
+
+def test_detail_view_drops_id_and_meta(features):
+    (node,) = client.get("/map/nodes").json()
+    (result,) = client.get("/search/", params={"query": "libr"}).json()["results"]
+
+    assert node == {key: value for key, value in NODE.items() if key != "_meta"}
+    assert result == node
+
+
+def test_public_routes_reject_admin_view(features):
+    assert client.get("/map/nodes", params={"view": "admin"}).status_code == 422
+    assert client.get("/search/", params={"query": "lib", "view": "admin"}).status_code == 422
+
+
+def test_admin_view_returns_whole_document_with_string_id(as_admin):
+    (node,) = client.get("/admin/nodes/all").json()
+    (edge,) = client.get("/admin/edges/all").json()
+
+    assert isinstance(node["_id"], str) and node["_meta"] == NODE["_meta"]
+    assert isinstance(edge["_id"], str) and edge["properties"]["distance"] == 12.5
+    assert "_meta" not in client.get("/admin/nodes/all", params={"view": "detail"}).json()[0]
+
+
+def test_fuzzy_search_applies_the_same_view(features):
+    marker = search_locations(query="libary", fuzzy=True, view="marker")["results"]
+    plain = search_locations(query="lib", view="marker")["results"]
+
+    assert marker == plain
+    assert project_document(dict(NODE), NODE_VIEWS["detail"]) == {k: v for k, v in NODE.items() if k != "_meta"}
@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+
+import main
+from app.services.rating_rollup_service import rebuild_rating_rollups, rating_rollups_collection
+from app.services.rating_summary_service import rebuild_rating_summaries, rating_summaries_collection
+
+client = TestClient(main.app)
+
+RATINGS = [
+    ("lib", "Library", "Main", "GOOD"),
+    ("lib", "Library", "Main", "BAD"),
+    ("lib", "Main Library", "Main", "NOT BAD"),
+    ("cafe", "Cafe", "Annex", "GOOD"),
+    ("gym", "Gym", None, "BAD"),
+]
+
+
+def rate(location_id, location_name, building_name, rating):
+    response = client.post("/ratings/", json={
+        "location_id": location_id, "location_name": location_name, "building_name": building_name, "rating": rating,
+    })
+    assert response.status_code == 201
+
+
+def summaries():
+    return {summary["location_id"]: summary for summary in client.get("/ratings/summary").json()["locations"]}
+
+
+def test_summaries_are_kept_current_by_each_rating(clean_db):
+    for rating in RATINGS:
+        rate(*rating)
+
+    lib = summaries()["lib"]
+    assert lib["counts"] == {"BAD": 1, "NOT BAD": 1, "GOOD": 1}
+    assert lib["rating_count"] == 3 and lib["average_score"] == 0.5
+    assert lib["location_name"] == "Main Library"
+    assert summaries()["gym"]["rolling_score"] == 0.0
+
+
+def test_rebuild_reproduces_the_incremental_summaries(clean_db):
+    for rating in RATINGS:
+        rate(*rating)
+    incremental = summaries()
+    rating_summaries_collection.insert_one({"_id": "deleted_place", "total": 4})
+
+    assert rebuild_rating_summaries() == 3
+    assert summaries() == incremental
+
+
+def rollups():
+    return {doc["_id"]: doc for doc in rating_rollups_collection.find()}
+
+
+def test_rollup_rebuild_reproduces_the_incremental_buckets(clean_db):
+    for rating in RATINGS:
+        rate(*rating)
+    incremental = rollups()
+    rating_rollups_collection.insert_one({"_id": "day|location|deleted_place|2020-01-01", "total": 1})
+
+    assert rebuild_rating_rollups() == len(incremental)
+    rebuilt = rollups()
+    assert rebuilt.keys() == incremental.keys()
+    for _id, doc in rebuilt.items():
+        assert doc["total"] == incremental[_id]["total"]
+        assert doc["score_sum"] == incremental[_id]["score_sum"]
+        assert {r: n for r, n in doc["counts"].items() if n} == incremental[_id]["counts"]
+
+
+def trends(**params):
+    return client.get("/ratings/trends", params={"scope": "location", "key": "lib", **params})
+
+
+def test_trend_bounds_are_validated_by_name(clean_db):
+    for field in ("start", "end"):
+        for granularity in ("hour", "day", "week"):
+            response = trends(granularity=granularity, **{field: "last tuesday"})
+            assert response.status_code == 422
+            assert field in response.json()["detail"]
+
+
+def test_trend_ranges_keep_the_bucket_containing_end(clean_db):
+    for bucket, rating in (("2026-10-04", "GOOD"), ("2026-10-05", "BAD"), ("2026-10-06", "GOOD")):
+        rating_rollups_collection.insert_one({
+            "_id": f"day|location|lib|{bucket}", "granularity": "day", "scope": "location", "key": "lib",
+            "bucket": bucket, "counts": {rating: 1}, "total": 1, "score_sum": 1.0 if rating == "GOOD" else 0.0,
+        })
+
+    def buckets(**params):
+        response = trends(granularity="day", **params)
+        assert response.status_code == 200
+        return [point["bucket"] for point in response.json()["series"]]
+
+    assert buckets(start="2026-10-04T18:00:00", end="2026-10-05T12:00:00") == ["2026-10-04", "2026-10-05"]
+    assert buckets(start="2026-10-05", end="2026-10-06") == ["2026-10-05"]
+    assert buckets(end="2026-10-05T23:00:00+02:00") == ["2026-10-04", "2026-10-05"]
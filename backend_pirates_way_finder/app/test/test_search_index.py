@@ -0,0 +1,97 @@
+from fastapi.testclient import TestClient
+
+import main
+from app.core.database import nodes_collection
+from app.services import search_index
+from app.services.search_index import (
+    SUGGEST_MAX_LIMIT, bounded_levenshtein, build_search_index, get_search_index, invalidate_search_index,
+    _rank_documents, tokenize,
+)
+
+client = TestClient(main.app)
+
+
+def poi(node_id, name, tags=(), category=None):
+    return {"properties": {"id": node_id, "name": name, "tags": list(tags), "category": category}}
+
+
+DOCS = [
+    poi("library", "University Library", tags=["books"]),
+    poi("lib_annex", "Library Annex"),
+    poi("registrar", "Registrar Office", category="office"),
+    poi("cafeteria", "Main Cafeteria", tags=["food"]),
+    poi("lecafe", "Le Cafe", tags=["coffee"]),
+    poi("chem_lab", "Chemistry Laboratory", category="laboratory"),
+]
+
+
+def ranked_ids(query, **filters):
+    index = build_search_index(DOCS)
+    return [DOCS[i]["properties"]["id"] for i in _rank_documents(index, tokenize(query), **filters)]
+
+
+def test_bounded_levenshtein_gives_up_past_the_bound():
+    assert bounded_levenshtein("registrar", "registar", 2) == 1
+    assert bounded_levenshtein("library", "laboratory", 2) == 3
+
+
+def test_typos_still_find_the_right_place():
+    assert ranked_ids("registar")[0] == "registrar"
+    assert ranked_ids("cafetria")[0] == "cafeteria"
+    assert ranked_ids("chemstry lab")[0] == "chem_lab"
+
+
+def test_documents_matching_more_query_tokens_rank_first():
+    assert ranked_ids("library annex")[0] == "lib_annex"
+
+
+def test_exact_names_outrank_tags_and_substrings():
+    assert ranked_ids("cafe")[0] == "lecafe"
+    assert ranked_ids("coffee") == ["lecafe"]
+
+
+def test_filters_apply_to_ranked_results():
+    assert ranked_ids("library", category="laboratory") == []
+    assert ranked_ids("lab", category="laboratory") == ["chem_lab"]
+
+
+def indexed_ids(index):
+    return {doc["properties"]["id"] for doc in index["docs"]}
+
+
+def wait_for_rebuild():
+    thread = search_index._rebuild_thread
+    if thread is not None:
+        thread.join(timeout=5)
+
+
+def test_stale_index_is_served_until_the_background_rebuild_swaps_it(clean_db):
+    nodes_collection.insert_one(poi("library", "University Library"))
+    invalidate_search_index()
+    wait_for_rebuild()
+    assert indexed_ids(get_search_index()) == {"library"}
+
+    nodes_collection.insert_one(poi("registrar", "Registrar Office"))
+    # Hold the build lock so the rebuild cannot finish while we look
+    with search_index._search_index_lock:
+        invalidate_search_index()
+        assert indexed_ids(get_search_index()) == {"library"}
+    wait_for_rebuild()
+    assert indexed_ids(get_search_index()) == {"library", "registrar"}
+
+
+def test_suggest_returns_capped_lightweight_rows(clean_db):
+    nodes_collection.insert_many([
+        {**poi(f"lib_{i}", f"Library Room {i}", category="room"), "geometry": {"coordinates": [i, i]}}
+        for i in range(SUGGEST_MAX_LIMIT + 5)
+    ])
+    invalidate_search_index()
+    wait_for_rebuild()
+
+    body = client.get("/search/suggest", params={"q": "libr", "limit": 3}).json()
+    assert body["count"] == 3
+    assert set(body["suggestions"][0]) == {"id", "name", "building", "category", "coordinates"}
+
+    body = client.get("/search/suggest", params={"q": "library ro", "limit": SUGGEST_MAX_LIMIT}).json()
+    assert body["count"] == SUGGEST_MAX_LIMIT
+    assert client.get("/search/suggest", params={"q": "lib", "limit": SUGGEST_MAX_LIMIT + 1}).status_code == 422
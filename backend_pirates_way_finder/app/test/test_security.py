@@ -0,0 +1,65 @@
+import types
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.security import clear_token_cache, create_access_token, decode_token
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    """Count full JWT verifications behind the cache."""
+    clear_token_cache()
+    calls = []
+    verify = security.verify_token
+    monkeypatch.setattr(security, "verify_token", lambda token: calls.append(token) or verify(token))
+    yield calls
+    clear_token_cache()
+
+
+def token_for(email, minutes=60):
+    return create_access_token({"sub": email}, timedelta(minutes=minutes))
+
+
+def test_repeated_tokens_are_verified_once(verifications):
+    token = token_for("admin@example.com")
+
+    assert decode_token(token)["sub"] == decode_token(token)["sub"] == "admin@example.com"
+    assert len(verifications) == 1
+
+
+def test_cached_tokens_expire_with_their_exp(verifications, monkeypatch):
+    token = token_for("admin@example.com", minutes=5)
+    decode_token(token)
+
+    later = security.time.time() + 6 * 60
+    monkeypatch.setattr(security, "time", types.SimpleNamespace(time=lambda: later))
+    decode_token(token)
+
+    assert len(verifications) == 2
+    assert not security._token_cache
+
+
+def test_least_recently_used_tokens_are_evicted(verifications, monkeypatch):
+    monkeypatch.setattr(security, "JWT_CACHE_SIZE", 2)
+    first, second, third = (token_for(f"admin{i}@example.com") for i in range(3))
+    for token in (first, second, first, third):
+        decode_token(token)
+    assert len(verifications) == 3
+
+    decode_token(first)
+    assert len(verifications) == 3
+    decode_token(second)
+    assert len(verifications) == 4
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(verifications):
+    token = token_for("admin@example.com") + "x"
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            decode_token(token)
+        assert error.value.status_code == 401
+    assert len(verifications) == 2
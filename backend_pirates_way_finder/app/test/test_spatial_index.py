@@ -0,0 +1,42 @@
+import math
+import random
+
+from app.core.database import nodes_collection
+from app.services.spatial_index import invalidate_node_buckets, nearest_node, pixel_to_cell, snap_to_walkable
+
+
+def test_taps_on_walls_snap_to_the_closest_walkable_cell(grid):
+    w, h = grid.w, grid.h
+    walkable = [(x, y) for y in range(h) for x in range(w) if grid.grid[y][x] == 0]
+    walls = [(x, y) for y in range(h) for x in range(w) if grid.grid[y][x] != 0]
+    rng = random.Random(28)
+
+    for x, y in rng.sample(walls, 20):
+        px, py = (x + 0.5) * grid.cell_size, (y + 0.5) * grid.cell_size
+        sx, sy = snap_to_walkable(px, py)
+
+        assert grid.grid[sy][sx] == 0
+        assert abs(sx - x) + abs(sy - y) == min(abs(wx - x) + abs(wy - y) for wx, wy in walkable)
+
+
+def test_walkable_taps_stay_put(grid):
+    y = next(y for y in range(grid.h) if 0 in grid.grid[y])
+    x = grid.grid[y].index(0)
+    px, py = (x + 0.5) * grid.cell_size, (y + 0.5) * grid.cell_size
+
+    assert snap_to_walkable(px, py) == pixel_to_cell(px, py) == (x, y)
+
+
+def test_nearest_node_matches_a_linear_scan(clean_db):
+    rng = random.Random(7)
+    coords = [(rng.uniform(0, 1000), rng.uniform(0, 800)) for _ in range(200)]
+    nodes_collection.insert_many([
+        {"properties": {"id": f"n{i}", "name": f"Node {i}"}, "geometry": {"type": "Point", "coordinates": [x, y]}}
+        for i, (x, y) in enumerate(coords)
+    ])
+    invalidate_node_buckets()
+
+    for _ in range(50):
+        px, py = rng.uniform(-100, 1100), rng.uniform(-100, 900)
+        expected = min(math.hypot(x - px, y - py) for x, y in coords)
+        assert nearest_node(px, py)["distance"] == round(expected, 2)
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+from pymongo.errors import AutoReconnect
+
+from app.core.write_behind import BufferedWriter, failed_documents
+
+
+class RecordingCollection:
+    """Wraps a collection, remembering which thread wrote each document directly."""
+
+    def __init__(self, collection, fail_inserts=0):
+        self.collection = collection
+        self.fail_inserts = fail_inserts
+        self.insert_one_threads = []
+
+    def insert_one(self, document):
+        self.insert_one_threads.append(threading.get_ident())
+        return self.collection.insert_one(document)
+
+    def insert_many(self, documents, ordered=True):
+        if self.fail_inserts:
+            self.fail_inserts -= 1
+            raise AutoReconnect("database unavailable")
+        return self.collection.insert_many(documents, ordered=ordered)
+
+
+def writer_for(collection, **kwargs):
+    return BufferedWriter(collection, "test", **{"flush_interval_ms": 60_000, "batch_size": 100, **kwargs})
+
+
+def test_documents_wait_in_the_buffer_until_flushed(clean_db):
+    writer = writer_for(clean_db["buffered"])
+    for i in range(3):
+        writer.add({"n": i})
+
+    assert writer.depth() == 3 and clean_db["buffered"].count_documents({}) == 0
+    writer.flush()
+    assert writer.depth() == 0
+    assert sorted(doc["n"] for doc in clean_db["buffered"].find()) == [0, 1, 2]
+    writer.stop()
+
+
+def test_a_full_batch_is_flushed_in_the_background(clean_db):
+    writer = writer_for(clean_db["buffered"], batch_size=2)
+    writer.add({"n": 1})
+    writer.add({"n": 2})
+
+    deadline = time.monotonic() + 5
+    while clean_db["buffered"].count_documents({}) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert clean_db["buffered"].count_documents({}) == 2
+    writer.stop()
+
+
+def test_failed_flushes_keep_the_batch_for_the_next_one(clean_db):
+    collection = RecordingCollection(clean_db["buffered"], fail_inserts=1)
+    writer = writer_for(collection)
+    writer.add({"n": 1})
+
+    writer.flush()
+    assert writer.depth() == 1
+    writer.flush()
+    assert writer.depth() == 0 and clean_db["buffered"].count_documents({}) == 1
+    writer.stop()
+
+
+def test_overflow_is_written_directly(clean_db):
+    collection = RecordingCollection(clean_db["buffered"])
+    writer = writer_for(collection, max_buffer=2)
+    overflows = failed_documents.value(buffer="test", reason="overflow")
+    for i in range(3):
+        writer.add({"n": i})
+
+    assert writer.depth() == 2
+    assert [doc["n"] for doc in clean_db["buffered"].find()] == [2]
+    assert failed_documents.value(buffer="test", reason="overflow") == overflows + 1
+    writer.stop()
+
+
+def test_async_overflow_and_shutdown_writes_stay_off_the_event_loop(clean_db):
+    collection = RecordingCollection(clean_db["buffered"])
+    writer = writer_for(collection, max_buffer=1)
+
+    async def add_all():
+        await writer.add_async({"n": 0})
+        await writer.add_async({"n": 1})  # buffer full
+        writer.stop()
+        await writer.add_async({"n": 2})  # after shutdown
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(add_all())
+
+    assert clean_db["buffered"].count_documents({}) == 3
+    assert len(collection.insert_one_threads) == 2
+    assert loop_thread not in collection.insert_one_threads
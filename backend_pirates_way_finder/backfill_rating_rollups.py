@@ -0,0 +1,12 @@
+"""
+One-off job: back-fill the hourly/daily rating rollups from the raw ratings.
+
+Safe to re-run (buckets are recomputed and replaced), e.g. after deleting ratings
+directly in MongoDB. Stop the API (or rating submissions) first: ratings submitted
+during the rebuild are not counted in the rollups.
+"""
+from app.services.rating_rollup_service import rebuild_rating_rollups
+
+if __name__ == "__main__":
+    count = rebuild_rating_rollups()
+    print(f"Done: {count} rollup buckets.")
@@ -0,0 +1,310 @@
+"""
+Headless pathfinding benchmark over app/static/grid.json
+
+Runs every routing engine in both modes over two query sets:
+  - random:    seeded pairs of cells from the largest walkable region
+  - landmarks: every ordered pair of fixed campus landmark positions
+
+and reports p50/p95/p99 latency, expanded nodes, peak memory per query and whether
+each engine's path cost agrees with the reference engine (A* with landmarks).
+Results are written as JSON so runs can be compared between releases.
+
+Accessibility mode reads ramp/stair nodes from MongoDB, so that mode needs the
+database configured in .env (use --modes normal for a grid-only run).
+
+Usage:
+    python benchmark_pathfinding.py
+    python benchmark_pathfinding.py --queries 100 --repeat 5 --output bench.json
+    python benchmark_pathfinding.py --engines astar bidirectional --modes normal
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.core.grid_loader import grid_instance
+from app.services import pathfinding
+from app.services.pathfinding_astar import astar, bidirectional_astar
+from app.services.grid_components import get_components
+from app.services.landmarks import get_landmarks, build_cell_costs
+from app.services.spatial_index import snap_to_walkable, cell_to_pixel
+
+# Engine whose path cost every other engine is compared against
+REFERENCE_ENGINE = "astar"
+
+# Paths whose costs differ by less than this (relative) count as agreeing
+COST_TOLERANCE = 1e-6
+
+# Fixed campus positions (pixel coordinates), taken from the endpoint test and
+# animation defaults so the numbers line up with what those scripts show
+CAMPUS_LANDMARKS = {
+    "main_entrance": (504, 2302),
+    "south_gate": (671, 2453),
+    "north_wing": (691, 692),
+    "north_lab": (700, 500),
+}
+
+
+def _run_astar(sx, sy, ex, ey, accessibility_mode, stats):
+    return astar(sx, sy, ex, ey, accessibility_mode, stats=stats)
+
+
+def _run_astar_manhattan(sx, sy, ex, ey, accessibility_mode, stats):
+    return astar(sx, sy, ex, ey, accessibility_mode, use_landmarks=False, stats=stats)
+
+
+def _run_bidirectional(sx, sy, ex, ey, accessibility_mode, stats):
+    return bidirectional_astar(sx, sy, ex, ey, accessibility_mode, stats=stats)
+
+
+def _run_dijkstra(sx, sy, ex, ey, accessibility_mode, stats):
+    # The legacy engine keeps no counters; every get_neighbors call is one expansion
+    expanded = [0]
+    original = pathfinding.get_neighbors
+
+    def counting_neighbors(x, y):
+        expanded[0] += 1
+        return original(x, y)
+
+    pathfinding.get_neighbors = counting_neighbors
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = pathfinding.dijkstra(sx, sy, ex, ey, accessibility_mode)
+    finally:
+        pathfinding.get_neighbors = original
+    stats["expanded_nodes"] = expanded[0]
+    return path
+
+
+ENGINES = {
+    "astar": _run_astar,
+    "astar_manhattan": _run_astar_manhattan,
+    "bidirectional": _run_bidirectional,
+    "dijkstra": _run_dijkstra,
+}
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values, digits=3):
+    if not values:
+        return None
+    return {
+        "p50": round(percentile(values, 50), digits),
+        "p95": round(percentile(values, 95), digits),
+        "p99": round(percentile(values, 99), digits),
+        "mean": round(statistics.fmean(values), digits),
+        "max": round(max(values), digits),
+    }
+
+
+def random_queries(count, seed, accessibility_mode):
+    """Seeded pixel-coordinate pairs inside the largest walkable region (all reachable)."""
+    components = get_components(accessibility_mode)
+    largest = max(range(len(components["sizes"])), key=components["sizes"].__getitem__)
+    cells = components["members"][components["offsets"][largest]:components["offsets"][largest + 1]]
+
+    rng = random.Random(seed)
+    w = grid_instance.w
+    queries = []
+    for i in range(count):
+        a, b = rng.sample(range(len(cells)), 2)
+        start, end = cell_to_pixel(cells[a] % w, cells[a] // w), cell_to_pixel(cells[b] % w, cells[b] // w)
+        queries.append({"name": f"random_{i}", "start": (int(start["x"]), int(start["y"])),
+                        "end": (int(end["x"]), int(end["y"]))})
+    return queries
+
+
+def landmark_queries(accessibility_mode):
+    """Every ordered pair of campus landmarks, snapped onto the walkable grid like /path/shortest does."""
+    snapped = {}
+    for name, (x, y) in CAMPUS_LANDMARKS.items():
+        cell = snap_to_walkable(x, y, accessibility_mode)
+        if cell:
+            px = cell_to_pixel(*cell)
+            snapped[name] = (int(px["x"]), int(px["y"]))
+
+    return [
+        {"name": f"{a}->{b}", "start": snapped[a], "end": snapped[b]}
+        for a, b in itertools.permutations(snapped, 2)
+    ]
+
+
+def path_cost(path, costs):
+    """Cost of a pixel path under the grid cost model (None if it crosses a blocked cell)."""
+    w, cell = grid_instance.w, grid_instance.cell_size
+    total = 0.0
+    for point in path[1:]:
+        step = costs[int(point["y"] // cell) * w + int(point["x"] // cell)]
+        if step == math.inf:
+            return None
+        total += step
+    return total
+
+
+def run_query(engine, query, accessibility_mode, repeat, measure_memory):
+    """Time one engine on one query; returns latencies (ms), expanded nodes, peak KiB and the path."""
+    (sx, sy), (ex, ey) = query["start"], query["end"]
+    latencies = []
+    for _ in range(repeat):
+        stats = {}
+        started = time.perf_counter()
+        path = engine(sx, sy, ex, ey, accessibility_mode, stats)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    peak_kib = None
+    if measure_memory:
+        # Separate run: tracing slows allocation enough to distort the timings above
+        tracemalloc.start()
+        engine(sx, sy, ex, ey, accessibility_mode, {})
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return latencies, stats.get("expanded_nodes"), peak_kib, path
+
+
+def benchmark_set(queries, engines, accessibility_mode, repeat, measure_memory):
+    costs = build_cell_costs(accessibility_mode)
+    reference_costs = {}
+    per_engine = {name: {"latencies": [], "expanded": [], "memory": [], "found": 0,
+                         "cost_mismatches": [], "max_relative_error": 0.0, "invalid_paths": 0}
+                  for name in engines}
+
+    # Reference engine first so the others can be compared as they run
+    for name in sorted(engines, key=lambda n: n != REFERENCE_ENGINE):
+        acc = per_engine[name]
+        for query in queries:
+            latencies, expanded, peak_kib, path = run_query(ENGINES[name], query, accessibility_mode,
+                                                            repeat, measure_memory)
+            acc["latencies"].extend(latencies)
+            if expanded is not None:
+                acc["expanded"].append(expanded)
+            if peak_kib is not None:
+                acc["memory"].append(peak_kib)
+            if not path:
+                continue
+
+            acc["found"] += 1
+            cost = path_cost(path, costs)
+            if cost is None:
+                acc["invalid_paths"] += 1
+                continue
+            if name == REFERENCE_ENGINE:
+                reference_costs[query["name"]] = cost
+                continue
+
+            reference = reference_costs.get(query["name"])
+            if reference is not None:
+                error = abs(cost - reference) / max(reference, 1e-9)
+                acc["max_relative_error"] = max(acc["max_relative_error"], error)
+                if error > COST_TOLERANCE:
+                    acc["cost_mismatches"].append({"query": query["name"], "cost": round(cost, 3),
+                                                   "reference_cost": round(reference, 3)})
+
+    results = {}
+    for name, acc in per_engine.items():
+        results[name] = {
+            "queries": len(queries),
+            "found": acc["found"],
+            "latency_ms": summarize(acc["latencies"]),
+            "expanded_nodes": summarize(acc["expanded"], 1),
+            "peak_memory_kib": summarize(acc["memory"], 1),
+            "cost_agreement": None if name == REFERENCE_ENGINE or REFERENCE_ENGINE not in engines else {
+                "reference": REFERENCE_ENGINE,
+                "mismatches": len(acc["cost_mismatches"]),
+                "max_relative_error": round(acc["max_relative_error"], 6),
+                "invalid_paths": acc["invalid_paths"],
+                "examples": acc["cost_mismatches"][:5],
+            },
+        }
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pathfinding engines over grid.json")
+    parser.add_argument("--grid", default="app/static/grid.json")
+    parser.add_argument("--queries", type=int, default=25, help="Number of random queries per mode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query and engine")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument("--modes", nargs="+", choices=["normal", "accessibility"], default=["normal", "accessibility"])
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    print("[LOADING] Grid data...")
+    grid_instance.load(args.grid)
+    print(f"[OK] Grid loaded: {grid_instance.w}x{grid_instance.h} cells")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "grid": {"path": args.grid, "width": grid_instance.w, "height": grid_instance.h,
+                     "cell_size": grid_instance.cell_size},
+            "seed": args.seed,
+            "random_queries": args.queries,
+            "repeat": args.repeat,
+            "engines": args.engines,
+        },
+        "results": {},
+    }
+
+    for mode in args.modes:
+        accessibility_mode = mode == "accessibility"
+        # Build the cached lookups up front so no engine pays for them inside a timing
+        print(f"[WARMUP] Building caches ({mode})...")
+        get_components(accessibility_mode)
+        get_landmarks(accessibility_mode)
+
+        query_sets = {
+            "random": random_queries(args.queries, args.seed, accessibility_mode),
+            "landmarks": landmark_queries(accessibility_mode),
+        }
+        report["results"][mode] = {}
+        for set_name, queries in query_sets.items():
+            print(f"[RUNNING] {mode} / {set_name}: {len(queries)} queries x {len(args.engines)} engines")
+            results = benchmark_set(queries, args.engines, accessibility_mode, args.repeat, not args.no_memory)
+            report["results"][mode][set_name] = results
+            for name, result in results.items():
+                latency = result["latency_ms"] or {}
+                print(f"   {name:<16} p50 {latency.get('p50')} ms  p95 {latency.get('p95')} ms  "
+                      f"p99 {latency.get('p99')} ms  found {result['found']}/{result['queries']}")
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report["meta"]["max_rss_kib"] = max_rss // 1024 if platform.system() == "Darwin" else max_rss
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
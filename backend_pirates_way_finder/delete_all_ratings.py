@@ -2,6 +2,8 @@
 Quick script to delete ALL ratings from MongoDB
 """
 from app.core.database import db
+from app.services.rating_summary_service import rebuild_rating_summaries
+from app.services.rating_rollup_service import rebuild_rating_rollups
 
 # Get ratings collection
 ratings_collection = db["ratings"]
@@ -17,6 +19,9 @@ else:
     result = ratings_collection.delete_many({})
     print(f"\n✅ Successfully deleted {result.deleted_count} ratings!")
     
+    rebuild_rating_summaries()
+    rebuild_rating_rollups()
+    
     # Verify deletion
     count_after = ratings_collection.count_documents({})
     print(f"Remaining ratings: {count_after}")
@@ -0,0 +1,113 @@
+"""
+Bulk GeoJSON import/export for the nodes and edges collections
+
+    python geojson_tool.py import map.geojson            # upsert nodes (Points) and edges (LineStrings)
+    python geojson_tool.py import map.geojson --dry-run  # validate only
+    python geojson_tool.py export nodes nodes.geojson
+    python geojson_tool.py export edges - > edges.geojson
+    python geojson_tool.py split-stored                  # migrate FeatureCollections stored whole
+
+Input may be a FeatureCollection or newline-delimited features; it is read
+incrementally and written in ordered bulk_write chunks (--chunk-size).
+"""
+
+import argparse
+import json
+import sys
+
+from app.services.geojson_io import (
+    GEOJSON_IMPORT_CHUNK_SIZE,
+    describe_error,
+    export_feature_collection,
+    import_features,
+    iter_features,
+    split_stored_feature_collections,
+    validate_feature,
+)
+
+
+def print_progress(report):
+    print(f"   ... {report['processed']} processed, "
+          f"nodes +{report['nodes']['inserted']}/~{report['nodes']['updated']}, "
+          f"edges +{report['edges']['inserted']}/~{report['edges']['updated']}, "
+          f"{report['invalid']} invalid", file=sys.stderr)
+
+
+def print_errors(report):
+    for error in report["errors"]:
+        print(f"   ❌ {error}", file=sys.stderr)
+
+
+def run_import(args):
+    with open(args.path, encoding="utf-8") as f:
+        features = iter_features(f)
+        if args.dry_run:
+            counts = {"nodes": 0, "edges": 0, "invalid": 0}
+            for index, feature in enumerate(features):
+                try:
+                    counts[validate_feature(feature)[0]] += 1
+                except ValueError as e:
+                    counts["invalid"] += 1
+                    print(f"   ❌ feature {index}: {describe_error(e)}", file=sys.stderr)
+            print(f"Dry run: {counts['nodes']} nodes, {counts['edges']} edges valid, {counts['invalid']} invalid")
+            return 1 if counts["invalid"] else 0
+
+        print(f"📥 Importing {args.path} (chunks of {args.chunk_size})...", file=sys.stderr)
+        report = import_features(features, imported_by=args.imported_by, chunk_size=args.chunk_size,
+                                 progress=print_progress)
+
+    print_errors(report)
+    print(json.dumps({key: value for key, value in report.items() if key != "errors"}, indent=2))
+    return 1 if report["aborted"] else 0
+
+
+def run_export(args):
+    out = sys.stdout if args.path == "-" else open(args.path, "w", encoding="utf-8")
+    try:
+        for chunk in export_feature_collection(args.kind, args.include_archived):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+            print(f"✅ Exported {args.kind} to {args.path}", file=sys.stderr)
+    return 0
+
+
+def run_split_stored(args):
+    reports = split_stored_feature_collections()
+    if not reports:
+        print("No stored FeatureCollections found.")
+    for name, report in reports.items():
+        print_errors(report)
+        status = "kept, fix the invalid features and run again" if report["kept"] else "split and removed"
+        print(f"{name}: {report['processed']} features, {report['invalid']} invalid, "
+              f"aborted={report['aborted']} ({status})")
+    return 1 if any(report["kept"] for report in reports.values()) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk GeoJSON import/export for nodes and edges")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Validate and upsert features from a GeoJSON file")
+    importer.add_argument("path")
+    importer.add_argument("--chunk-size", type=int, default=GEOJSON_IMPORT_CHUNK_SIZE)
+    importer.add_argument("--imported-by", default="geojson_tool")
+    importer.add_argument("--dry-run", action="store_true", help="Validate without writing")
+    importer.set_defaults(run=run_import)
+
+    exporter = commands.add_parser("export", help="Write nodes or edges as a FeatureCollection")
+    exporter.add_argument("kind", choices=["nodes", "edges"])
+    exporter.add_argument("path", help="Output file, or - for stdout")
+    exporter.add_argument("--include-archived", action="store_true")
+    exporter.set_defaults(run=run_export)
+
+    splitter = commands.add_parser("split-stored", help="Split FeatureCollection documents stored in the collections")
+    splitter.set_defaults(run=run_split_stored)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+
+if __name__ == "__main__":
+    main()
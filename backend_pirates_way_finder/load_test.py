@@ -0,0 +1,337 @@
+"""
+Load test for the FastAPI app against a local Mongo stand-in
+
+Starts main.app under uvicorn on a local port, backed by mongomock (default) or a
+local mongod, seeds nodes/edges from a fixture GeoJSON FeatureCollection, then drives
+concurrent clients over /path/shortest, /search, /map/nodes and /ratings and reports
+latency percentiles, throughput and error rates per route.
+
+Without --fixture, a deterministic fixture is generated from walkable grid cells
+(--write-fixture saves it so later runs can reuse exactly the same data).
+
+Needs the dev requirements (pip install -r requirements-dev.txt) for mongomock.
+
+Run from backend_pirates_way_finder/:
+    python load_test.py
+    python load_test.py --concurrency 32 --duration 60 --mix path=2,search=5,nodes=1,ratings=2
+    python load_test.py --mongo-uri mongodb://localhost:27017 --output load.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+from urllib.parse import urlencode
+
+ROUTES = ("path", "search", "nodes", "ratings")
+DEFAULT_MIX = "path=3,search=4,nodes=1,ratings=2"
+
+# Category/type mix for generated fixture nodes (types must stay valid NodeProperties)
+FIXTURE_CATEGORIES = ["office", "classroom", "laboratory", "amenity"]
+FIXTURE_BUILDINGS = ["sotero", "jpl", "pe", "bag", "library"]
+FIXTURE_WORDS = ["faculty", "registrar", "computer", "science", "cafeteria", "clinic",
+                 "guidance", "chemistry", "lecture", "accounting", "records", "lounge"]
+
+
+def configure_database(mongo_uri, db_name):
+    """Point app.core.database at the stand-in. Must run before anything imports the app."""
+    if mongo_uri:
+        os.environ["MONGODB_DBNAME"] = db_name
+        os.environ["MONGODB_URI"] = mongo_uri
+    else:
+        from app.core.in_memory_database import use_in_memory_database
+        use_in_memory_database(db_name)
+
+
+def generate_fixture(count, seed):
+    """Deterministic FeatureCollection of nodes on walkable cells, plus a few ramps/stairs."""
+    from app.core.grid_loader import grid_instance
+
+    grid_instance.load("app/static/grid.json")
+    cell = grid_instance.cell_size
+    walkable = [(x, y) for y in range(grid_instance.h) for x in range(grid_instance.w)
+                if grid_instance.grid[y][x] == 0]
+
+    rng = random.Random(seed)
+    features = []
+    for i, (x, y) in enumerate(rng.sample(walkable, count)):
+        building = rng.choice(FIXTURE_BUILDINGS)
+        if i % 25 == 0:
+            node_type, name, category = "ramp_entry", f"{building.upper()} Ramp {i}", None
+        elif i % 25 == 1:
+            node_type, name, category = "stairs_entry", f"{building.upper()} Stairs {i}", None
+        else:
+            words = rng.sample(FIXTURE_WORDS, 2)
+            node_type, name, category = "room", f"{building.upper()} {words[0].title()} {words[1].title()} {i}", \
+                rng.choice(FIXTURE_CATEGORIES)
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x * cell + cell / 2, y * cell + cell / 2]},
+            "properties": {
+                "id": f"{building}_{node_type}_{i}",
+                "name": name,
+                "type": node_type,
+                "category": category,
+                "accessible": node_type == "ramp_entry",
+                "tags": name.lower().split()[1:3],
+                "building_id": building,
+                "building_name": building.upper(),
+            },
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def seed_database(fixture):
+    """Replace nodes/edges with the fixture features (Points -> nodes, LineStrings -> edges)."""
+    from app.core.database import db, nodes_collection, edges_collection
+
+    nodes = [f for f in fixture["features"] if f.get("geometry", {}).get("type") == "Point"]
+    edges = [f for f in fixture["features"] if f.get("geometry", {}).get("type") == "LineString"]
+    for name in ("ratings", "rating_summaries", "rating_rollups", "notifications", "audit_logs"):
+        db[name].delete_many({})
+    nodes_collection.delete_many({})
+    edges_collection.delete_many({})
+    if nodes:
+        nodes_collection.insert_many([dict(f) for f in nodes])
+    if edges:
+        edges_collection.insert_many([dict(f) for f in edges])
+    return nodes, edges
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    """Run main.app under uvicorn in a background thread and wait for startup hooks to finish."""
+    import uvicorn
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           timeout_keep_alive=60))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Server failed to start")
+        time.sleep(0.1)
+    return server, thread
+
+
+class Workload:
+    """Builds randomized requests per route from the seeded data."""
+
+    def __init__(self, nodes):
+        from app.services.grid_components import get_components
+        from app.core.grid_loader import grid_instance
+
+        self.nodes = nodes
+        self.names = [n["properties"]["name"] for n in nodes if n["properties"].get("name")]
+
+        # Route endpoints come from the largest walkable region so every path is reachable
+        components = get_components()
+        largest = max(range(len(components["sizes"])), key=components["sizes"].__getitem__)
+        self.cells = components["members"][components["offsets"][largest]:components["offsets"][largest + 1]]
+        self.w, self.cell = grid_instance.w, grid_instance.cell_size
+
+    def _pixel(self, idx):
+        return int((idx % self.w) * self.cell + self.cell / 2), int((idx // self.w) * self.cell + self.cell / 2)
+
+    def request(self, route, rng):
+        """(method, url, body) for one request on a route."""
+        if route == "path":
+            (sx, sy), (ex, ey) = self._pixel(rng.choice(self.cells)), self._pixel(rng.choice(self.cells))
+            body = {"start_x": sx, "start_y": sy, "end_x": ex, "end_y": ey,
+                    "accessibility_mode": rng.random() < 0.2}
+            return "POST", "/path/shortest", body
+        if route == "search":
+            word = rng.choice(rng.choice(self.names).split()) if self.names else "lab"
+            # Mostly prefixes, as typed into the search box
+            query = word[:rng.randint(2, len(word))] if len(word) > 2 else word
+            return "GET", "/search/?" + urlencode({"query": query}), None
+        if route == "nodes":
+            return "GET", "/map/nodes", None
+        if rng.random() < 0.5 and self.nodes:
+            node = rng.choice(self.nodes)["properties"]
+            body = {"location_id": node["id"], "location_name": node.get("name") or node["id"],
+                    "building_name": node.get("building_name"), "rating": rng.choice(["BAD", "NOT BAD", "GOOD"])}
+            return "POST", "/ratings/", body
+        return "GET", "/ratings/", None
+
+
+def client_loop(port, workload, mix, deadline, request_budget, results, lock, seed):
+    """One client: keep-alive connection issuing weighted random requests until done."""
+    rng = random.Random(seed)
+    routes, weights = zip(*mix.items())
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    while time.monotonic() < deadline:
+        with lock:
+            if request_budget[0] <= 0:
+                break
+            request_budget[0] -= 1
+
+        route = rng.choices(routes, weights)[0]
+        method, url, body = workload.request(route, rng)
+        payload = json.dumps(body) if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+
+        started = time.perf_counter()
+        try:
+            conn.request(method, url, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = 200 <= response.status < 300
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            ok, status = False, type(e).__name__
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with lock:
+            entry = results[route]
+            entry["latencies"].append(elapsed_ms)
+            if not ok:
+                entry["errors"] += 1
+                entry["statuses"][str(status)] = entry["statuses"].get(str(status), 0) + 1
+
+    conn.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(results, elapsed):
+    summary = {}
+    for route, entry in results.items():
+        latencies = entry["latencies"]
+        if not latencies:
+            continue
+        summary[route] = {
+            "requests": len(latencies),
+            "errors": entry["errors"],
+            "error_rate": round(entry["errors"] / len(latencies), 4),
+            "error_statuses": entry["statuses"],
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(statistics.fmean(latencies), 2),
+                "max": round(max(latencies), 2),
+            },
+        }
+    return summary
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        route = route.strip()
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route '{route}' (choose from {', '.join(ROUTES)})")
+        mix[route] = float(weight or 1)
+    return {route: weight for route, weight in mix.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API against a local Mongo stand-in")
+    parser.add_argument("--mongo-uri", default=None, help="Local mongod URI (default: in-process mongomock)")
+    parser.add_argument("--db-name", default="pirates_loadtest", help="Database to seed (its collections are replaced)")
+    parser.add_argument("--fixture", help="GeoJSON FeatureCollection to seed nodes (Points) and edges (LineStrings)")
+    parser.add_argument("--fixture-nodes", type=int, default=300, help="Nodes in the generated fixture")
+    parser.add_argument("--write-fixture", help="Save the generated fixture to this path")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests in total")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Route weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if args.mongo_uri and args.db_name == os.getenv("MONGODB_DBNAME"):
+        parser.error("--db-name must not be the application's database; its collections get replaced")
+
+    configure_database(args.mongo_uri, args.db_name)
+
+    if args.fixture:
+        with open(args.fixture) as f:
+            fixture = json.load(f)
+    else:
+        fixture = generate_fixture(args.fixture_nodes, args.seed)
+        if args.write_fixture:
+            with open(args.write_fixture, "w") as f:
+                json.dump(fixture, f)
+            print(f"[FIXTURE] Wrote {len(fixture['features'])} features to {args.write_fixture}")
+
+    nodes, edges = seed_database(fixture)
+    print(f"[SEED] {len(nodes)} nodes, {len(edges)} edges into "
+          f"{'mongomock' if not args.mongo_uri else args.mongo_uri}/{args.db_name}")
+
+    port = free_port()
+    print(f"[SERVER] Starting app on 127.0.0.1:{port}...")
+    server, thread = start_server(port)
+
+    workload = Workload(nodes)
+    results = {route: {"latencies": [], "errors": 0, "statuses": {}} for route in args.mix}
+    lock = threading.Lock()
+    budget = [args.requests if args.requests is not None else math.inf]
+
+    print(f"[RUNNING] {args.concurrency} clients for up to {args.duration}s, mix {args.mix}")
+    started = time.monotonic()
+    deadline = started + args.duration
+    clients = [
+        threading.Thread(target=client_loop,
+                         args=(port, workload, args.mix, deadline, budget, results, lock, args.seed + i))
+        for i in range(args.concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.monotonic() - started
+
+    server.should_exit = True
+    thread.join(timeout=10)
+
+    report = {
+        "meta": {
+            "store": args.mongo_uri or "mongomock",
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "mix": args.mix,
+            "seed": args.seed,
+            "fixture_nodes": len(nodes),
+            "fixture_edges": len(edges),
+        },
+        "routes": summarize(results, elapsed),
+    }
+
+    print(f"\n{'route':<10}{'reqs':>8}{'err%':>8}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for route, s in report["routes"].items():
+        lat = s["latency_ms"]
+        print(f"{route:<10}{s['requests']:>8}{s['error_rate'] * 100:>7.1f}%{s['throughput_rps']:>9}"
+              f"{lat['p50']:>10}{lat['p95']:>10}{lat['p99']:>10}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[DONE] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
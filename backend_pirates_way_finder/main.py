@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import admin_edge_router, admin_node_router, search_router
@@ -5,8 +6,20 @@ from app.routers import building_router
 from app.routers import pathfinding_router
 from app.routers import auth_router, map_data_router
 from app.routers import rating_router, audit_log_router, notification_router
+from app.routers import metrics_router, admin_geojson_router
 from app.core.grid_loader import grid_instance
+from app.core.logging_config import configure_logging
 from app.routers.path_router import router as path_router
+from app.services.search_index import refresh_search_index_in_background
+from app.services.spatial_index import get_nearest_walkable_map
+from app.services.route_service import warm_route_caches
+from app.services.path_executor import start_executor, shutdown_executor
+from app.core.async_database import close_async_client
+from app.core.indexes import ensure_indexes_in_background
+from app.core.write_behind import stop_all as stop_write_behind
+from app.core.password_hashing import shutdown_password_executor
+
+configure_logging()
 
 app = FastAPI()
 
@@ -17,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods (GET, POST, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor on list endpoints
 )
 
 app.include_router(search_router.router)
@@ -26,10 +40,12 @@ app.include_router(auth_router.router, prefix="/auth")
 app.include_router(map_data_router.router, prefix="/map", tags=["Map Data"])
 app.include_router(admin_node_router.router, prefix="/admin/nodes", tags=["Admin Nodes"])
 app.include_router(admin_edge_router.router, prefix="/admin/edges", tags=["Admin Edges"])
+app.include_router(admin_geojson_router.router, prefix="/admin/geojson", tags=["Admin GeoJSON"])
 app.include_router(rating_router.router, prefix="/ratings", tags=["Ratings"])
 app.include_router(audit_log_router.router, prefix="/admin/audit-logs", tags=["Audit Logs"])
 app.include_router(notification_router.router, prefix="/admin/notifications", tags=["Notifications"])
 app.include_router(path_router)
+app.include_router(metrics_router.router)
 
 @app.get("/")
 def root():
@@ -42,9 +58,56 @@ def load_grid():
         grid_instance.load("app/static/grid.json")
         print(f"✅ Grid loaded: {grid_instance.w}x{grid_instance.h} cells")
         print(f"   Cell size: {grid_instance.cell_size}px")
+        # /path/snap always runs in this process
+        get_nearest_walkable_map()
     except Exception as e:
         print(f"❌ ERROR loading grid: {e}")
         print("⚠️  Pathfinding will NOT work without grid!")
+        return
+    # Route searches run in worker processes sharing the grid read-only; each worker
+    # builds its own reachability labels and ALT landmarks
+    if not start_executor():
+        # No pool: routes run here, so precompute them for normal mode. Accessibility-mode
+        # variants need stair nodes from MongoDB and build on first use
+        warm_route_caches()
+
+@app.on_event("shutdown")
+def stop_pathfinding_workers():
+    shutdown_executor()
+
+@app.on_event("shutdown")
+def stop_password_hashing():
+    shutdown_password_executor()
+
+@app.on_event("shutdown")
+def flush_buffered_writes():
+    # Audit logs and notifications still waiting in write-behind buffers
+    stop_write_behind()
+
+@app.on_event("shutdown")
+async def close_async_mongo():
+    await close_async_client()
+
+@app.on_event("startup")
+def create_indexes():
+    # Index creation needs MongoDB round trips; don't hold up startup for it
+    ensure_indexes_in_background()
+
+@app.on_event("startup")
+async def start_unread_count_reconciler():
+    # Keeps the cached unread-notification count in line with MongoDB
+    app.state.unread_reconciler = asyncio.create_task(notification_router.run_unread_reconciler())
+
+@app.on_event("shutdown")
+async def stop_unread_count_reconciler():
+    app.state.unread_reconciler.cancel()
+
+@app.on_event("startup")
+def warm_search_index():
+    # Build the fuzzy search index up front (without holding up startup on the Mongo
+    # scan) so the first keystroke doesn't pay for it; a failed build is logged and
+    # retried on first search
+    refresh_search_index_in_background()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,12 @@
+"""
+Rebuild the materialized per-location rating summaries from the raw ratings.
+
+Run once after deploying rating summaries (backfill), and after deleting ratings
+directly in MongoDB (e.g. with remove_ratings.py). Stop the API (or rating submissions)
+first: ratings submitted during the rebuild are not counted in the summaries.
+"""
+from app.services.rating_summary_service import rebuild_rating_summaries
+
+if __name__ == "__main__":
+    count = rebuild_rating_summaries()
+    print(f"Done: {count} location summaries.")
@@ -2,6 +2,8 @@
 Script to remove ratings from MongoDB
 """
 from app.core.database import db
+from app.services.rating_summary_service import rebuild_rating_summaries
+from app.services.rating_rollup_service import rebuild_rating_rollups
 from bson import ObjectId
 
 # Get ratings collection
@@ -75,6 +77,10 @@ elif choice == "4":
 else:
     print("\n❌ Invalid choice.")
 
+# Deleted ratings are not reflected in the summaries and rollups until rebuilt
+rebuild_rating_summaries()
+rebuild_rating_rollups()
+
 # Show final count
 final_count = ratings_collection.count_documents({})
 print(f"\n" + "=" * 60)